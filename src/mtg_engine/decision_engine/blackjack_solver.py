@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Exact solver for the example blackjack game.
+
+Cards are drawn with replacement (see Blackjack.draw()),
+so the game from a player's point of view only depends on
+their own hand and the dealer's face up card.
+The solver memoizes the expected value of standing and hitting
+for every (hand total, usable ace, dealer upcard) state.
+
+Outcomes are +1 for a win, 0 for a push, and -1 for a loss,
+and a player who busts loses even if the dealer busts too.
+
+This gives a ground truth to compare Monte Carlo runs through the engine against,
+and blackjack_match() plays blackjack as a match for a League (see league.py).
+"""
+import functools
+from dataclasses import dataclass
+from random import Random
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from mtg_engine.decision_engine.example_blackjack import (
+    CARDS,
+    Blackjack,
+    FaceUpCardView,
+)
+from mtg_engine.decision_engine.league import PlayerFactory, engine_match
+from mtg_engine.decision_engine.player import Player
+
+BUST = 22  # Any score over 21
+STAND, HIT = 0, 1  # Option indexes in StandHitChoice
+# Probability of drawing each card value
+CARD_PROBS: Dict[int, float] = {v: CARDS.count(v) / len(CARDS) for v in set(CARDS)}
+
+
+def hand_score(total: int, ace: bool) -> int:
+    """Score of a hand with this total (aces as 1), counting an ace as 11 if it helps"""
+    if ace and total + 10 <= 21:
+        return total + 10
+    return min(total, BUST)
+
+
+def compare(player_score: int, dealer_score: int) -> int:
+    """Outcome for the player: +1 win, 0 push, -1 loss"""
+    if player_score >= BUST:
+        return -1
+    if dealer_score >= BUST or player_score > dealer_score:
+        return 1
+    return 0 if player_score == dealer_score else -1
+
+
+@functools.lru_cache(maxsize=None)
+def dealer_scores(total: int, ace: bool) -> Tuple[Tuple[int, float], ...]:
+    """Distribution of dealer final scores, from a dealer hand.
+    The dealer hits until they have at least 17."""
+    score = hand_score(total, ace)
+    if score >= 17:
+        return ((score, 1.0),)
+    dist: Dict[int, float] = {}
+    for card, prob in CARD_PROBS.items():
+        for final, sub_prob in dealer_scores(total + card, ace or card == 1):
+            dist[final] = dist.get(final, 0.0) + prob * sub_prob
+    return tuple(sorted(dist.items()))
+
+
+@functools.lru_cache(maxsize=None)
+def dealer_upcard_scores(upcard: int) -> Tuple[Tuple[int, float], ...]:
+    """Distribution of dealer final scores, given the face up card.
+    The face down card is drawn from the same distribution as every other card."""
+    dist: Dict[int, float] = {}
+    for card, prob in CARD_PROBS.items():
+        for final, sub_prob in dealer_scores(upcard + card, upcard == 1 or card == 1):
+            dist[final] = dist.get(final, 0.0) + prob * sub_prob
+    return tuple(sorted(dist.items()))
+
+
+@functools.lru_cache(maxsize=None)
+def stand_value(total: int, ace: bool, upcard: int) -> float:
+    """Expected outcome of standing with this hand"""
+    score = hand_score(total, ace)
+    return sum(p * compare(score, d) for d, p in dealer_upcard_scores(upcard))
+
+
+@functools.lru_cache(maxsize=None)
+def hit_value(total: int, ace: bool, upcard: int) -> float:
+    """Expected outcome of hitting with this hand, then playing optimally"""
+    return sum(
+        prob * value(total + card, ace or card == 1, upcard)
+        for card, prob in CARD_PROBS.items()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def value(total: int, ace: bool, upcard: int) -> float:
+    """Expected outcome of this hand with optimal play"""
+    if hand_score(total, ace) >= BUST:
+        return -1.0
+    return max(stand_value(total, ace, upcard), hit_value(total, ace, upcard))
+
+
+def best_action(total: int, ace: bool, upcard: int) -> int:
+    """Optimal option index (STAND or HIT) for this hand"""
+    if hit_value(total, ace, upcard) > stand_value(total, ace, upcard):
+        return HIT
+    return STAND
+
+
+def expected_value() -> float:
+    """Expected outcome of a whole game with optimal play, before any cards are seen"""
+    return sum(
+        p1 * p2 * pu * value(c1 + c2, c1 == 1 or c2 == 1, upcard)
+        for c1, p1 in CARD_PROBS.items()
+        for c2, p2 in CARD_PROBS.items()
+        for upcard, pu in CARD_PROBS.items()
+    )
+
+
+def outcome(engine: Blackjack, player: int) -> int:
+    """Outcome for a player in a finished game"""
+    return compare(engine.score(player), engine.score(-1))
+
+
+def simulate(make_player: Callable[[], Player], games: int, seed: int = 0) -> float:
+    """Monte Carlo estimate of the expected outcome, by running the engine"""
+    rng = Random(seed)
+    total = 0
+    for _ in range(games):
+        engine = Blackjack(players=[make_player()], rng=rng)
+        engine.run()
+        total += outcome(engine, 0)
+    return total / games
+
+
+def make_blackjack(players: List[Player], rng: Random) -> Blackjack:
+    """Blackjack game for engine_match()"""
+    return Blackjack(players=players, rng=rng)
+
+
+def blackjack_match(
+    factories: Sequence[PlayerFactory], seed: int, hands: int = 50
+) -> List[float]:
+    """League match: total blackjack outcome of each side, at the same table"""
+    return engine_match(factories, seed, make_blackjack, outcome, games=hands)
+
+
+@dataclass
+class OptimalBlackjackPlayer(Player):
+    """Player which uses the solver's table to always make the optimal choice.
+    Only handles a single game, since it reads the hand from its history."""
+
+    def decide(self, choice) -> int:
+        """Look up the optimal choice for our hand and the dealer's upcard"""
+        views = [v for v in self.history if isinstance(v, FaceUpCardView)]
+        cards = [v.value for v in views if v.player == choice.player]
+        upcard = next(v.value for v in views if v.player == -1)
+        return best_action(sum(cards), 1 in cards, upcard)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Per-decision time budgets, so late decisions never change the game
+
+Give an engine a TimeBudget (engine.budget = TimeBudget(seconds=0.1)), and:
+* anytime players (see AnytimePlayer) are told their deadline,
+  and stop searching with their best answer when it passes
+* any decision that comes back after the budget is replaced by the fallback policy,
+  and the player is told with Player.timed_out()
+* decision latencies and timeouts are recorded for each player
+
+Python can't safely interrupt a running player, so enforcement is cooperative:
+a late decision is still waited for, but it never changes the game.
+Only anytime players (and players that check a deadline themselves) keep to
+the wall clock time, a slow player of any other kind still holds up the game.
+
+Times come from the budget's timer (perf_counter() by default),
+which anytime players also use for their deadline, so tests can inject a fake one.
+
+When engine.budget is None, players get as long as they like.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict
+
+from mtg_engine.decision_engine.message import Choice, Decision
+from mtg_engine.decision_engine.player import AnytimePlayer
+from mtg_engine.decision_engine.stats import MessageStats
+
+
+def first_option(choice: Choice) -> int:  # pylint: disable=unused-argument
+    """Default fallback policy, which always takes the first option"""
+    return 0
+
+
+@dataclass
+class TimeBudget:
+    """Time limit for every decision, with a fallback policy for late ones"""
+
+    seconds: float
+    # Fraction of the budget anytime players leave for returning their answer
+    margin: float = 0.1
+    # Option index to use when a player runs out of time
+    fallback: Callable[[Choice], int] = first_option
+    # Decision latencies, keyed by player index
+    players: Dict[int, MessageStats] = field(
+        default_factory=lambda: defaultdict(MessageStats)
+    )
+    # Number of late decisions, keyed by player index
+    timeouts: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    # Current time in seconds
+    timer: Callable[[], float] = field(default=perf_counter, repr=False)
+
+    def send_choice(self, engine, choice: Choice) -> Decision:
+        """Budgeted version of Engine.send_choice()"""
+        player = engine.players[choice.player]
+        start = self.timer()
+        if isinstance(player, AnytimePlayer):
+            player.timer = self.timer
+            player.deadline = start + self.seconds * (1 - self.margin)
+        try:
+            decision = player.choice(choice)
+        finally:
+            if isinstance(player, AnytimePlayer):
+                player.deadline = None
+        elapsed = self.timer() - start
+        self.players[choice.player].add(int(elapsed * 1e9), len(choice))
+        if elapsed > self.seconds:
+            self.timeouts[choice.player] += 1
+            index = self.fallback(choice)
+            decision = Decision(index=index, option=choice.options[index])
+            player.timed_out(decision)
+        return decision
+
+    def to_dict(self) -> dict:
+        """Plain data version, for exporting to JSON"""
+        return {
+            "seconds": self.seconds,
+            "margin": self.margin,
+            "players": {k: v.to_dict() for k, v in self.players.items()},
+            "timeouts": dict(self.timeouts),
+        }
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Picklable checkpoints of engines in the middle of a game
+
+Running games are generators, which can't be pickled,
+so a checkpoint is the engine's starting snapshot (see Engine.forkable)
+plus the index of every decision made so far, and the position (message count).
+Restoring unpickles the snapshot in a fresh engine, and replays the decisions
+(without calling any players) to get back to the same position in the game,
+with the same packs, picks, zones, and RNG state.
+
+Cards, sets, and booster probabilities pickle by reference (set and collector number),
+so checkpoints are small, and restore to the same singleton objects in any process.
+"""
+import pickle
+import zlib
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from mtg_engine.decision_engine.engine import Engine
+from mtg_engine.decision_engine.player import Player
+
+
+@dataclass
+class Checkpoint:
+    """Everything needed to restore an engine at its current position"""
+
+    origin: bytes  # Pickled starting snapshot of the engine, without players
+    num_players: int
+    decisions: List[int] = field(default_factory=list)
+    messages: Optional[int] = None  # Position in the game, None if finished
+
+    @classmethod
+    def from_engine(cls, engine: Engine) -> "Checkpoint":
+        """Checkpoint a running (or finished) forkable engine"""
+        assert engine.origin is not None, "Only started forkable engines"
+        origin = pickle.dumps(engine.origin, protocol=pickle.HIGHEST_PROTOCOL)
+        return cls(origin, engine.num_players, engine.decisions.copy(), engine.position)
+
+    def restore(self, players: List[Player]) -> Engine:
+        """Make a new engine at the checkpoint's position, with these players.
+        The players don't see any of the replayed messages,
+        and the engine can be run forward with engine.resume()."""
+        assert len(players) == self.num_players, f"{len(players)} players"
+        engine: Engine = pickle.loads(self.origin)
+        engine.players = players
+        engine._origin = pickle.loads(self.origin)  # pylint: disable=protected-access
+        engine.replay(self.decisions, self.messages)
+        if engine.position != self.messages:
+            raise ValueError(f"Restored to {engine.position}, not {self.messages}")
+        return engine
+
+    def to_bytes(self) -> bytes:
+        """Compress the checkpoint into bytes"""
+        data = (self.origin, self.num_players, self.decisions, self.messages)
+        return zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Checkpoint":
+        """Decompress a checkpoint from bytes"""
+        return cls(*pickle.loads(zlib.decompress(data)))
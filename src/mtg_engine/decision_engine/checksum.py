@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Running checksum over the messages in a game
+
+This is used to verify that a replayed game follows the same trajectory
+as the original game, without keeping the messages themselves.
+"""
+import zlib
+from dataclasses import dataclass
+
+from mtg_engine.decision_engine.message import (
+    Choice,
+    Choices,
+    Decision,
+    Decisions,
+    Views,
+)
+
+
+@dataclass
+class Checksum:
+    """CRC32 of the message classes, choice sizes, and chosen options"""
+
+    value: int = 0
+
+    def update(
+        self, message: Views | Choice | Choices | Decision | Decisions | None
+    ) -> None:
+        """Add a message (or decision) to the checksum"""
+        if message is None:
+            return
+        if isinstance(message, Decision):
+            key = f"D{message.index}:{message.option.desc}"
+        elif isinstance(message, Choice):
+            key = f"C{message.player}:{type(message).__name__}:{len(message)}"
+        elif isinstance(message, (Choices, Decisions)):
+            for item in message:
+                self.update(item)
+            key = f"S{type(message).__name__}:{len(message)}"
+        else:
+            key = "V" + ",".join(type(view).__name__ for view in message)
+        self.value = zlib.crc32(key.encode(), self.value)
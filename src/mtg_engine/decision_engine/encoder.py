@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Encoder for turning messages into fixed-shape arrays
+
+Learning players need numeric observations, not trees of dataclasses.
+Each View, Option, and Choice subclass registers a Schema,
+which lists the fields to encode and their (maximum) sizes.
+
+The Encoder allocates one set of NumPy buffers per message class,
+the first time it sees that class, and then writes into them in place.
+Callers get the same arrays back every time, so they should copy them
+if they need to keep an observation around.
+Use torch.from_numpy() on the buffers to share them with torch, without copies.
+
+Choices are encoded along with their options, one row per option:
+    "options.kind" - index of the option class in the choice schema
+    "options.mask" - True for rows which hold an option
+    "options.<field>" - one column per field of the option classes
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from mtg_engine.decision_engine.message import Choice, Message, Option, View
+
+
+@dataclass
+class Field:
+    """A single field of a message, encoded into a fixed-shape array"""
+
+    name: str  # Attribute name on the message
+    size: int = 0  # 0 for a scalar, else the maximum length of a sequence
+    encode: Callable[[Any], int] = int  # Applied to the value, or to each item
+    dtype: str = "int64"
+    fill: int = 0  # Value for padding, masks tell padding apart from values
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the array for a single message"""
+        return (self.size,) if self.size else ()
+
+
+@dataclass
+class Schema:
+    """How to encode a message class into arrays"""
+
+    fields: List[Field] = field(default_factory=list)
+    options: Tuple[type, ...] = ()  # Option classes, only for choices
+    max_options: int = 0  # Number of option rows, only for choices
+
+
+# Registered schemas for each message class, see register_schema()
+SCHEMAS: Dict[type, Schema] = {}
+
+
+def register_schema(
+    cls: type,
+    *fields: Field,
+    options: Tuple[type, ...] = (),
+    max_options: int = 0,
+) -> Schema:
+    """Register the schema for a View, Option, or Choice subclass"""
+    assert issubclass(cls, (View, Option, Choice)), f"{cls}"
+    if issubclass(cls, Choice):
+        assert max_options > 0, f"{cls} needs max_options"
+        assert all(issubclass(o, Option) for o in options), f"{options}"
+    else:
+        assert not options and not max_options, f"{cls} is not a Choice"
+    schema = Schema(fields=list(fields), options=options, max_options=max_options)
+    SCHEMAS[cls] = schema
+    return schema
+
+
+def write_field(buffers: Dict[str, np.ndarray], key: str, spec: Field, value):
+    """Write a single field value into its buffer (and mask) in place"""
+    buffer = buffers[key]
+    if not spec.size:
+        buffer[...] = spec.encode(value)
+        return
+    num = len(value)
+    assert num <= spec.size, f"{key} has {num} > {spec.size} items"
+    for i, item in enumerate(value):  # Straight into the buffer, without a list
+        buffer[i] = spec.encode(item)
+    buffer[num:] = spec.fill
+    mask = buffers[key + ".mask"]
+    mask[:num] = True
+    mask[num:] = False
+
+
+@dataclass
+class Encoder:
+    """Encodes messages into preallocated buffers, one set per message class"""
+
+    schemas: Dict[type, Schema] = field(default_factory=lambda: SCHEMAS)
+    buffers: Dict[type, Dict[str, np.ndarray]] = field(default_factory=dict)
+
+    def allocate(self, cls: type) -> Dict[str, np.ndarray]:
+        """Allocate the buffers for a message class"""
+        if cls not in self.schemas:
+            raise KeyError(f"No schema registered for {cls}")
+        schema = self.schemas[cls]
+        buffers: Dict[str, np.ndarray] = {}
+        for spec in schema.fields:
+            buffers[spec.name] = np.full(spec.shape, spec.fill, dtype=spec.dtype)
+            if spec.size:
+                buffers[spec.name + ".mask"] = np.zeros(spec.size, dtype=bool)
+        if schema.options:
+            rows = schema.max_options
+            buffers["options.kind"] = np.full(rows, -1, dtype="int64")
+            buffers["options.mask"] = np.zeros(rows, dtype=bool)
+            for option_cls in schema.options:
+                for spec in self.schemas[option_cls].fields:
+                    key = "options." + spec.name
+                    shape = (rows,) + spec.shape
+                    if key in buffers:
+                        assert buffers[key].shape == shape, f"{key} shape mismatch"
+                        continue
+                    buffers[key] = np.full(shape, spec.fill, dtype=spec.dtype)
+        self.buffers[cls] = buffers
+        return buffers
+
+    def encode(self, message: Message | Option) -> Dict[str, np.ndarray]:
+        """Encode a message in place, returning the (reused) buffers"""
+        cls = type(message)
+        buffers = self.buffers.get(cls)
+        if buffers is None:
+            buffers = self.allocate(cls)
+        schema = self.schemas[cls]
+        for spec in schema.fields:
+            write_field(buffers, spec.name, spec, getattr(message, spec.name))
+        if schema.options:
+            assert isinstance(message, Choice), f"{message}"
+            self.encode_options(message, schema, buffers)
+        return buffers
+
+    def encode_options(
+        self, choice: Choice, schema: Schema, buffers: Dict[str, np.ndarray]
+    ) -> None:
+        """Encode the options of a choice, one row per option"""
+        num = len(choice.options)
+        assert num <= schema.max_options, f"{num} > {schema.max_options} options"
+        # Clear old values, since option classes don't all have the same fields
+        for option_cls in schema.options:
+            for spec in self.schemas[option_cls].fields:
+                buffers["options." + spec.name][...] = spec.fill
+        kinds = buffers["options.kind"]
+        for i, option in enumerate(choice.options):
+            kind = schema.options.index(type(option))
+            kinds[i] = kind
+            for spec in self.schemas[schema.options[kind]].fields:
+                value = getattr(option, spec.name)
+                buffers["options." + spec.name][i] = spec.encode(value)
+        kinds[num:] = -1
+        buffers["options.mask"][:num] = True
+        buffers["options.mask"][num:] = False
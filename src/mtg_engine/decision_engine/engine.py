@@ -4,26 +4,97 @@ Decision Engine class and utilities
 
 The Engine class holds the core game state,
 and sends/receives messages to/from players.
+
+Running games are generators, which can't be copied,
+so forkable engines keep a snapshot of their starting state,
+and a log of every decision made since.
+A fork copies the snapshot and replays the decisions to catch up.
+
+External drivers (servers, learners) can step the engine themselves,
+instead of having the engine call players:
+
+    message = engine.reset()
+    while message is not None:
+        decision = ...  # Decide the choice, or None for views
+        message = engine.step(decision)
+
+run() is this same loop, with the replies coming from the players
+(which send_receive() has already checked, so they aren't checked again).
 """
+import copy
+import itertools
 import logging
-from dataclasses import dataclass
-from typing import Generator, List
+from dataclasses import dataclass, field
+from typing import Dict, Generator, List, Optional
 
-from mtg_engine.decision_engine.message import Choice, Decision, View, Views
+from mtg_engine.decision_engine.budget import TimeBudget
+from mtg_engine.decision_engine.checksum import Checksum
+from mtg_engine.decision_engine.message import (
+    Choice,
+    Choices,
+    Decision,
+    Decisions,
+    SharedViews,
+    View,
+    Views,
+)
 from mtg_engine.decision_engine.player import Player
+from mtg_engine.decision_engine.stats import EngineStats
+from mtg_engine.decision_engine.trace import Tracer
 
+# Messages sent by the engine, and the replies to them
+Sent = Views | Choice | Choices
+Reply = Decision | Decisions | None
 # This is our typevar for the nested coroutines we use.
-MessageGen = Generator[Views | Choice, Decision | None, Decision | None]
+MessageGen = Generator[Sent, Reply, Reply]
+
+
+def answers(choice: Choice, decision) -> bool:
+    """Is this a decision for one of the choice's options, by index"""
+    return (
+        isinstance(decision, Decision)
+        and isinstance(decision.index, int)
+        and choice.is_valid_index(decision.index)
+        and choice.is_valid_decision(decision)
+    )
 
 
 @dataclass
-class Engine:
+class Engine:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """Engine class is the core of the game.
     It holds the state of the game,
     and sends/receives messages to/from players.
     """
 
     players: List[Player]
+    # Keep a snapshot of the starting state, so the engine can fork()
+    forkable: bool = field(default=False, repr=False, compare=False)
+    # Index of every decision made so far, in order
+    decisions: List[int] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    # Number of messages sent so far, which is the position in the game
+    messages: int = field(default=0, init=False, repr=False, compare=False)
+    # Optional running checksum of the game, for verifying replays
+    checksum: Optional[Checksum] = field(default=None, repr=False, compare=False)
+    # Optional instrumentation of all the messages sent to players
+    stats: Optional[EngineStats] = field(default=None, repr=False, compare=False)
+    # Optional Chrome trace of the engine phases and messages
+    tracer: Optional[Tracer] = field(default=None, repr=False, compare=False)
+    # Optional time limit for each decision, with a fallback policy
+    budget: Optional[TimeBudget] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Internal state for the running game, not part of the dataclass"""
+        self._game: Optional[MessageGen] = None
+        self._message: Optional[Sent] = None
+        self._origin: Optional[Engine] = None
+
+    def __getstate__(self):
+        """Running games (generators) can't be copied, so leave them out"""
+        state = self.__dict__.copy()
+        state["_game"] = None
+        return state
 
     @property
     def num_players(self) -> int:
@@ -42,6 +113,29 @@ class Engine:
         """Check if the choice is valid"""
         return isinstance(choice, Choice) and (choice.player in range(self.num_players))
 
+    def is_valid_choices(self, choices: Choices) -> bool:
+        """Check if the simultaneous choices are valid, for distinct players"""
+        players = [choice.player for choice in choices]
+        return (
+            isinstance(choices, Choices)
+            and all(self.is_valid_choice(choice) for choice in choices)
+            and len(set(players)) == len(players)
+        )
+
+    def is_valid_reply(self, reply: Reply) -> bool:
+        """Check if the reply answers the current message:
+        a decision for a choice, decisions for choices, or None for views"""
+        message = self._message
+        if isinstance(message, Choice):
+            return answers(message, reply)
+        if isinstance(message, Choices):
+            return (
+                isinstance(reply, Decisions)
+                and len(reply) == len(message)
+                and all(answers(c, d) for c, d in zip(message, reply))
+            )
+        return reply is None  # Views, or the start of the game
+
     def play(self) -> MessageGen:
         """Core coroutine in the game engine.
         Override this to implement your own game logic.
@@ -51,32 +145,201 @@ class Engine:
     def run(self):
         """Run the engine, until the game is finished"""
         logging.debug("Running engine: %s", type(self))
-        game_generator = self.play()
-        message = next(game_generator)
-        while True:
-            reply = self.send_receive(message)
-            try:
-                message = game_generator.send(reply)
-            except StopIteration:
-                break
+        if self.forkable:
+            self._origin = self.snapshot()
+        if self.tracer is not None:
+            with self.tracer.span(f"{type(self).__name__}.run"):
+                self.reset()
+                self.resume()
+            return
+        self.reset()
+        self.resume()
+
+    def resume(self):
+        """Run the engine from its current position, until the game is finished"""
+        message = self._message
+        while message is not None:
+            reply = self.send_receive(message)  # Checks the reply
+            message = self._advance(reply)
         logging.debug("Completed engine: %s", type(self))
 
-    def send_receive(self, message: Choice | Views) -> Decision | None:
+    @property
+    def message(self) -> Optional[Sent]:
+        """Current message, which is waiting for a reply, or None if finished"""
+        return self._message
+
+    @property
+    def position(self) -> Optional[int]:
+        """Number of messages to replay() to get back to the current message,
+        or None if the game is finished (replay all of the decisions)"""
+        return None if self._message is None else self.messages
+
+    @property
+    def origin(self) -> Optional["Engine"]:
+        """Starting snapshot of a forkable engine (without players), or None"""
+        return self._origin
+
+    def reset(self) -> Optional[Sent]:
+        """Start a new game, and return the first message.
+        Nothing is sent to the players, the caller handles every message."""
+        self.decisions = []
+        self.messages = 0
+        self._game = self.play()
+        self._message = None
+        return self._advance(None)
+
+    def step(self, reply: Reply) -> Optional[Sent]:
+        """Reply to the current message, and return the next message.
+        The reply is a decision for a choice, decisions for choices, or None for views.
+        Returns None once the game is finished."""
+        assert self._game is not None, "Game is not running, call reset() first"
+        assert self.is_valid_reply(reply), f"{reply} doesn't answer {self._message}"
+        return self._advance(reply)
+
+    def _advance(self, reply: Reply) -> Optional[Sent]:
+        """Step with a reply which is already known to answer the current message"""
+        if isinstance(reply, Decisions):
+            self.decisions.extend(decision.index for decision in reply)
+        elif reply is not None:
+            self.decisions.append(reply.index)
+        try:
+            self._message = self._game.send(reply)
+            self.messages += 1
+        except StopIteration:
+            self._message = None
+            self._game = None
+        if self.checksum is not None:
+            self.checksum.update(reply)
+            self.checksum.update(self._message)
+        return self._message
+
+    def snapshot(self) -> "Engine":
+        """Deep copy of the engine state, without the players or instrumentation"""
+        players, self.players = self.players, []
+        stats, self.stats = self.stats, None
+        tracer, self.tracer = self.tracer, None
+        budget, self.budget = self.budget, None
+        origin, self._origin = self._origin, None
+        try:
+            return copy.deepcopy(self)
+        finally:
+            self.players, self.stats, self.tracer = players, stats, tracer
+            self.budget, self._origin = budget, origin
+
+    def replay(
+        self, decisions: List[int], messages: Optional[int] = None
+    ) -> Optional[Sent]:
+        """Start the game, and replay the given decisions,
+        until the given number of messages or the end of the game.
+
+        Views are not sent and players are not asked to decide,
+        so the players do not see any of the replayed messages.
+        Returns the message at the current position.
+        """
+        message = self.reset()
+        remaining = iter(decisions)
+        while message is not None and (messages is None or self.messages < messages):
+            reply = None
+            if isinstance(message, Choice):
+                index = next(remaining, None)
+                if index is None:
+                    break  # Out of decisions, stop at this choice
+                if not message.is_valid_index(index):
+                    raise ValueError(f"Invalid decision {index} for {message.desc}")
+                reply = Decision(index=index, option=message.options[index])
+            elif isinstance(message, Choices):
+                indexes = list(itertools.islice(remaining, len(message)))
+                if len(indexes) < len(message):
+                    break  # Out of decisions, stop at these choices
+                reply = Decisions()
+                for choice, index in zip(message, indexes):
+                    if not choice.is_valid_index(index):
+                        raise ValueError(f"Invalid decision {index} for {choice.desc}")
+                    option = choice.options[index]
+                    reply.decisions.append(Decision(index=index, option=option))
+            message = self._advance(reply)  # Valid indexes, checked above
+        return message
+
+    def fork(self, players: List[Player]) -> "Engine":
+        """Copy this engine at its current position, to look ahead in the game.
+
+        The fork copies the starting snapshot and replays every decision so far,
+        so the cost of a fork grows with the number of messages in the game.
+        The new players don't see any of the replayed messages,
+        and the fork can be run forward with fork.resume().
+        """
+        assert self._origin is not None, "Only started forkable engines can fork"
+        assert len(players) == self.num_players, f"{len(players)} players"
+        engine = copy.deepcopy(self._origin)
+        engine.players = players
+        engine._origin = self._origin  # pylint: disable=protected-access
+        engine.replay(self.decisions, self.position)
+        return engine
+
+    def send_receive(self, message: Sent) -> Reply:
+        """Send the given message, and return the reply if any"""
+        if self.tracer is not None:
+            with self.tracer.message_span(message):
+                return self._send_receive(message)
+        return self._send_receive(message)
+
+    def _send_receive(self, message: Sent) -> Reply:
         """Send the given message, and return the reply if any"""
+        if self.stats is not None:
+            return self.stats.send_receive(self, message)
         # If a choice, send it to the player, and return the result
         if isinstance(message, Choice):
             choice = message
             assert self.is_valid_choice(choice), f"Invalid {choice}"
-            decision = self.players[choice.player].choice(choice)
+            decision = self.send_choice(choice)
             assert choice.is_valid_decision(decision), f"Invalid {decision}"
             return decision
+        # If simultaneous choices, send them all, and return all the decisions
+        if isinstance(message, Choices):
+            choices = message
+            assert self.is_valid_choices(choices), f"Invalid {choices}"
+            decisions = self.send_choices(choices)
+            assert choices.is_valid_decisions(decisions), f"Invalid {decisions}"
+            return decisions
         # If a views, send it to all players, and return None
         if isinstance(message, Views):
             views = message
             assert self.is_valid_views(views), f"Invalid {views}"
-            for player, view in zip(self.players, views):
-                assert isinstance(view, View), f"{view}"
-                player.view(view)  # Send the view to the player
+            self.send_views(views)
             return None
         # If neither, raise an error
-        raise ValueError(f"{message} is not a Choice or Views")
+        raise ValueError(f"{message} is not a Choice, Choices, or Views")
+
+    def send_choice(self, choice: Choice) -> Decision:
+        """Send a choice to its player, and return their decision"""
+        if self.budget is not None:
+            return self.budget.send_choice(self, choice)
+        return self.players[choice.player].choice(choice)
+
+    def send_choices(self, choices: Choices) -> Decisions:
+        """Send simultaneous choices to their players, and return their decisions.
+        Choices for the same player object (e.g. one bot playing many seats)
+        are sent together in one call to Player.batch_choice()."""
+        if self.budget is not None:  # Budgets are per decision
+            return Decisions([self.send_choice(choice) for choice in choices])
+        batches: Dict[int, List[Choice]] = {}  # id(player) -> choices
+        for choice in choices:
+            batches.setdefault(id(self.players[choice.player]), []).append(choice)
+        decided: Dict[int, Decision] = {}  # id(choice) -> decision
+        for batch in batches.values():
+            player = self.players[batch[0].player]
+            for choice, decision in zip(batch, player.batch_choice(batch)):
+                decided[id(choice)] = decision
+        return Decisions([decided[id(choice)] for choice in choices])
+
+    def send_views(self, views: Views) -> None:
+        """Send each player their view"""
+        if isinstance(views, SharedViews):
+            public, private = views.public, views.private
+            assert isinstance(public, View), f"{public}"
+            for i, player in enumerate(self.players):
+                player.view(private.get(i, public))
+            return
+        for player, view in zip(self.players, views):
+            assert isinstance(view, View), f"{view}"
+            player.view(view)  # Send the view to the player
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+Gym-style environments, for learners that live outside of the engine
+
+Normally the engine calls players, but a learner wants to call the engine.
+Env inverts this for one seat: reset() and step() advance the engine
+(sending messages to all the other players) until the next choice for that seat,
+and return it encoded as arrays (see encoder.py).
+The player in the learner's seat is only used to keep a history,
+and the learner's actions go through the engine like any other decision
+(so they are validated, and recorded in the engine's stats and traces).
+
+VectorEnv runs many environments in worker processes.
+Observations, actions, rewards, and dones are exchanged through shared memory,
+and the pipes to the workers only carry single-byte commands.
+"""
+import ctypes
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from mtg_engine.decision_engine.encoder import Encoder
+from mtg_engine.decision_engine.engine import Engine
+from mtg_engine.decision_engine.message import Choice, Choices, Views
+from mtg_engine.decision_engine.player import Player
+
+Observation = Dict[str, np.ndarray]
+
+
+@dataclass
+class ActionPlayer(Player):
+    """Stands in for the player in the learner's seat, deciding with an action"""
+
+    action: int = 0
+
+    def decide(self, choice) -> int:
+        """The learner's action"""
+        return self.action
+
+
+@dataclass
+class Env:
+    """Environment where a learner makes the choices for one seat"""
+
+    make_engine: Callable[[int], Engine]  # Makes a new engine from a seed
+    seat: int = 0  # Player index of the learner
+    # Reward for the learner at the end of the game, else 0
+    reward: Optional[Callable[[Engine, int], float]] = None
+    encoder: Encoder = field(default_factory=Encoder)
+
+    def __post_init__(self):
+        self.engine: Optional[Engine] = None
+        self.choice: Optional[Choice] = None
+
+    def reset(self, seed: int) -> Observation:
+        """Start a new game, and return the first observation"""
+        self.engine = self.make_engine(seed)
+        assert self.engine.is_valid_player(self.seat), f"{self.seat}"
+        message = self.engine.reset()
+        self.choice = self.advance(message)
+        assert self.choice is not None, "Game ended before the learner chose"
+        return self.encoder.encode(self.choice)
+
+    def step(self, action: int) -> Tuple[Observation, float, bool]:
+        """Take an action (option index) for the current choice,
+        and return the next observation, the reward, and if the game is done.
+        When the game is done, the observation is the last one."""
+        choice, engine = self.choice, self.engine
+        assert choice is not None and engine is not None, "Call reset() first"
+        if not choice.is_valid_index(action):
+            raise ValueError(f"Invalid action {action} for {choice.desc}")
+        # Decide through the engine, into the seat's history
+        player = engine.players[self.seat]
+        engine.players[self.seat] = ActionPlayer(history=player.history, action=action)
+        try:
+            decision = engine.send_receive(choice)
+        finally:
+            engine.players[self.seat] = player
+        message = engine.step(decision)
+        self.choice = self.advance(message)
+        if self.choice is None:
+            reward = self.reward(engine, self.seat) if self.reward else 0.0
+            return self.encoder.buffers[type(choice)], reward, True
+        return self.encoder.encode(self.choice), 0.0, False
+
+    def advance(self, message: Views | Choice | Choices | None) -> Optional[Choice]:
+        """Send messages to the other players, until the learner has a choice"""
+        engine = self.engine
+        assert engine is not None
+        while message is not None:
+            if isinstance(message, Choice) and message.player == self.seat:
+                return message
+            if isinstance(message, Choices):
+                if any(choice.player == self.seat for choice in message):
+                    raise ValueError("Env can't play simultaneous choices")
+            reply = engine.send_receive(message)
+            message = engine.step(reply)
+        return None
+
+
+def shared_array(shape: Tuple[int, ...], dtype) -> Tuple[ctypes.Array, np.ndarray]:
+    """Allocate an array in shared memory, which child processes inherit"""
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape)) * dtype.itemsize
+    raw = multiprocessing.RawArray(ctypes.c_byte, max(1, size))
+    return raw, as_array(raw, shape, dtype)
+
+
+def as_array(raw: ctypes.Array, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """View a shared memory buffer as a NumPy array"""
+    count = int(np.prod(shape))
+    return np.frombuffer(raw, dtype=dtype, count=count).reshape(shape)
+
+
+@dataclass
+class WorkerSpec:
+    """What every VectorEnv worker process needs, besides its index and pipe"""
+
+    make_env: Callable[[], Env]
+    choice_cls: type
+    # Key, and the raw shared memory, shape, and dtype of each array
+    shared: List[Tuple[str, Tuple[ctypes.Array, Tuple[int, ...], np.dtype]]]
+    seed: int
+
+
+def run_worker(index: int, spec: WorkerSpec, conn) -> None:
+    """Worker process loop for VectorEnv, commands come in on the pipe"""
+    arrays = {
+        key: as_array(raw, shape, dtype) for key, (raw, shape, dtype) in spec.shared
+    }
+    env: Env = spec.make_env()
+    seed = spec.seed
+    # Encode observations straight into this worker's rows of shared memory
+    env.encoder.buffers[spec.choice_cls] = {
+        key: array[index : index + 1].reshape(array.shape[1:])  # Views, not copies
+        for key, array in arrays.items()
+        if key not in ("actions", "rewards", "dones")
+    }
+    num_envs = len(arrays["actions"])
+    episode = 0
+    while (command := conn.recv_bytes()) != b"c":
+        if command == b"r":
+            env.reset(seed + index)
+            episode = 0
+        elif command == b"s":
+            _, reward, done = env.step(int(arrays["actions"][index]))
+            arrays["rewards"][index] = reward
+            arrays["dones"][index] = done
+            if done:  # Automatically start the next game
+                episode += 1
+                env.reset(seed + index + episode * num_envs)
+        conn.send_bytes(b"k")
+    conn.close()
+
+
+@dataclass
+class VectorEnv:
+    """Many environments stepped in parallel in worker processes.
+
+    make_env must be picklable (e.g. a module level function),
+    and every choice for the learner must be of the choice_cls class.
+    Games that finish are reset automatically, with new seeds.
+    """
+
+    make_env: Callable[[], Env]
+    choice_cls: type
+    num_envs: int = 2
+    seed: int = 0
+
+    def __post_init__(self):
+        buffers = self.make_env().encoder.allocate(self.choice_cls)
+        layout = {key: (array.shape, array.dtype) for key, array in buffers.items()}
+        layout["actions"] = ((), np.dtype("int64"))
+        layout["rewards"] = ((), np.dtype("float64"))
+        layout["dones"] = ((), np.dtype(bool))
+        shared = []
+        self.arrays: Dict[str, np.ndarray] = {}
+        for key, (shape, dtype) in layout.items():
+            raw, array = shared_array((self.num_envs,) + shape, dtype)
+            shared.append((key, (raw, (self.num_envs,) + shape, dtype)))
+            self.arrays[key] = array
+        spec = WorkerSpec(self.make_env, self.choice_cls, shared, self.seed)
+        self.conns: List = []
+        self.workers: List[multiprocessing.Process] = []
+        for i in range(self.num_envs):
+            conn, child_conn = multiprocessing.Pipe()
+            args = (i, spec, child_conn)
+            worker = multiprocessing.Process(target=run_worker, args=args, daemon=True)
+            worker.start()
+            child_conn.close()  # So we get an EOFError if the worker dies
+            self.conns.append(conn)
+            self.workers.append(worker)
+
+    @property
+    def observations(self) -> Observation:
+        """Observation arrays of every environment, in shared memory"""
+        return {
+            k: v
+            for k, v in self.arrays.items()
+            if k not in ("actions", "rewards", "dones")
+        }
+
+    def command(self, command: bytes) -> None:
+        """Send a command to every worker, and wait for all of them"""
+        for conn in self.conns:
+            conn.send_bytes(command)
+        for conn in self.conns:
+            assert conn.recv_bytes() == b"k"
+
+    def reset(self) -> Observation:
+        """Start new games in every environment"""
+        self.command(b"r")
+        return self.observations
+
+    def step(self, actions) -> Tuple[Observation, np.ndarray, np.ndarray]:
+        """Take one action in every environment"""
+        self.arrays["actions"][:] = actions
+        self.command(b"s")
+        return self.observations, self.arrays["rewards"], self.arrays["dones"]
+
+    def close(self) -> None:
+        """Stop all of the workers"""
+        for conn in self.conns:
+            conn.send_bytes(b"c")
+        for worker in self.workers:
+            worker.join()
+        self.conns, self.workers = [], []
@@ -12,9 +12,11 @@ from dataclasses import dataclass, field
 from random import Random
 from typing import Dict, List
 
+from mtg_engine.decision_engine.encoder import Field, register_schema
 from mtg_engine.decision_engine.engine import Engine, MessageGen
-from mtg_engine.decision_engine.message import Choice, Option, View, Views
+from mtg_engine.decision_engine.message import Choice, Option, SharedViews, View
 from mtg_engine.decision_engine.player import HumanPlayer, Player
+from mtg_engine.decision_engine.trace import traced
 
 # Ignore suits, just using integer card values, where J/Q/K=10, A=1
 CARDS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10]
@@ -30,14 +32,14 @@ class FaceUpCardView(View):
 
 
 @dataclass
-class FaceUpCardViews(Views):
+class FaceUpCardViews(SharedViews):
     """A set of views for each player for a face-up card"""
 
     @classmethod
     def make(cls, value: int, player: int, num_players: int) -> "FaceUpCardViews":
         """Create a set of views for each player"""
         view = FaceUpCardView(value=value, player=player)
-        return cls([view] * num_players)
+        return cls(public=view, num_players=num_players)
 
 
 @dataclass
@@ -57,19 +59,18 @@ class OtherFaceDownCard(View):
 
 
 @dataclass
-class FacedownCardViews(Views):
-    """A set of views for each player for a face-down card"""
+class FacedownCardViews(SharedViews):
+    """A set of views for each player for a face-down card,
+    which is hidden from everyone except its player"""
 
     @classmethod
     def make(cls, value: int, player: int, num_players: int) -> "FacedownCardViews":
         """Create a set of views for each player"""
-        views = cls()
-        for i in range(num_players):
-            if i == player:
-                views.append(MyFacedownCard(value=value))
-            else:
-                views.append(OtherFaceDownCard(player=i))
-        return views
+        return cls(
+            public=OtherFaceDownCard(player=player),
+            private={player: MyFacedownCard(value=value)},
+            num_players=num_players,
+        )
 
 
 @dataclass
@@ -108,14 +109,29 @@ class ScoresView(View):
 
 
 @dataclass
-class ScoresViews(Views):
+class ScoresViews(SharedViews):
     """A set of views for each player for the scores at the end of the game"""
 
     @classmethod
     def make(cls, player_scores: List[int], dealer_score) -> "ScoresViews":
         """Create a set of views for each player"""
         view = ScoresView(player_scores=player_scores, dealer_score=dealer_score)
-        return cls([view] * len(player_scores))
+        return cls(public=view, num_players=len(player_scores))
+
+
+MAX_PLAYERS = 8  # Only used for the size of encoded score views
+
+register_schema(FaceUpCardView, Field("value"), Field("player"))
+register_schema(MyFacedownCard, Field("value"))
+register_schema(OtherFaceDownCard, Field("player"))
+register_schema(StandOption)
+register_schema(HitOption)
+register_schema(
+    StandHitChoice, Field("player"), options=(StandOption, HitOption), max_options=2
+)
+register_schema(
+    ScoresView, Field("player_scores", size=MAX_PLAYERS), Field("dealer_score")
+)
 
 
 @dataclass
@@ -130,6 +146,7 @@ class Blackjack(Engine):
         """Get a random card value"""
         return self.rng.choice(CARDS)
 
+    @traced
     def play(self) -> MessageGen:
         """Callers should use Engine.run(), see Engine for details"""
         # Setup the game
@@ -142,6 +159,7 @@ class Blackjack(Engine):
         # Show the scores
         return (yield from self.show_scores())
 
+    @traced
     def deal(self) -> MessageGen:
         """Deal everyone starting cards"""
         # First card face up
@@ -160,6 +178,7 @@ class Blackjack(Engine):
         self.cards[-1].append(card)
         return (yield FacedownCardViews.make(card, -1, self.num_players))
 
+    @traced
     def turn(self, player: int) -> MessageGen:
         """A single player has the option to take hits until bust or stand"""
         assert self.is_valid_player(player), f"{player}"
@@ -170,7 +189,7 @@ class Blackjack(Engine):
             result = yield choice
             assert result is not None, f"{result}"
             assert choice.is_valid_decision(result), f"{result}"
-            if result.option == 0:  # Stand
+            if result.index == 0:  # Stand
                 return None
             # Hit, send views for the new card
             card = self.draw()
@@ -178,6 +197,7 @@ class Blackjack(Engine):
             yield FaceUpCardViews.make(card, player, self.num_players)
         return None
 
+    @traced
     def dealer_turn(self) -> MessageGen:  # pylint: disable=useless-return
         """Dealer reveals card and hits until >= 17"""
         card = self.cards[-1][-1]  # Dealer face down card
@@ -205,6 +225,7 @@ class Blackjack(Engine):
                 best_score = score
         return best_score
 
+    @traced
     def show_scores(self) -> MessageGen:
         """Show the scores"""
         players_scores = [self.score(i) for i in range(self.num_players)]
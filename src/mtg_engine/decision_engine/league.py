@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+"""
+League of players, ranked with TrueSkill ratings
+
+Register Player factories with a League, and League.run() plays matches
+between them until every rating is confident (or a match limit is reached).
+
+Instead of a fixed round-robin, each round schedules the pairs of players
+whose next match is most informative: evenly matched pairs (by TrueSkill match quality)
+with the most uncertain ratings.
+Matches are played in parallel worker processes,
+so factories and the match function must be picklable (e.g. module level functions).
+
+A match takes the two factories and a seed, and returns a score for each side,
+the higher score wins (and equal scores are a draw).
+engine_match() plays many games of any engine, given a way to make the engine
+and to score each seat, e.g. blackjack_match() in blackjack_solver.py.
+
+TrueSkill: https://www.microsoft.com/en-us/research/project/trueskill-ranking-system/
+"""
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from random import Random
+from statistics import NormalDist
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from mtg_engine.decision_engine.engine import Engine
+from mtg_engine.decision_engine.player import Player
+
+MU = 25.0  # Default rating mean
+SIGMA = MU / 3  # Default rating standard deviation
+BETA = SIGMA / 2  # Performance standard deviation, the skill gap for ~76% wins
+NORMAL = NormalDist()
+
+PlayerFactory = Callable[[], Player]
+Match = Callable[[Sequence[PlayerFactory], int], Sequence[float]]
+EngineFactory = Callable[[List[Player], Random], Engine]  # Players, rng -> engine
+
+
+@dataclass
+class Rating:
+    """TrueSkill rating, a normal belief about a player's skill"""
+
+    mean: float = MU
+    sigma: float = SIGMA
+
+    @property
+    def conservative(self) -> float:
+        """Skill we are ~99% sure the player has, for ranking"""
+        return self.mean - 3 * self.sigma
+
+
+def draw_margin(draw_probability: float, beta: float = BETA) -> float:
+    """Performance difference which counts as a draw, for a draw probability"""
+    return NORMAL.inv_cdf((draw_probability + 1) / 2) * math.sqrt(2) * beta
+
+
+def corrections(skill_gap: float, margin: float, drawn: bool) -> Tuple[float, float]:
+    """Truncated gaussian corrections to the mean and variance, for a win or a draw.
+    The skill gap (of the winner) and draw margin are scaled by the match uncertainty"""
+    if not drawn:
+        v_factor = NORMAL.pdf(skill_gap - margin) / max(
+            NORMAL.cdf(skill_gap - margin), 1e-12
+        )
+        return v_factor, v_factor * (v_factor + skill_gap - margin)
+    low, high = -margin - skill_gap, margin - skill_gap
+    prob = max(NORMAL.cdf(high) - NORMAL.cdf(low), 1e-12)
+    v_factor = (NORMAL.pdf(low) - NORMAL.pdf(high)) / prob
+    w_factor = v_factor**2 + (high * NORMAL.pdf(high) - low * NORMAL.pdf(low)) / prob
+    return v_factor, w_factor
+
+
+def update(
+    first: Rating, second: Rating, result: int, margin: float, beta: float = BETA
+) -> Tuple[Rating, Rating]:
+    """New ratings after a match, result is 1 if first won, -1 if second, 0 for a draw"""
+    if result < 0:
+        second, first = update(second, first, -result, margin, beta)
+        return first, second
+    scale = math.sqrt(2 * beta**2 + first.sigma**2 + second.sigma**2)
+    v_factor, w_factor = corrections(
+        (first.mean - second.mean) / scale, margin / scale, drawn=result == 0
+    )
+    ratings = []
+    for rating, sign in ((first, 1), (second, -1)):
+        var = rating.sigma**2
+        mean = rating.mean + sign * var / scale * v_factor
+        sigma = math.sqrt(var * max(1 - var / scale**2 * w_factor, 1e-6))
+        ratings.append(Rating(mean, sigma))
+    return ratings[0], ratings[1]
+
+
+def match_quality(first: Rating, second: Rating, beta: float = BETA) -> float:
+    """TrueSkill match quality, the chance of a draw relative to the most even match"""
+    variance = 2 * beta**2 + first.sigma**2 + second.sigma**2
+    return math.sqrt(2 * beta**2 / variance) * math.exp(
+        -((first.mean - second.mean) ** 2) / (2 * variance)
+    )
+
+
+def play_match(match: Match, factories: Sequence[PlayerFactory], seed: int) -> int:
+    """Play a single match (in a worker), returning the result for update()"""
+    first, second = match(factories, seed)
+    return (first > second) - (first < second)
+
+
+@dataclass
+class League:  # pylint: disable=too-many-instance-attributes
+    """Ratings for registered players, improved by playing adaptive matches"""
+
+    match: Match
+    workers: int = 0  # Worker processes, or 0 to play matches in this process
+    target_sigma: float = 1.0  # Stop when every rating is this confident
+    draw_probability: float = 0.1
+    seed: int = 0
+    factories: Dict[str, PlayerFactory] = field(default_factory=dict)
+    ratings: Dict[str, Rating] = field(default_factory=dict)
+    matches: int = 0  # Number of matches played so far
+
+    def register(self, name: str, factory: PlayerFactory) -> None:
+        """Add a player to the league, with a default rating"""
+        assert name not in self.factories, f"{name} already registered"
+        self.factories[name] = factory
+        self.ratings[name] = Rating()
+
+    def is_confident(self) -> bool:
+        """Are all of the ratings confident enough to stop"""
+        return all(r.sigma <= self.target_sigma for r in self.ratings.values())
+
+    def schedule(self, num: int) -> List[Tuple[str, str]]:
+        """Pick the most informative pairs to play next, each player at most once"""
+
+        def information(pair: Tuple[str, str]) -> float:
+            first, second = (self.ratings[name] for name in pair)
+            uncertainty = first.sigma**2 + second.sigma**2
+            return match_quality(first, second) * uncertainty
+
+        pairs = list(itertools.combinations(self.ratings, 2))
+        # Only pairs which help unconfident ratings, if there are any
+        pairs = [
+            pair
+            for pair in pairs
+            if max(self.ratings[name].sigma for name in pair) > self.target_sigma
+        ] or pairs
+        pairs.sort(key=information)
+        scheduled: List[Tuple[str, str]] = []
+        busy = set()
+        for pair in reversed(pairs):
+            if len(scheduled) == num:
+                break
+            if busy.isdisjoint(pair):
+                scheduled.append(pair)
+                busy.update(pair)
+        return scheduled
+
+    def record(self, pair: Tuple[str, str], result: int) -> None:
+        """Update the ratings with the result of a match"""
+        first, second = pair
+        margin = draw_margin(self.draw_probability)
+        self.ratings[first], self.ratings[second] = update(
+            self.ratings[first], self.ratings[second], result, margin
+        )
+        self.matches += 1
+
+    def run(self, max_matches: int = 1000) -> List[Tuple[str, Rating]]:
+        """Play matches until the ratings are confident, and return the standings"""
+        assert len(self.factories) >= 2, "Need at least two players"
+        rng = Random(self.seed)
+        executor = ProcessPoolExecutor(self.workers) if self.workers else None
+        try:
+            while not self.is_confident() and self.matches < max_matches:
+                limit = min(max(self.workers, 1), max_matches - self.matches)
+                pairs = self.schedule(limit)
+                args = [
+                    (self.match, [self.factories[n] for n in pair], rng.getrandbits(32))
+                    for pair in pairs
+                ]
+                if executor is None:
+                    results = [play_match(*arg) for arg in args]
+                else:
+                    results = list(executor.map(play_match, *zip(*args)))
+                for pair, result in zip(pairs, results):
+                    self.record(pair, result)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self.standings()
+
+    def standings(self) -> List[Tuple[str, Rating]]:
+        """Players sorted from best to worst, by conservative rating"""
+        return sorted(self.ratings.items(), key=lambda item: -item[1].conservative)
+
+
+def engine_match(
+    factories: Sequence[PlayerFactory],
+    seed: int,
+    make_engine: EngineFactory,
+    score: Callable[[Engine, int], float],
+    games: int = 50,
+) -> List[float]:
+    """Total score of each side, playing many games at the same table.
+    Players are made fresh for every game.
+    Bind the engine and score with functools.partial() (or a module level function)
+    to make a Match."""
+    rng = Random(seed)
+    scores = [0.0] * len(factories)
+    for _ in range(games):
+        engine = make_engine([make() for make in factories], rng)
+        engine.run()
+        for i in range(len(factories)):
+            scores[i] += score(engine, i)
+    return scores
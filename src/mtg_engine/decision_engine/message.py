@@ -6,7 +6,7 @@ The message class is the superclass of View, Choice, and Decision.
 """
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, Iterator, List
 
 
 @dataclass
@@ -40,6 +40,31 @@ class Views:  # Does not subclass Message
         self.views.append(view)
 
 
+@dataclass
+class SharedViews(Views):
+    """Views where every player is sent the same public view,
+    except for players with a private view (e.g. of their own hidden cards).
+
+    This saves making a view per player on every broadcast,
+    but the views are shared between players (and their histories),
+    so players must not modify them.
+    """
+
+    public: View = field(default_factory=View)
+    private: Dict[int, View] = field(default_factory=dict)  # player -> view
+    num_players: int = 0
+
+    def __len__(self):
+        return self.num_players
+
+    def __iter__(self):
+        return (self.private.get(i, self.public) for i in range(self.num_players))
+
+    def append(self, view):
+        """Shared views are set with public and private, not appended"""
+        raise TypeError(f"Can't append {view} to {type(self).__name__}")
+
+
 @dataclass
 class Option:
     """Option class is a distinct choice in a Choice class."""
@@ -47,6 +72,49 @@ class Option:
     desc: str = "Override Option desc in Option subclass"
 
 
+@dataclass
+class LazyOptions:
+    """Options which are only made when asked for, and then reused.
+
+    Subclasses hold the underlying collection (e.g. the cards in a pack),
+    and implement __len__() and make() to create each option from it.
+    This makes choices with many options cheap to create,
+    since most players only ever look at the option they chose.
+    """
+
+    def __post_init__(self):
+        self._made: Dict[int, Option] = {}  # index -> option
+        self._index: Dict[int, int] = {}  # id(option) -> index
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def make(self, index: int) -> Option:
+        """Create the option at this index, override in subclasses"""
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> Option:
+        """Get the option at this index, making it if needed"""
+        if index < 0:
+            index += len(self)
+        option = self._made.get(index)
+        if option is None:
+            if not 0 <= index < len(self):
+                raise IndexError(f"Option {index} out of range")
+            option = self.make(index)
+            self._made[index] = option
+            self._index[id(option)] = index
+        return option
+
+    def __iter__(self) -> Iterator[Option]:
+        """Iterate over all of the options, making all of them"""
+        return (self[i] for i in range(len(self)))
+
+    def __contains__(self, option: Option) -> bool:
+        """Is this exact option object one of ours, in constant time"""
+        return id(option) in self._index
+
+
 @dataclass
 class Decision(Message):
     """Decision class is a message sent to the engine,
@@ -71,7 +139,7 @@ class Choice(Message):
 
     desc: str = "Override Choice description in Choice subclass"
     player: int = -1000
-    options: List[Option] = field(default_factory=list)
+    options: List[Option] | LazyOptions = field(default_factory=list)
 
     def __len__(self) -> int:
         return len(self.options)
@@ -79,6 +147,8 @@ class Choice(Message):
     def __contains__(self, option: Option) -> bool:
         """Return True if the given option is valid"""
         assert isinstance(option, Option)
+        if isinstance(self.options, LazyOptions):
+            return option in self.options
         # Check if the exact object is in the list, not just an equal object
         return any(option is o for o in self.options)
 
@@ -97,3 +167,38 @@ class Choice(Message):
             isinstance(decision, Decision)
             and decision.option is self.options[decision.index]
         )
+
+
+@dataclass
+class Choices:  # Does not subclass Message
+    """Choices for several players at once, which they decide simultaneously.
+    The reply is a Decisions, with a decision for each choice in order."""
+
+    choices: List[Choice] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.choices)
+
+    def __iter__(self):
+        return iter(self.choices)
+
+    def is_valid_decisions(self, decisions: "Decisions") -> bool:
+        """Return True if there is a valid decision for each choice"""
+        return (
+            isinstance(decisions, Decisions)
+            and len(decisions) == len(self)
+            and all(c.is_valid_decision(d) for c, d in zip(self, decisions))
+        )
+
+
+@dataclass
+class Decisions:  # Does not subclass Message
+    """Decisions for each choice in a Choices, in the same order"""
+
+    decisions: List[Decision] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.decisions)
+
+    def __iter__(self):
+        return iter(self.decisions)
@@ -8,9 +8,11 @@ but will also send some in response.
 The player keeps a record of all messages in a history,
 which can be used as sequential context for AI.
 """
+import math
 from dataclasses import dataclass, field
 from random import Random
-from typing import List
+from time import perf_counter
+from typing import Callable, Iterator, List, Optional
 
 from mtg_engine.decision_engine.message import Choice, Decision, Message, View
 
@@ -29,7 +31,9 @@ class Player:
     history: List[Message] = field(default_factory=list)
 
     def view(self, view) -> None:
-        """Send a View message to the engine"""
+        """Receive a View message from the engine.
+        Views may be shared with other players (see SharedViews),
+        so subclasses must not modify them."""
         assert isinstance(view, View)
         # Subclasses may also want to update some internal state
         self.history.append(view)
@@ -55,6 +59,55 @@ class Player:
         """Override in subclasses, engine will call choice() instead"""
         raise NotImplementedError
 
+    def batch_choice(self, choices: List[Choice]) -> List[Decision]:
+        """Receive several simultaneous choices (see Choices), possibly for several seats,
+        and respond with a decision for each.
+
+        Override this to decide all of them together (e.g. with one batched model call),
+        by default each choice is decided separately.
+        """
+        return [self.choice(choice) for choice in choices]
+
+    def timed_out(self, decision: Decision) -> None:
+        """The engine replaced our late decision with this one (see TimeBudget)"""
+        assert isinstance(self.history[-1], Decision), f"{self.history[-1]}"
+        self.history[-1] = decision
+
+
+@dataclass
+class AnytimePlayer(Player):
+    """Player which improves its answer until it runs out of time.
+
+    Subclasses override search() to yield better and better option indexes,
+    and the last one yielded before the deadline is the decision.
+    The deadline is set by the engine's TimeBudget, if it has one,
+    and without a deadline search() has to finish on its own.
+    """
+
+    # Clock time to decide by, or None for no limit
+    deadline: Optional[float] = field(default=None, repr=False)
+    # Current time in seconds, the budget's timer when there is one
+    timer: Callable[[], float] = field(default=perf_counter, repr=False)
+
+    def remaining(self) -> float:
+        """Seconds left to decide in"""
+        if self.deadline is None:
+            return math.inf
+        return self.deadline - self.timer()
+
+    def decide(self, choice) -> int:
+        """Take the best answer from search() so far, when time runs out"""
+        best = None
+        for best in self.search(choice):
+            if self.remaining() <= 0:
+                break
+        assert best is not None, f"No answer for {choice}"
+        return best
+
+    def search(self, choice) -> Iterator[int]:
+        """Override in subclasses, yield better option indexes over time"""
+        raise NotImplementedError
+
 
 @dataclass
 class FixedPlayer(Player):
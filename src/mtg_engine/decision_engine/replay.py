@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Compact replay logs, for re-running games without any player logic
+
+A replay log is the seed of the engine's RNG, plus the index of every decision,
+plus a checksum of the game (see Engine.checksum) to verify the replay.
+
+Logs are stored as a small binary header followed by the decision indices,
+packed into as few bytes as the largest index allows,
+so many logs can be written back to back in a single file.
+
+Replaying needs a factory that makes the same engine from a seed.
+The players of the replayed engine are never called,
+so the factory can use any placeholder players.
+"""
+import struct
+from array import array
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Iterator, List
+
+from mtg_engine.decision_engine.checksum import Checksum
+from mtg_engine.decision_engine.engine import Engine
+
+MAGIC = b"MTGR"
+VERSION = 1
+# magic, version, bytes per decision, seed, number of decisions, checksum
+HEADER = struct.Struct("<4sBBQII")
+# array typecodes by the number of bytes per decision
+TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+@dataclass
+class ReplayLog:
+    """Everything needed to deterministically re-run a game"""
+
+    seed: int
+    decisions: List[int] = field(default_factory=list)
+    checksum: int = 0
+
+    @classmethod
+    def from_engine(cls, engine: Engine, seed: int) -> "ReplayLog":
+        """Make a log from a finished engine, which was made with this seed"""
+        assert engine.checksum is not None, "Engine needs a checksum to log"
+        return cls(seed, engine.decisions.copy(), engine.checksum.value)
+
+    def to_bytes(self) -> bytes:
+        """Pack the log into bytes"""
+        assert 0 <= self.seed < 2**64, f"Seed {self.seed} must fit in 64 bits"
+        largest = max(self.decisions, default=0)
+        width = next(w for w in (1, 2, 4) if largest < 256**w)
+        header = HEADER.pack(
+            MAGIC, VERSION, width, self.seed, len(self.decisions), self.checksum
+        )
+        return header + array(TYPECODES[width], self.decisions).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ReplayLog":
+        """Unpack a log from bytes"""
+        magic, version, width, seed, num, checksum = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} replay log: {magic}")
+        decisions = array(TYPECODES[width])
+        decisions.frombytes(data[HEADER.size : HEADER.size + num * width])
+        if len(decisions) != num:
+            raise ValueError(f"Truncated replay log: {len(decisions)} of {num}")
+        return cls(seed, decisions.tolist(), checksum)
+
+    def write(self, file: BinaryIO) -> None:
+        """Append the log to a binary file"""
+        file.write(self.to_bytes())
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> Iterator["ReplayLog"]:
+        """Read all of the logs written back to back in a binary file"""
+        while header := file.read(HEADER.size):
+            _, _, width, _, num, _ = HEADER.unpack(header)
+            yield cls.from_bytes(header + file.read(num * width))
+
+    def replay(self, make_engine: Callable[[int], Engine]) -> Engine:
+        """Re-run the game without calling players, and verify the checksum.
+        Returns the finished engine, which has all of the game state."""
+        engine = make_engine(self.seed)
+        engine.checksum = Checksum()
+        message = engine.replay(self.decisions)
+        if message is not None:
+            raise ValueError(f"Replay did not finish, stopped at {message}")
+        if engine.decisions != self.decisions:
+            raise ValueError("Replay did not use all of the decisions")
+        if engine.checksum.value != self.checksum:
+            raise ValueError(f"Replay checksum mismatch for seed {self.seed}")
+        return engine
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Opt-in instrumentation of the messages sent by an engine
+
+Give an engine an EngineStats (engine.stats = EngineStats()) to record:
+* counts of each message class
+* latency histograms of each message class, and of each player's decisions
+* distributions of the number of options in choices
+* time spent in the validity assertions
+
+When engine.stats is None, the engine skips all of this.
+"""
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Dict
+
+from mtg_engine.decision_engine.message import (
+    Choice,
+    Choices,
+    Decision,
+    Decisions,
+    Views,
+)
+
+
+@dataclass
+class MessageStats:
+    """Statistics for one kind of message (or one player)"""
+
+    count: int = 0
+    nanoseconds: int = 0  # Total time spent
+    # Histogram of latencies, keyed by power of two nanoseconds upper bound
+    latency: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    # Distribution of the number of options, only for choices
+    options: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def add(self, nanoseconds: int, num_options: int = 0) -> None:
+        """Record a single message"""
+        self.count += 1
+        self.nanoseconds += nanoseconds
+        self.latency[1 << nanoseconds.bit_length()] += 1
+        if num_options:
+            self.options[num_options] += 1
+
+    def to_dict(self) -> dict:
+        """Plain data version, for exporting to JSON"""
+        return {
+            "count": self.count,
+            "nanoseconds": self.nanoseconds,
+            "latency": dict(self.latency),
+            "options": dict(self.options),
+        }
+
+
+@dataclass
+class EngineStats:
+    """Statistics for all the messages sent by an engine"""
+
+    # Keyed by the message class name
+    messages: Dict[str, MessageStats] = field(
+        default_factory=lambda: defaultdict(MessageStats)
+    )
+    # Keyed by player index, only for choices
+    players: Dict[int, MessageStats] = field(
+        default_factory=lambda: defaultdict(MessageStats)
+    )
+    # Time spent checking messages and decisions are valid
+    assert_nanoseconds: int = 0
+
+    def send_receive(
+        self, engine, message: Choice | Choices | Views
+    ) -> Decision | Decisions | None:
+        """Instrumented version of Engine.send_receive()"""
+        start = perf_counter_ns()
+        if isinstance(message, Choice):
+            assert engine.is_valid_choice(message), f"Invalid {message}"
+            sent = perf_counter_ns()
+            decision = engine.send_choice(message)
+            received = perf_counter_ns()
+            assert message.is_valid_decision(decision), f"Invalid {decision}"
+            checked = perf_counter_ns()
+            elapsed = received - sent
+            num_options = len(message)
+            self.messages[type(message).__name__].add(elapsed, num_options)
+            self.players[message.player].add(elapsed, num_options)
+            self.assert_nanoseconds += (sent - start) + (checked - received)
+            return decision
+        if isinstance(message, Choices):
+            assert engine.is_valid_choices(message), f"Invalid {message}"
+            sent = perf_counter_ns()
+            decisions = engine.send_choices(message)
+            received = perf_counter_ns()
+            assert message.is_valid_decisions(decisions), f"Invalid {decisions}"
+            checked = perf_counter_ns()
+            elapsed = received - sent
+            num_options = sum(len(choice) for choice in message)
+            self.messages[type(message).__name__].add(elapsed, num_options)
+            for choice in message:  # Every player waited for the whole batch
+                self.players[choice.player].add(elapsed, len(choice))
+            self.assert_nanoseconds += (sent - start) + (checked - received)
+            return decisions
+        if isinstance(message, Views):
+            assert engine.is_valid_views(message), f"Invalid {message}"
+            sent = perf_counter_ns()
+            engine.send_views(message)
+            received = perf_counter_ns()
+            self.messages[type(message).__name__].add(received - sent)
+            self.assert_nanoseconds += sent - start
+            return None
+        raise ValueError(f"{message} is not a Choice, Choices, or Views")
+
+    def to_dict(self) -> dict:
+        """Plain data version, for exporting to JSON"""
+        return {
+            "messages": {k: v.to_dict() for k, v in self.messages.items()},
+            "players": {k: v.to_dict() for k, v in self.players.items()},
+            "assert_nanoseconds": self.assert_nanoseconds,
+        }
+
+    def to_json(self) -> str:
+        """Export all of the statistics as a JSON string"""
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def save(self, path: str) -> None:
+        """Save all of the statistics to a JSON file"""
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write(self.to_json())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Chrome trace-event export of engine execution
+
+Give an engine a Tracer (engine.tracer = Tracer()) to record spans for:
+* the whole run of the engine
+* each phase of the game, for coroutines decorated with @traced,
+  as a span for every stretch of work between its messages
+* each choice sent to a player (until the decision comes back)
+* each views broadcast to all of the players
+
+Save the trace with Tracer.save() and load it in chrome://tracing or Perfetto.
+When engine.tracer is None, traced phases are the plain coroutines.
+Phase spans are closed before each message is yielded, so a game that is
+abandoned while waiting for a reply (e.g. by replay() or a discarded fork)
+never leaves a span open until it is garbage collected.
+
+https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+"""
+import functools
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Any, Dict, Iterator, List, Optional
+
+from mtg_engine.decision_engine.message import Choice, Choices, Views
+
+
+@dataclass
+class Tracer:
+    """Collects trace events, in the Chrome trace-event format"""
+
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    pid: int = field(default_factory=os.getpid)
+    tid: int = 0
+
+    @staticmethod
+    def now() -> float:
+        """Current timestamp in microseconds"""
+        return perf_counter_ns() / 1000
+
+    def begin(self, name: str, args: Optional[Dict[str, Any]] = None) -> None:
+        """Begin a span, which must be ended with end()"""
+        event = {"name": name, "ph": "B", "ts": self.now()}
+        event.update(pid=self.pid, tid=self.tid, args=args or {})
+        self.events.append(event)
+
+    def end(self, name: str) -> None:
+        """End the most recently begun span"""
+        event = {"name": name, "ph": "E", "ts": self.now()}
+        event.update(pid=self.pid, tid=self.tid)
+        self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, args: Optional[Dict[str, Any]] = None) -> Iterator:
+        """Context manager for a span"""
+        self.begin(name, args)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def message_span(self, message: Choice | Choices | Views):
+        """Span for sending a message to players"""
+        if isinstance(message, Choice):
+            args = {"player": message.player, "options": len(message)}
+            return self.span(f"choice {type(message).__name__}", args)
+        if isinstance(message, Choices):
+            args = {"players": [choice.player for choice in message]}
+            return self.span(f"choices {type(message).__name__}", args)
+        return self.span(f"views {type(message).__name__}")
+
+    def phase(self, name: str, game):
+        """Wrap a coroutine, with a span for each stretch of its work,
+        which ends when it yields a message (or returns)"""
+        reply = None
+        try:
+            while True:
+                with self.span(name):
+                    try:
+                        message = game.send(reply)
+                    except StopIteration as stop:
+                        return stop.value
+                reply = yield message
+        finally:
+            game.close()
+
+    def to_json(self) -> str:
+        """Export the events in the Chrome trace-event JSON format"""
+        return json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"})
+
+    def save(self, path: str) -> None:
+        """Save the trace to a JSON file"""
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write(self.to_json())
+
+
+def traced(method):
+    """Decorator for engine coroutines, to trace them as phases of the game.
+    The engine needs a tracer attribute, and the phase is named by the method."""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        game = method(self, *args, **kwargs)
+        if self.tracer is None:
+            return game
+        return self.tracer.phase(name, game)
+
+    return wrapper
@@ -3,16 +3,23 @@
 `mtg_cards.booster` MTG card booster dataclasses
 
 Callers should make BoosterBox objects, and use them to make boosters.
+
+Before starting a pool of worker processes, call warm_caches() to load everything,
+so the forked workers share the loaded cards (copy-on-write) instead of each loading them.
 """
 # %% # Sample random booster packs
+import gc
 import logging
+import os
 import random
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from mtg_engine.mtg_cards.booster_probs import BoosterProbs
 from mtg_engine.mtg_cards.cards import Cards
 from mtg_engine.mtg_cards.neo_booster import get_booster_probs as get_booster_probs_neo
+from mtg_engine.mtg_cards.sets import get_set
 
 
 @dataclass
@@ -20,26 +27,55 @@ class BoosterProbsCache:
     """Singleton container for booser probabilities"""
 
     sets: Dict[str, BoosterProbs] = field(default_factory=dict)
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+
+    def after_fork(self) -> None:
+        """New lock in a forked child, since another thread may have held it"""
+        self.lock = threading.RLock()
 
     def get_booster_probs(self, set_name: str) -> BoosterProbs:
         """Get the booster pack probs for this set."""
         if set_name not in self.sets:
-            logging.debug("Computing booster probs for %s", set_name)
-            if set_name == "neo":
-                booster_probs = get_booster_probs_neo()
-            else:
-                raise ValueError(f"Unknown set {set_name}")
-            # Check we got all 15 slots
-            assert len(booster_probs) == 15, f"{len(booster_probs)}"
-            # Sort them by card name for easier debugging
-            booster_probs.sort()
-            # Add to cache
-            self.sets[set_name] = booster_probs
+            with self.lock:  # Only one thread computes each set
+                if set_name not in self.sets:
+                    self.sets[set_name] = self.make_booster_probs(set_name)
         return self.sets[set_name]
 
+    @staticmethod
+    def make_booster_probs(set_name: str) -> BoosterProbs:
+        """Compute the booster pack probs for this set."""
+        logging.debug("Computing booster probs for %s", set_name)
+        if set_name == "neo":
+            booster_probs = get_booster_probs_neo()
+        else:
+            raise ValueError(f"Unknown set {set_name}")
+        # Check we got all 15 slots
+        assert len(booster_probs) == 15, f"{len(booster_probs)}"
+        # Sort them by card name for easier debugging
+        booster_probs.sort()
+        return booster_probs
+
 
 booster_probs_cache = BoosterProbsCache()
-get_booster_probs = booster_probs_cache.get_booster_probs
+os.register_at_fork(after_in_child=booster_probs_cache.after_fork)
+
+
+def get_booster_probs(set_name: str) -> BoosterProbs:
+    """Get the booster pack probs for this set, see BoosterProbsCache"""
+    return booster_probs_cache.get_booster_probs(set_name)
+
+
+def warm_caches(set_names: Iterable[str] = ("neo",)) -> None:
+    """Load every set and booster probs, before forking worker processes.
+    This also moves everything loaded so far out of reach of the garbage collector,
+    so the children don't write to (and copy) the shared pages by collecting it."""
+    for set_name in set_names:
+        get_set(set_name)
+        get_booster_probs(set_name)
+    gc.collect()
+    gc.freeze()
 
 
 @dataclass
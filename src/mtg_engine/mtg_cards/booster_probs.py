@@ -72,6 +72,17 @@ class BoosterProbs:
         """Return an iterator over all of the slots"""
         return iter(self.probs)
 
+    def __deepcopy__(self, memo) -> "BoosterProbs":
+        """Booster probabilities are read-only singletons, so don't copy them"""
+        return self
+
+    def __reduce__(self):
+        """Booster probabilities are singletons, so pickle them by set name"""
+        # pylint: disable-next=import-outside-toplevel,cyclic-import
+        from mtg_engine.mtg_cards.booster import get_booster_probs
+
+        return (get_booster_probs, (self.set_name,))
+
     def sort(self):
         """Sort all of the slots by card name"""
         for prob in self.probs:
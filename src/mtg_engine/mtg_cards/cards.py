@@ -53,6 +53,24 @@ class Card:
         """Hash based on the name of the card"""
         return hash(self.name)
 
+    def __copy__(self) -> "Card":
+        """Cards are singletons, so a copy is the same object"""
+        return self
+
+    def __deepcopy__(self, memo) -> "Card":
+        """Cards are singletons, so a deep copy is the same object"""
+        return self
+
+    def __reduce__(self):
+        """Cards are singletons, so pickle them by set and collector number.
+        Bogus cards (without a set) are pickled by value."""
+        if "collector_number" not in self.oracle:
+            return (Card, (self.name, self.oracle))
+        # pylint: disable-next=import-outside-toplevel,cyclic-import
+        from mtg_engine.mtg_cards.sets import get_card
+
+        return (get_card, self.set_number)
+
     @property
     def set_number(self):
         """Get the set number of the card"""
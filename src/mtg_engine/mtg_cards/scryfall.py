@@ -7,6 +7,9 @@ in order to avoid a circular import loop between this file and it.
 
 Callers should use the direct functions in this module,
 and not access the singleton instance of the ScryfallCache directly.
+
+Files are written to a temporary path and then renamed,
+so other threads and processes never read a partially downloaded file.
 """
 
 # %%
@@ -14,6 +17,7 @@ import gzip
 import json
 import logging
 import os
+import threading
 from dataclasses import dataclass, field
 from types import MappingProxyType
 from typing import Dict, Optional
@@ -49,8 +53,10 @@ def download_scryfall_file(url: str) -> str:
     # Make sure the directory exists
     os.makedirs(os.path.dirname(path), exist_ok=True)
     # Save the file
-    with open(path, "wb") as file:
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as file:
         file.write(request.content)
+    os.replace(temp_path, path)
     return path
 
 
@@ -71,8 +77,10 @@ def download_scryfall_json(url: str) -> str:
     # Make sure the directory exists
     os.makedirs(os.path.dirname(path), exist_ok=True)
     # Save the file compressed
-    with gzip.open(path, "wt", encoding="UTF-8") as file:
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with gzip.open(temp_path, "wt", encoding="UTF-8") as file:
         json.dump(request.json(), file)
+    os.replace(temp_path, path)
     return path
 
 
@@ -91,26 +99,39 @@ class ScryfallCache:
 
     bulk_metadata: Optional[MappingProxyType] = None
     bulk_data: Dict[str, MappingProxyType] = field(default_factory=dict)
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+
+    def after_fork(self) -> None:
+        """New lock in a forked child, since another thread may have held it"""
+        self.lock = threading.RLock()
 
     def get_bulk_metadata(self) -> MappingProxyType:
         """Get the metadata for bulk data downloads from Scryfall"""
         if self.bulk_metadata is None:
-            url = "https://api.scryfall.com/bulk-data"
-            self.bulk_metadata = get_scryfall_json(url)
+            with self.lock:  # Only one thread downloads it
+                if self.bulk_metadata is None:
+                    url = "https://api.scryfall.com/bulk-data"
+                    self.bulk_metadata = get_scryfall_json(url)
         return self.bulk_metadata
 
     def get_bulk_data(self, data_type: str) -> MappingProxyType:
         """Get bulk data of the given type from scryfall"""
         if data_type not in self.bulk_data:
-            metadata = self.get_bulk_metadata()
-            for data in metadata["data"]:
-                if data["type"] == data_type:
-                    self.bulk_data[data_type] = get_scryfall_json(data["download_uri"])
-                    break
-            else:
-                raise ValueError(f"No bulk data of type {data_type} in {metadata}")
+            with self.lock:  # Only one thread downloads each type
+                if data_type not in self.bulk_data:
+                    self.bulk_data[data_type] = self.load_bulk_data(data_type)
         return self.bulk_data[data_type]
 
+    def load_bulk_data(self, data_type: str) -> MappingProxyType:
+        """Load (and download if needed) bulk data of the given type"""
+        metadata = self.get_bulk_metadata()
+        for data in metadata["data"]:
+            if data["type"] == data_type:
+                return get_scryfall_json(data["download_uri"])
+        raise ValueError(f"No bulk data of type {data_type} in {metadata}")
+
     def get_all_bulk_data(self) -> None:
         """Download all of the bulk data to save it to cache"""
         metadata = self.get_bulk_metadata()
@@ -120,6 +141,7 @@ class ScryfallCache:
 
 # Singleton instance for the cache of scryfall data
 scryfall_cache = ScryfallCache()
+os.register_at_fork(after_in_child=scryfall_cache.after_fork)
 
 # Copy some singleton methods into module namespace
 get_bulk_metadata = scryfall_cache.get_bulk_metadata
@@ -4,6 +4,7 @@
 
 The SetCache is a singleton just used to handle caching to local files.
 Sets are singleton objects, so they can be accessed by name.
+The cache is safe to use from many threads, and in forked child processes.
 
 Use get_set() to get a Set object for a set.
 """
@@ -12,6 +13,7 @@ import gzip
 import json
 import logging
 import os
+import threading
 from dataclasses import dataclass, field
 from typing import Dict
 
@@ -29,6 +31,20 @@ class Set:
     cards: Cards  # Cards found in draft boosters
     basics: Cards  # Basic lands found in this format (might have duplicates)
 
+    def __post_init__(self):
+        """Index the cards, so every card has a stable integer ID"""
+        self.ids: Dict[Card, int] = {card: i for i, card in enumerate(self.cards)}
+        self.numbers: Dict[str, Card] = {
+            card.oracle["collector_number"]: card for card in self.cards
+        }
+        # Full names, and front face names of double-faced cards (as 17lands uses),
+        # map to the first card with that name
+        self.names: Dict[str, Card] = {}
+        for card in self.cards:
+            self.names.setdefault(card.name, card)
+            if "card_faces" in card.oracle:
+                self.names.setdefault(card.oracle["card_faces"][0]["name"], card)
+
     @classmethod
     def make(cls, set_name: str = "neo", cache: bool = True) -> "Set":
         """
@@ -61,6 +77,14 @@ class Set:
         basics = set_cards.filt_basic()
         return cls(set_name, set_cards, basics)
 
+    def __deepcopy__(self, memo) -> "Set":
+        """Sets are singletons, so a deep copy is the same object"""
+        return self
+
+    def __reduce__(self):
+        """Sets are singletons, so pickle them by name"""
+        return (get_set, (self.set_name,))
+
     def render(self):
         """Render the cards in a set"""
         return self.cards.render(rowsize=30)
@@ -68,7 +92,23 @@ class Set:
     def __contains__(self, card: Card) -> bool:
         """Check if a card is in this set"""
         assert isinstance(card, Card), f"{card}"
-        return card in self.cards
+        return card in self.ids
+
+    def __len__(self) -> int:
+        """Number of distinct cards (and card IDs) in this set"""
+        return len(self.cards)
+
+    def card_id(self, card: Card) -> int:
+        """Get the integer ID of a card, which is its index in the set"""
+        return self.ids[card]
+
+    def get_card(self, collector_number: str) -> Card:
+        """Get a card by its collector number"""
+        return self.numbers[collector_number]
+
+    def get_by_name(self, name: str) -> Card:
+        """Get a card by its name, or the front face name of a double-faced card"""
+        return self.names[name]
 
 
 @dataclass
@@ -76,6 +116,13 @@ class SetCache:
     """Singleton class to hold all of the sets"""
 
     sets: Dict[str, Set] = field(default_factory=dict)
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+
+    def after_fork(self) -> None:
+        """New lock in a forked child, since another thread may have held it"""
+        self.lock = threading.RLock()
 
     def get_set(self, set_name: str = "neo", cache: bool = True) -> Set:
         """
@@ -85,14 +132,20 @@ class SetCache:
         cache: bool - if true, load from a locally cached file, else pull from scryfall
         """
         if set_name not in self.sets:
-            self.sets[set_name] = Set.make(set_name=set_name, cache=cache)
+            with self.lock:  # Only one thread makes each set
+                if set_name not in self.sets:
+                    self.sets[set_name] = Set.make(set_name=set_name, cache=cache)
         return self.sets[set_name]
 
 
 set_cache = SetCache()
+os.register_at_fork(after_in_child=set_cache.after_fork)
+
 
 # Put some singleton methods in the module namespace
-get_set = set_cache.get_set
+def get_set(set_name: str = "neo", cache: bool = True) -> Set:
+    """Get a Set object, see SetCache.get_set()"""
+    return set_cache.get_set(set_name=set_name, cache=cache)
 
 
 def get_basics(set_name: str = "neo") -> Cards:
@@ -100,6 +153,16 @@ def get_basics(set_name: str = "neo") -> Cards:
     return get_set(set_name).basics
 
 
+def get_card(set_name: str, collector_number: str) -> Card:
+    """Get a card by its set and collector number"""
+    return get_set(set_name).get_card(collector_number)
+
+
+def get_card_id(card: Card) -> int:
+    """Get the integer ID of a card within its own set"""
+    return get_set(card.oracle["set"]).card_id(card)
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
     print("Set:")
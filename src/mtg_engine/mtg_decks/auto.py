@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Automatic limited deck building, without stepping DeckEngine.
+
+For every pair of colors, DeckBuilder takes the highest value spells in those colors
+(and colorless ones) from the pool, staying under a maximum count for each mana value
+when it can, and scores the pair by the total value of the spells.
+The best pair gets its on-color nonbasic lands,
+and basics split in proportion to the colored mana symbols of its spells,
+or (with castable=True) the split that casts its spells on curve most often
+(see mana.py).
+
+Card values come from a pluggable function, e.g. ratings from a RatingTable:
+
+    builder = DeckBuilder(value=lambda card: table.ratings[get_card_id(card)])
+    deck = builder.build(pool)
+"""
+import itertools
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from random import Random
+from typing import Callable, Dict, List, Tuple
+
+from mtg_engine.mtg_cards.cards import Card, Cards
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_decks.decks import LimitedDeck, card_colors, mana_pips
+from mtg_engine.mtg_decks.mana import recommend_basics
+from mtg_engine.mtg_decks.sealed import Sealed
+
+COLORS = "WUBRG"
+BASIC_NAMES = {
+    "W": "Plains",
+    "U": "Island",
+    "B": "Swamp",
+    "R": "Mountain",
+    "G": "Forest",
+}
+PAIRS = ["".join(pair) for pair in itertools.combinations(COLORS, 2)]
+RARITY_VALUES = {"common": 1.0, "uncommon": 2.0, "rare": 3.0, "mythic": 4.0}
+
+
+def rarity_value(card: Card) -> float:
+    """Value a card by its rarity, as a stand-in for real card ratings"""
+    return RARITY_VALUES.get(card.rarity, 0.0)
+
+
+def split_basics(pips: Dict[str, int], colors: str, num: int) -> Dict[str, int]:
+    """Split num basics between colors in proportion to their mana symbols,
+    rounding with the largest remainders, and evenly if there are no symbols"""
+    weights = {color: pips.get(color, 0) for color in colors}
+    total = sum(weights.values())
+    if total == 0:
+        weights, total = {color: 1 for color in colors}, len(colors)
+    shares = {color: num * weight / total for color, weight in weights.items()}
+    split = {color: int(share) for color, share in shares.items()}
+    by_remainder = sorted(colors, key=lambda c: split[c] - shares[c])
+    for color in by_remainder[: num - sum(split.values())]:
+        split[color] += 1
+    return split
+
+
+@dataclass
+class DeckBuilder:
+    """Builds a limited deck from a pool, in the best pair of colors"""
+
+    value: Callable[[Card], float] = rarity_value
+    deck_size: int = 40
+    spells: int = 23  # Number of nonland cards in the main deck
+    # Maximum number of spells of each mana value, with 6 meaning 6 or more
+    curve: Dict[int, int] = field(
+        default_factory=lambda: {0: 2, 1: 3, 2: 7, 3: 6, 4: 5, 5: 3, 6: 2}
+    )
+    castable: bool = False  # Split basics by castability, instead of by symbols
+
+    def pair_spells(self, spells: List[Tuple[float, Card]], pair: str) -> List[Card]:
+        """The best spells in a pair of colors, from spells sorted by value.
+        Spells over the curve limits are only used if there aren't enough others."""
+        in_colors = [card for _, card in spells if set(card_colors(card)) <= set(pair)]
+        chosen: List[Card] = []
+        over: List[Card] = []
+        counts: Counter = Counter()
+        for card in in_colors:
+            mana_value = min(int(card.oracle.get("cmc", 0)), max(self.curve))
+            if counts[mana_value] < self.curve.get(mana_value, 0):
+                counts[mana_value] += 1
+                chosen.append(card)
+                if len(chosen) == self.spells:
+                    return chosen
+            else:
+                over.append(card)
+        return chosen + over[: self.spells - len(chosen)]
+
+    def best_pair(self, nonbasic: List[Card]) -> Tuple[str, float, List[Card]]:
+        """The pair of colors with the most valuable spells, its score and spells"""
+        spells = sorted(
+            ((self.value(card), card) for card in nonbasic if not card.land),
+            key=lambda pair: -pair[0],  # Stable, so ties keep pool order
+        )
+        best, best_score, best_spells = PAIRS[0], float("-inf"), []
+        for pair in PAIRS:
+            chosen = self.pair_spells(spells, pair)
+            score = sum(self.value(card) for card in chosen)
+            if score > best_score:
+                best, best_score, best_spells = pair, score, chosen
+        return best, best_score, best_spells
+
+    def add_basics(self, deck: LimitedDeck, pair: str, num_basics: int) -> None:
+        """Fill the deck with basics of a pair of colors"""
+        if self.castable:
+            split = recommend_basics(deck, pair, num_basics)
+        else:
+            pips: Counter = Counter()
+            for card in deck.main:
+                pips.update(mana_pips(card))
+            split = split_basics(pips, pair, num_basics)
+        for color, num in split.items():
+            basic = deck.basics.get_by_name(BASIC_NAMES[color])[0]
+            for _ in range(num):
+                deck.pick(basic)
+
+    def build(self, pool: Cards, set_name: str = "neo") -> LimitedDeck:
+        """Build a deck from a pool, with the rest of the pool in the sideboard"""
+        nonbasic = [card for card in pool if not card.basic]
+        best, best_score, best_spells = self.best_pair(nonbasic)
+        lands = [
+            card
+            for card in nonbasic
+            if card.land
+            and card.oracle["color_identity"]
+            and set(card.oracle["color_identity"]) <= set(best)
+        ]
+        lands = lands[: self.deck_size - len(best_spells)]
+        deck = LimitedDeck(set_name=set_name, sideboard=Cards(nonbasic))
+        for card in best_spells + lands:
+            deck.pick(card)
+        self.add_basics(deck, best, self.deck_size - len(best_spells) - len(lands))
+        logging.debug("Built %s deck, with a score of %s", best, best_score)
+        return deck
+
+    def build_all(self, pools: List[Cards], set_name: str = "neo") -> List[LimitedDeck]:
+        """Build a deck for each pool, e.g. for every seat of a draft"""
+        return [self.build(pool, set_name) for pool in pools]
+
+
+def pool_cards(counts, set_name: str = "neo") -> Cards:
+    """Cards of a pool of counts by card ID (see DraftEngine.pools)"""
+    cards = get_set(set_name).cards
+    return Cards([cards[i] for i, num in enumerate(counts) for _ in range(int(num))])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    sealed = Sealed.make(rng=Random(0))
+    auto_deck = DeckBuilder().build(sealed.pool)
+    auto_deck.render()
@@ -7,12 +7,15 @@ Deck building engine, based on decision engine
 import logging
 from dataclasses import dataclass, field
 from random import Random
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
+from mtg_engine.decision_engine.encoder import Field, register_schema
 from mtg_engine.decision_engine.engine import Engine, MessageGen
-from mtg_engine.decision_engine.message import Choice, Option, View, Views
+from mtg_engine.decision_engine.message import Choice, LazyOptions, Option, View, Views
 from mtg_engine.decision_engine.player import BiasedPlayer, Player
+from mtg_engine.decision_engine.trace import traced
 from mtg_engine.mtg_cards.cards import Card, Cards
+from mtg_engine.mtg_cards.sets import get_card_id
 from mtg_engine.mtg_decks.decks import Deck
 from mtg_engine.mtg_decks.sealed import Sealed
 
@@ -69,6 +72,48 @@ class DeckFinishOption(Option):
     desc: str = "Finish picking"
 
 
+@dataclass
+class DeckOptions(LazyOptions):
+    """Options to finish (if legal), then pick from the sideboard and basics,
+    then unpick from the main deck, made on demand.
+    There is one option for each distinct card, not for each copy,
+    and the cards are the deck's own tuples of distinct cards (see Deck.distinct()).
+    Whether the deck is legal is only checked when it's first needed,
+    which must be before the deck changes."""
+
+    finish: Optional[bool] = None  # None until checked
+    picks: Sequence[Card] = ()
+    basics: Sequence[Card] = ()
+    unpicks: Sequence[Card] = ()
+    deck: Optional[Deck] = field(default=None, repr=False, compare=False)
+    changes: int = 0  # Number of deck changes when the options were made
+
+    def can_finish(self) -> bool:
+        """Whether the deck was legal when the options were made"""
+        if self.finish is None:
+            assert self.deck is not None, "No deck to check"
+            assert self.deck.changes == self.changes, "Deck changed since the choice"
+            self.finish = self.deck.legal()
+        return self.finish
+
+    def __len__(self) -> int:
+        size = len(self.picks) + len(self.basics) + len(self.unpicks)
+        return self.can_finish() + size
+
+    def make(self, index: int) -> Option:
+        """Make the option at this index"""
+        if self.can_finish():
+            if index == 0:
+                return DeckFinishOption()
+            index -= 1
+        if index < len(self.picks):
+            return DeckPickOption(card=self.picks[index])
+        index -= len(self.picks)
+        if index < len(self.basics):
+            return DeckPickOption(card=self.basics[index])
+        return DeckUnpickOption(card=self.unpicks[index - len(self.basics)])
+
+
 @dataclass
 class DeckChoice(Choice):
     """Which card to pick"""
@@ -79,18 +124,33 @@ class DeckChoice(Choice):
     @classmethod
     def make(cls, deck: Deck) -> "DeckChoice":
         """Create a choice from a deck"""
-        options: List[Option] = []
-        if deck.legal():
-            options.append(DeckFinishOption())
-        for card in deck.sideboard:
-            options.append(DeckPickOption(card=card))
-        for card in deck.basics:
-            options.append(DeckPickOption(card=card))
-        for card in deck.main:
-            options.append(DeckUnpickOption(card=card))
+        options = DeckOptions(
+            picks=deck.distinct("sideboard"),
+            basics=deck.basics.cards,  # Never changes
+            unpicks=deck.distinct("main"),
+            deck=deck,
+            changes=deck.changes,
+        )
         return cls(options=options)
 
 
+MAX_DECK_CARDS = 128  # Maximum encoded size of the main deck and sideboard
+
+register_schema(
+    DeckView,
+    Field("main", size=MAX_DECK_CARDS, encode=get_card_id),
+    Field("sideboard", size=MAX_DECK_CARDS, encode=get_card_id),
+)
+register_schema(DeckPickOption, Field("card", encode=get_card_id))
+register_schema(DeckUnpickOption, Field("card", encode=get_card_id))
+register_schema(DeckFinishOption)
+register_schema(
+    DeckChoice,
+    options=(DeckFinishOption, DeckPickOption, DeckUnpickOption),
+    max_options=2 * MAX_DECK_CARDS,
+)
+
+
 @dataclass
 class DeckEngine(Engine):
     """Engine for building a limited deck"""
@@ -98,6 +158,7 @@ class DeckEngine(Engine):
     deck: Deck = field(default_factory=Deck)
     max_turns: int = 1000
 
+    @traced
     def play(self) -> MessageGen:  # pylint: disable=useless-return
         """Callers should use Engine.run(), see Engine for details"""
         assert self.num_players == 1, f"{self.num_players}"
@@ -1,13 +1,111 @@
 #!/usr/bin/env python
 """
 Core Deck class and subclasses
+
+Decks keep their main deck and sideboard as counts of each card
+(see DeckStats.counts and Deck.side_counts), which pick() and unpick() update
+a card at a time, so legality and statistics don't need to look at the whole pool.
+The main and sideboard lists are only made from the counts when they are read
+(see CountedCards), and should only be changed through pick() and unpick().
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Tuple
 
-from mtg_engine.mtg_cards.cards import Cards
+from mtg_engine.mtg_cards.cards import Card, Cards
 from mtg_engine.mtg_cards.sets import get_basics, get_set
 
+KEY = itemgetter(0)  # Sort counts by card
+
+
+def card_colors(card: Card) -> Tuple[str, ...]:
+    """Colors of a card, from the front face for double-faced cards"""
+    if "colors" in card.oracle:
+        return card.oracle["colors"]
+    return card.oracle.get("card_faces", [{}])[0].get("colors", ())
+
+
+def mana_pips(card: Card) -> Counter:
+    """Counts of the colored mana symbols in a card's mana cost (front face),
+    with hybrid symbols like {W/U} counting for both colors"""
+    cost = card.oracle.get("mana_cost")
+    if cost is None:
+        cost = card.oracle.get("card_faces", [{}])[0].get("mana_cost", "")
+    pips: Counter = Counter()
+    for symbol in cost.strip("{}").split("}{"):
+        for part in symbol.split("/"):
+            if part and part in "WUBRG":
+                pips[part] += 1
+    return pips
+
+
+@dataclass
+class DeckStats:
+    """Statistics of the cards in a main deck, updated a card at a time"""
+
+    counts: Counter = field(default_factory=Counter)  # Card -> copies
+    colors: Counter = field(default_factory=Counter)  # Color -> nonland cards
+    curve: Counter = field(default_factory=Counter)  # Mana value -> nonland cards
+    lands: int = 0
+    size: int = 0  # Number of cards
+
+    @classmethod
+    def make(cls, cards: Cards) -> "DeckStats":
+        """Statistics of a list of cards"""
+        stats = cls()
+        for card in cards:
+            stats.add(card)
+        return stats
+
+    def add(self, card: Card, num: int = 1) -> None:
+        """Add copies of a card, or remove them if num is negative"""
+        self.counts[card] += num
+        self.size += num
+        if self.counts[card] <= 0:
+            assert self.counts[card] == 0, f"Removed too many {card}"
+            del self.counts[card]
+        if card.oracle.get("type_line") is None:
+            return  # Bogus cards have no stats
+        if card.land:
+            self.lands += num
+            return
+        for color in card_colors(card):
+            self.colors[color] += num
+        self.curve[int(card.oracle.get("cmc", 0))] += num
+
+    @property
+    def spells(self) -> int:
+        """Number of nonland cards"""
+        return self.size - self.lands
+
+
+class CountedCards:
+    """Descriptor for the main deck or sideboard of a Deck, which are stored as
+    counts of each card (see Deck.counts()), and made into Cards when they are read.
+    The Cards are reused until the deck changes."""
+
+    def __init__(self):
+        self.name = ""
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, deck, owner=None) -> Cards:
+        if deck is None:
+            return None  # type: ignore  # No default cards
+        cache = vars(deck).setdefault("_cards", {})
+        if self.name not in cache:
+            counts = deck.counts(self.name)
+            cache[self.name] = Cards(
+                [c for c, num in counts.items() for _ in range(num)]
+            )
+        return cache[self.name]
+
+    def __set__(self, deck, cards) -> None:
+        deck.set_counts(self.name, Cards() if cards is None else cards)
+
 
 @dataclass
 class Deck:
@@ -20,10 +118,47 @@ class Deck:
     Any not picked cards are in the sideboard.
     """
 
-    main: Cards = field(default_factory=Cards)
-    sideboard: Cards = field(default_factory=Cards)
+    # Set by the main and sideboard (see set_counts), so declared before them
+    stats: DeckStats = field(init=False, repr=False, compare=False, default=None)
+    side_counts: Counter = field(init=False, repr=False, compare=False, default=None)
+    changes: int = field(init=False, repr=False, compare=False, default=0)
+    main: Cards = CountedCards()
+    sideboard: Cards = CountedCards()
     basics: Cards = field(default_factory=lambda: get_basics("neo").unique())
 
+    def __post_init__(self):
+        """Set up the basics, the main and sideboard were counted when they were set"""
+        self.basic_set = set(self.basics)
+
+    def set_counts(self, which: str, cards: Cards) -> None:
+        """Replace the main deck or sideboard with these cards"""
+        if which == "main":
+            self.stats = DeckStats.make(cards)
+        else:
+            self.side_counts = Counter(cards)
+        self.changed(which)
+
+    def counts(self, which: str) -> Counter:
+        """Counts of each card in the main deck or sideboard"""
+        return self.stats.counts if which == "main" else self.side_counts
+
+    def changed(self, *which: str) -> None:
+        """Forget the main and sideboard lists after the counts change,
+        and the distinct cards of which ones gained or lost a card entirely"""
+        self.changes += 1  # e.g. for DeckOptions
+        vars(self).pop("_cards", None)
+        distinct = vars(self).setdefault("_distinct", {})
+        for name in which:
+            distinct.pop(name, None)
+
+    def distinct(self, which: str) -> Tuple[Card, ...]:
+        """Distinct cards in the main deck or sideboard.
+        The tuple is reused until a card is added or removed entirely."""
+        distinct = vars(self).setdefault("_distinct", {})
+        if which not in distinct:
+            distinct[which] = tuple(self.counts(which))
+        return distinct[which]
+
     @property
     def pool(self) -> Cards:
         """Return the whole pool"""
@@ -44,37 +179,46 @@ class Deck:
 
     def sort(self):
         """Sort the main deck and sideboard"""
-        self.main.sort()
-        self.sideboard.sort()
+        self.stats.counts = Counter(dict(sorted(self.stats.counts.items(), key=KEY)))
+        self.side_counts = Counter(dict(sorted(self.side_counts.items(), key=KEY)))
+        self.changed("main", "sideboard")
 
     @property
     def can_pick(self):
         """Return true if there are any cards in the pool"""
-        return len(self.sideboard) > 0
+        return len(self.side_counts) > 0
 
     @property
     def can_unpick(self):
         """Return true if there are any cards in the main deck"""
-        return len(self.main) > 0
+        return self.stats.size > 0
 
     def pick(self, card):
         """Pick a card for the main deck from the sideboard"""
-        if card in self.sideboard:
-            self.sideboard.remove(card)
-            self.main.append(card)
-        elif card in self.basics:
-            self.main.append(card)
-        else:
+        if self.side_counts[card] > 0:
+            self.side_counts[card] -= 1
+            if not self.side_counts[card]:
+                del self.side_counts[card]
+                self.changed("sideboard")
+        elif card not in self.basic_set:
             raise ValueError(f"None left in the sideboard {card}")
+        if card not in self.stats.counts:
+            self.changed("main")
+        self.stats.add(card)
+        self.changed()
 
     def unpick(self, card):
         """Unpick a card from the main deck to the sideboard"""
-        if card in self.main:
-            self.main.remove(card)
-            if card not in self.basics:
-                self.sideboard.append(card)
-        else:
+        if card not in self.stats.counts:
             raise ValueError(f"{card} is not in the main deck")
+        self.stats.add(card, -1)
+        if card not in self.stats.counts:
+            self.changed("main")
+        if card not in self.basic_set:
+            if card not in self.side_counts:
+                self.changed("sideboard")
+            self.side_counts[card] += 1
+        self.changed()
 
     def unify_basics(self):
         """Ensure all basics have the same art in the main deck"""
@@ -95,14 +239,32 @@ class LimitedDeck(Deck):
         """Get a handle to the set object"""
         self.set_ = get_set(self.set_name)
         self.basics = self.set_.basics.unique()
+        super().__post_init__()
+        # Only basics (which are in the set) are added to or removed from the pool
+        self.outside = self.count_outside()
+
+    def set_counts(self, which: str, cards: Cards) -> None:
+        """Replace the main deck or sideboard, and recount the cards outside the set"""
+        super().set_counts(which, cards)
+        if "set_" in vars(self):  # Otherwise counted in __post_init__
+            self.outside = self.count_outside()
+
+    def count_outside(self) -> int:
+        """Number of cards in the pool which aren't in the set"""
+        return sum(
+            num
+            for which in ("main", "sideboard")
+            for card, num in self.counts(which).items()
+            if card not in self.set_
+        )
 
     def legal(self) -> bool:
         """Return true if this deck is legal for its format"""
         # Are all the cards in the deck in the set
-        if not all(card in self.set_ for card in self.pool):
+        if self.outside:
             return False
         # Is the main deck at least 40 cards
-        if len(self.main) < 40:
+        if self.stats.size < 40:
             return False
         # That's it!
         return True
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Mana bases: the chance to cast each spell on curve, and how to split the basics.
+
+A spell with mana value v is cast on curve if the first 7 + v - 1 cards
+(one more on the draw) have at least v lands, and enough sources of each color
+for the colored mana symbols in its cost.
+Lands are grouped by which of the spell's colors they make,
+and the draws are multivariate hypergeometric over those groups,
+which is a chain of univariate hypergeometric draws, one group at a time.
+
+The univariate probabilities come from a lookup table for each deck size,
+and everything is vectorized over candidate mana bases,
+so one call scores every split of the basics at once (see recommend_basics()).
+Candidates with the same number of lands in each group are only scored once.
+
+https://www.channelfireball.com/article/How-Many-Colored-Mana-Sources-Do-You-Need-to-Consistently-Cast-Your-Spells-A-Guilds-of-Ravnica-Update/
+"""
+import functools
+import itertools
+from collections import Counter
+from typing import Dict, FrozenSet, List, Tuple
+
+import numpy as np
+
+from mtg_engine.mtg_cards.cards import Card
+from mtg_engine.mtg_decks.decks import Deck, mana_pips
+
+COLORS = "WUBRG"
+HAND_SIZE = 7
+MAX_DRAWS = 20  # Most cards seen in the lookup tables
+MAX_ELEMENTS = 1 << 22  # Most joint probabilities computed at once
+# Mana value and colored mana symbols of a spell, e.g. (3, (("W", 2),))
+Requirement = Tuple[int, Tuple[Tuple[str, int], ...]]
+
+
+@functools.lru_cache(maxsize=None)
+def hypergeometric(deck_size: int) -> np.ndarray:
+    """Lookup table of hypergeometric probabilities, for a deck size.
+    table[population, successes, draws, hits] is the chance of drawing exactly
+    hits successes in draws cards, from population cards with successes in them,
+    for any population up to the deck size."""
+    size, draws = deck_size + 1, min(deck_size, MAX_DRAWS) + 1
+    comb = np.zeros((size, size))  # comb[n, k] is n choose k
+    comb[:, 0] = 1
+    for total in range(1, size):
+        comb[total, 1:] = comb[total - 1, 1:] + comb[total - 1, :-1]
+    pop, succ, drawn, hits = np.meshgrid(
+        np.arange(size),
+        np.arange(size),
+        np.arange(draws),
+        np.arange(draws),
+        indexing="ij",
+    )
+    valid = (succ <= pop) & (drawn <= pop) & (hits <= drawn) & (hits <= succ)
+    valid &= drawn - hits <= pop - succ
+    fail = np.clip(pop - succ, 0, None)
+    table = np.where(
+        valid,
+        comb[succ, hits] * comb[fail, np.clip(drawn - hits, 0, None)],
+        0.0,
+    )
+    table /= np.maximum(comb[pop, drawn], 1)
+    table.flags.writeable = False  # Shared between calls
+    return table
+
+
+def land_colors(card: Card) -> FrozenSet[str]:
+    """Colors of mana a land makes"""
+    return frozenset(card.oracle.get("produced_mana", ())) & frozenset(COLORS)
+
+
+def requirement(card: Card) -> Requirement:
+    """Mana value and colored mana symbols of a spell"""
+    pips = tuple(sorted(mana_pips(card).items()))
+    return int(card.oracle.get("cmc", 0)), pips
+
+
+def on_curve(
+    deck_size: int,
+    lands: List[FrozenSet[str]],
+    counts: np.ndarray,
+    req: Requirement,
+    on_play: bool = True,
+) -> np.ndarray:
+    """Chance to cast a spell on curve, for candidate mana bases.
+    lands are the colors made by each kind of land,
+    and counts (candidates, kinds) how many of each kind every candidate has.
+    Only the two colors with the most symbols are checked, for spells with more."""
+    counts = np.atleast_2d(counts)
+    mana_value, pips = req
+    if mana_value == 0:
+        return np.ones(len(counts))
+    colors = [c for c, _ in sorted(pips, key=lambda p: -p[1])][:2]
+    draws = min(HAND_SIZE + mana_value - (1 if on_play else 0), deck_size, MAX_DRAWS)
+    sizes = group_sizes(lands, counts, colors)
+    hits, castable = castable_hits(req, colors, draws)
+    return distinct_chances(deck_size, sizes, hits, castable)
+
+
+def group_sizes(
+    lands: List[FrozenSet[str]], counts: np.ndarray, colors: List[str]
+) -> np.ndarray:
+    """Number of lands in each group (candidates, groups), for candidate mana bases.
+    Lands are grouped by which of the colors they make, as a bit mask."""
+    masks = [sum(1 << i for i, c in enumerate(colors) if c in land) for land in lands]
+    groups = np.zeros((len(lands), 1 << len(colors)), dtype=int)
+    groups[np.arange(len(lands)), masks] = 1
+    return counts @ groups
+
+
+def castable_hits(
+    req: Requirement, colors: List[str], draws: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lands drawn from each group of lands (groups, hits...), for up to draws cards,
+    and which of those can cast the spell.
+    Groups are bit masks of which of the colors their lands make."""
+    mana_value, pips = req
+    need = dict(pips)
+    num = 1 << len(colors)
+    hits = np.indices((draws + 1,) * num)
+    castable = hits.sum(axis=0) >= mana_value
+    for subset in range(1, num):
+        sources = sum(hits[m] for m in range(num) if m & subset)
+        needed = sum(need[c] for i, c in enumerate(colors) if subset >> i & 1)
+        castable = castable & (sources >= needed)
+    return hits, castable
+
+
+def distinct_chances(
+    deck_size: int, sizes: np.ndarray, hits: np.ndarray, castable: np.ndarray
+) -> np.ndarray:
+    """chance() for every candidate's group sizes (candidates, groups).
+    Candidates often share group sizes, so only each distinct one is scored,
+    in chunks to bound the size of the joint distributions."""
+    unique, inverse = np.unique(sizes, axis=0, return_inverse=True)
+    chances = np.empty(len(unique))
+    chunk = max(1, MAX_ELEMENTS // castable.size)
+    for start in range(0, len(unique), chunk):
+        end = start + chunk
+        chances[start:end] = chance(deck_size, unique[start:end], hits, castable)
+    return chances[inverse.reshape(-1)]
+
+
+def chance(
+    deck_size: int, sizes: np.ndarray, hits: np.ndarray, castable: np.ndarray
+) -> np.ndarray:
+    """Chance that the lands drawn from groups of sizes (candidates, groups)
+    are castable, for every combination of hits from each group"""
+    table = hypergeometric(deck_size)
+    num = sizes.shape[1]
+    shape = (len(sizes),) + (1,) * num
+    # Joint distribution of the lands drawn from each group, (candidates, hits...)
+    joint = np.ones((len(sizes),) + hits.shape[1:])
+    population = np.full(shape, deck_size)
+    remaining = np.full(hits.shape[1:], hits.shape[1] - 1)  # Number of draws
+    for group in range(num):
+        size = sizes[:, group].reshape(shape)
+        joint *= table[population, size, np.clip(remaining, 0, None), hits[group]]
+        population = population - size
+        remaining = remaining - hits[group]
+    joint *= (remaining >= 0) & (remaining <= population)  # Rest are nonlands
+    return (joint * castable).reshape(len(sizes), -1).sum(axis=1)
+
+
+def mana_base(
+    deck: Deck, basics: bool = True
+) -> Tuple[List[FrozenSet[str]], np.ndarray, Counter]:
+    """Kinds of lands in a deck's main (optionally leaving out the basics),
+    how many of each, and the requirements of its spells"""
+    kinds: Counter = Counter()
+    spells: Counter = Counter()
+    for card, num in deck.stats.counts.items():
+        if not card.land:
+            spells[requirement(card)] += num
+        elif basics or not card.basic:
+            kinds[land_colors(card)] += num
+    lands = list(kinds)
+    return lands, np.array([kinds[land] for land in lands], dtype=int), spells
+
+
+def castability(deck: Deck, on_play: bool = True) -> Dict[Card, float]:
+    """Chance to cast each spell in a deck's main on curve"""
+    lands, counts, _ = mana_base(deck)
+    size = deck.stats.size
+    chances: Dict[Requirement, float] = {}
+    result = {}
+    for card in deck.stats.counts:
+        if not card.land:
+            req = requirement(card)
+            if req not in chances:
+                chances[req] = float(on_curve(size, lands, counts, req, on_play)[0])
+            result[card] = chances[req]
+    return result
+
+
+def basics_splits(colors: str, num: int) -> np.ndarray:
+    """Every way to split num basics between colors, (splits, colors)"""
+    splits = [
+        split
+        for split in itertools.product(range(num + 1), repeat=len(colors))
+        if sum(split) == num
+    ]
+    return np.array(splits, dtype=int).reshape(-1, len(colors))
+
+
+def recommend_basics(
+    deck: Deck, colors: str, num: int, on_play: bool = True
+) -> Dict[str, int]:
+    """Split of num basics between colors, which maximizes the average chance
+    to cast the spells in a deck's main on curve.
+    The deck's nonbasic lands are kept, and its basics are replaced by the split."""
+    lands, counts, spells = mana_base(deck, basics=False)
+    splits = basics_splits(colors, num)
+    candidates = np.hstack([np.tile(counts, (len(splits), 1)), splits])
+    lands = lands + [frozenset(color) for color in colors]
+    size = int(candidates[0].sum()) + sum(spells.values())
+    total = np.zeros(len(splits))
+    for req, copies in spells.items():
+        total += copies * on_curve(size, lands, candidates, req, on_play)
+    best = splits[int(np.argmax(total))]
+    return {color: int(n) for color, n in zip(colors, best)}
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+"""
+Saving and loading decks, in a compact format, as text, and in a deck store.
+
+CompactDeck is a set code plus counts of each card ID (see Set.card_id())
+for the main deck and the sideboard, which packs into fixed size bytes.
+
+Text is the MTG Arena import/export format, which most deck sites also read:
+
+    Deck
+    2 Kami of Terrible Secrets (NEO) 103
+    9 Swamp (NEO) 298
+
+    Sideboard
+    1 Moonfolk Puzzlemaker (NEO) 69
+
+DeckStore is an append-only file of compact decks, each stored once,
+keyed by a hash of its contents, so millions of simulated decks dedupe.
+The records all have the same size, so the whole store can be memory mapped
+as a NumPy array for fast scans (see DeckStore.records()).
+"""
+import hashlib
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, List, Set
+
+import numpy as np
+
+from mtg_engine.mtg_cards.cards import Cards
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_decks.decks import LimitedDeck
+
+MAGIC = b"MTGDECK1"
+HEADER_SIZE = 16  # Magic, set code (padded to 6 bytes), and uint16 number of cards
+DIGEST_SIZE = 16
+MAX_COUNT = 255  # Most copies of a card, since counts are uint8
+LINE = re.compile(r"^(\d+)\s+(.+?)(?:\s+\((\w+)\)\s+(\S+))?$")
+
+
+def counts(cards: Cards, set_name: str) -> np.ndarray:
+    """Counts of each card ID in a list of cards"""
+    set_ = get_set(set_name)
+    ids = [set_.card_id(card) for card in cards]
+    return np.bincount(ids, minlength=len(set_)).astype(np.uint8)
+
+
+@dataclass
+class CompactDeck:
+    """A deck as counts of each card ID, for the main deck and sideboard"""
+
+    set_name: str = "neo"
+    main: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint8))
+    sideboard: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint8))
+
+    def __post_init__(self):
+        num_cards = len(get_set(self.set_name))
+        if self.main.size == 0:
+            self.main = np.zeros(num_cards, dtype=np.uint8)
+        if self.sideboard.size == 0:
+            self.sideboard = np.zeros(num_cards, dtype=np.uint8)
+        for which in ("main", "sideboard"):
+            assert self.counts(which).shape == (num_cards,), which
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactDeck):
+            return NotImplemented
+        return self.to_bytes() == other.to_bytes()
+
+    @classmethod
+    def from_deck(cls, deck: LimitedDeck) -> "CompactDeck":
+        """Compact version of a limited deck"""
+        name = deck.set_name
+        return cls(name, counts(deck.main, name), counts(deck.sideboard, name))
+
+    def counts(self, which: str = "main") -> np.ndarray:
+        """Counts of each card ID in the main deck or sideboard"""
+        return self.main if which == "main" else self.sideboard
+
+    def cards(self, which: str = "main") -> Cards:
+        """Cards of the main deck or sideboard, in card ID order"""
+        set_cards = get_set(self.set_name).cards
+        ids = np.repeat(np.arange(len(set_cards)), self.counts(which))
+        return Cards([set_cards[i] for i in ids])
+
+    def to_deck(self) -> LimitedDeck:
+        """Limited deck version, which can keep being built"""
+        return LimitedDeck(
+            set_name=self.set_name,
+            main=self.cards("main"),
+            sideboard=self.cards("sideboard"),
+        )
+
+    def to_bytes(self) -> bytes:
+        """Pack the counts into bytes, with the same size for every deck of a set"""
+        return self.main.tobytes() + self.sideboard.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, set_name: str = "neo") -> "CompactDeck":
+        """Unpack counts from bytes"""
+        sections = np.frombuffer(data, dtype=np.uint8).reshape(2, -1).copy()
+        return cls(set_name, sections[0], sections[1])
+
+    def digest(self) -> bytes:
+        """Hash of the deck's contents, which is the same for equal decks"""
+        data = self.set_name.encode() + self.to_bytes()
+        return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+    def to_text(self) -> str:
+        """Export in the MTG Arena format"""
+        lines = ["Deck"]
+        for which in ("main", "sideboard"):
+            if which == "sideboard":
+                if not self.sideboard.any():
+                    break
+                lines += ["", "Sideboard"]
+            cards = get_set(self.set_name).cards
+            section = self.counts(which)
+            for i in np.flatnonzero(section):
+                card = cards[i]
+                number = card.oracle["collector_number"]
+                count = section[i]
+                lines.append(
+                    f"{count} {card.name} ({card.oracle['set'].upper()}) {number}"
+                )
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def from_text(cls, text: str, set_name: str = "neo") -> "CompactDeck":
+        """Import from the MTG Arena format.
+        Lines without a set and collector number are looked up by name
+        (or the front face name of a double-faced card),
+        and sections other than the deck and sideboard are ignored."""
+        set_ = get_set(set_name)
+        deck = cls(set_name)
+        section = "main"
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line in ("Deck", "Sideboard", "Commander", "Companion"):
+                section = {"Deck": "main", "Sideboard": "sideboard"}.get(line, "")
+                continue
+            match = LINE.match(line)
+            if match is None:
+                raise ValueError(f"Can't parse deck line {line!r}")
+            if not section:
+                continue
+            count, name, code, number = match.groups()
+            if code is not None and code.lower() == set_name:
+                if number not in set_.numbers:
+                    raise ValueError(f"{code} {number} is not in {set_name}")
+                card = set_.get_card(number)
+            elif name in set_.names:
+                card = set_.get_by_name(name)
+            else:
+                raise ValueError(f"{name} is not in {set_name}")
+            section_counts = deck.counts(section)
+            total = int(section_counts[set_.card_id(card)]) + int(count)
+            if total > MAX_COUNT:
+                raise ValueError(f"More than {MAX_COUNT} of {card.name}")
+            section_counts[set_.card_id(card)] = total
+        return deck
+
+
+@dataclass
+class DeckStore:
+    """Append-only file of compact decks, each stored once"""
+
+    path: str
+    set_name: str = "neo"
+
+    def __post_init__(self):
+        self.num_cards = len(get_set(self.set_name))
+        self.dtype = np.dtype(
+            [
+                ("digest", np.uint8, (DIGEST_SIZE,)),
+                ("main", np.uint8, (self.num_cards,)),
+                ("sideboard", np.uint8, (self.num_cards,)),
+            ]
+        )
+        self.header = MAGIC + self.set_name.encode().ljust(6, b"\0")
+        self.header += np.uint16(self.num_cards).tobytes()
+        assert len(self.header) == HEADER_SIZE, f"{self.header!r}"
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as file:
+                file.write(self.header)
+        with open(self.path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+        if header != self.header:
+            raise ValueError(f"{self.path} is not a {self.set_name} deck store")
+        # A crash while appending can leave part of a record at the end,
+        # which would misalign every later record, so cut it off
+        size = os.path.getsize(self.path) - HEADER_SIZE
+        partial = size % self.dtype.itemsize
+        if partial:
+            logging.warning("Truncating %s partial bytes of %s", partial, self.path)
+            os.truncate(self.path, os.path.getsize(self.path) - partial)
+        records = self.records()
+        self.digests: Set[bytes] = {bytes(d) for d in records["digest"]}
+
+    def __len__(self) -> int:
+        return len(self.digests)
+
+    def __contains__(self, deck: CompactDeck) -> bool:
+        return deck.digest() in self.digests
+
+    def add(self, deck: CompactDeck) -> bool:
+        """Append a deck, unless it is already stored. Returns True if it was added."""
+        assert deck.set_name == self.set_name, f"{deck.set_name}"
+        digest = deck.digest()
+        if digest in self.digests:
+            return False
+        with open(self.path, "ab") as file:
+            file.write(digest + deck.to_bytes())
+        self.digests.add(digest)
+        return True
+
+    def add_all(self, decks: List[CompactDeck]) -> int:
+        """Append many decks with one write, returning how many were new"""
+        data = []
+        for deck in decks:
+            assert deck.set_name == self.set_name, f"{deck.set_name}"
+            digest = deck.digest()
+            if digest not in self.digests:
+                self.digests.add(digest)
+                data.append(digest + deck.to_bytes())
+        with open(self.path, "ab") as file:
+            file.write(b"".join(data))
+        return len(data)
+
+    def records(self) -> np.ndarray:
+        """All of the stored decks, as a read-only memory mapped record array"""
+        size = os.path.getsize(self.path) - HEADER_SIZE
+        num = size // self.dtype.itemsize
+        if num == 0:  # Can't memory map an empty range
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(
+            self.path, dtype=self.dtype, mode="r", offset=HEADER_SIZE, shape=(num,)
+        )
+
+    def __iter__(self) -> Iterator[CompactDeck]:
+        for record in self.records():
+            yield CompactDeck(
+                self.set_name, record["main"].copy(), record["sideboard"].copy()
+            )
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Pick-order draft bots, scoring cards with a rating table.
+
+A RatingTable holds a rating for every card in a set, indexed by card ID,
+loaded from a local CSV file (e.g. a 17lands card data export).
+Bots pick the card with the highest rating,
+plus a bonus for cards in the colors they have already picked the most of.
+The bonus ramps up over the first picks, so early picks are mostly on rating,
+and is scaled by the spread of the ratings, so it means the same for any rating scale
+(e.g. 17lands win rates around 45 to 65, or pick orders from 0 to 1).
+
+Scoring works on whole arrays of packs and pools at once (see score()),
+so the same code scores one pack for RatingPlayer in a DraftEngine,
+or every seat of every pod for rating_policy() in a VectorDraft.
+"""
+import csv
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from mtg_engine.decision_engine.message import Choice, Decision
+from mtg_engine.decision_engine.player import Player
+from mtg_engine.mtg_cards.sets import Set, get_set
+from mtg_engine.mtg_draft.draft import DraftPickOption
+from mtg_engine.mtg_draft.vector import Policy
+
+COLORS = "WUBRG"
+
+
+def card_colors(set_: Set) -> np.ndarray:
+    """Colors of every card in a set, as (num_cards, 5) weights summing to 1,
+    or to 0 for colorless cards"""
+    colors = np.zeros((len(set_), len(COLORS)), dtype=np.float32)
+    for i, card in enumerate(set_.cards):
+        identity = card.oracle["color_identity"]
+        for color in identity:
+            colors[i, COLORS.index(color)] = 1 / len(identity)
+    return colors
+
+
+def parse_rating(value: str) -> float:
+    """Parse a rating, which might be a percentage like '57.3%'"""
+    return float(value.strip().rstrip("%"))
+
+
+@dataclass
+class RatingTable:
+    """Ratings for every card in a set, indexed by card ID"""
+
+    set_name: str
+    ratings: np.ndarray  # (num_cards,) float
+    bonus: float = 0.5  # Color commitment bonus, in standard deviations of ratings
+    ramp: int = 10  # Number of picks until the full bonus applies
+
+    def __post_init__(self):
+        self.colors = card_colors(get_set(self.set_name))
+        assert self.ratings.shape == (len(self.colors),), f"{self.ratings.shape}"
+        spread = float(self.ratings.std())
+        self.scale = self.bonus * (spread if spread > 0 else 1.0)  # In rating units
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: str,
+        set_name: str = "neo",
+        name_column: str = "name",
+        rating_column: str = "rating",
+        **kwargs,
+    ) -> "RatingTable":
+        """Load ratings by card name from a CSV file.
+        Double-faced cards can be named by their front face (as 17lands does).
+        Cards without a rating (or with an empty one) get the mean rating."""
+        set_ = get_set(set_name)
+        by_name: Dict[str, float] = {}
+        unknown = []
+        with open(path, newline="", encoding="UTF-8") as file:
+            for row in csv.DictReader(file):
+                if not row[rating_column].strip():
+                    continue
+                if row[name_column] not in set_.names:
+                    unknown.append(row[name_column])
+                    continue
+                card = set_.get_by_name(row[name_column])
+                by_name[card.name] = parse_rating(row[rating_column])
+        if unknown:
+            logging.warning("Ignoring ratings for unknown cards %s", unknown)
+        assert by_name, f"No ratings in {path}"
+        default = float(np.mean(list(by_name.values())))
+        ratings = np.array(
+            [by_name.get(card.name, default) for card in set_.cards], dtype=np.float32
+        )
+        return cls(set_name, ratings, **kwargs)
+
+    def score(self, packs: np.ndarray, pools: np.ndarray) -> np.ndarray:
+        """Scores for packs of card IDs (n, size), given pools of counts (n, num_cards)"""
+        pool_colors = pools @ self.colors  # (n, 5)
+        picked = pools.sum(axis=1, keepdims=True)  # (n, 1)
+        shares = pool_colors / np.maximum(pool_colors.sum(axis=1, keepdims=True), 1)
+        weight = self.scale * np.minimum(picked / self.ramp, 1)  # (n, 1)
+        fit = np.einsum("nkc,nc->nk", self.colors[packs], shares)  # (n, size)
+        return (self.ratings[packs] + weight * fit).astype(np.float32)
+
+
+def rating_policy(table: RatingTable) -> Policy:
+    """Policy for VectorDraft, which picks like RatingPlayer"""
+    return table.score
+
+
+@dataclass
+class RatingPlayer(Player):
+    """Draft player that picks with a rating table, and a color commitment bonus.
+
+    One RatingPlayer can play many seats, keeping a pool for each
+    (which is only used when choices don't come with the engine's pool),
+    and simultaneous picks (see DraftEngine.simultaneous) for all of its seats
+    are scored together in one batch.
+    """
+
+    table: Optional[RatingTable] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        assert isinstance(self.table, RatingTable), "RatingPlayer needs a table"
+        self.pools: Dict[int, np.ndarray] = {}  # seat -> counts of picked cards
+        self.set = get_set(self.table.set_name)
+
+    def pool(self, seat: int) -> np.ndarray:
+        """Counts of the cards picked so far for a seat"""
+        if seat not in self.pools:
+            assert self.table is not None
+            self.pools[seat] = np.zeros(len(self.table.ratings), dtype=np.int16)
+        return self.pools[seat]
+
+    def add_pick(self, seat: int, decision: Decision) -> None:
+        """Add the picked card to the seat's pool"""
+        option = decision.option
+        assert isinstance(option, DraftPickOption), f"{option}"
+        self.pool(seat)[self.set.card_id(option.card)] += 1
+
+    def choice_pool(self, choice: Choice) -> np.ndarray:
+        """The pool the engine sends with the choice, or else our own for the seat"""
+        pool = getattr(choice, "pool", None)
+        return self.pool(choice.player) if pool is None else pool
+
+    def pick(self, choices: List[Choice]) -> np.ndarray:
+        """Indexes of the highest scoring cards in each pack, the first ones on ties"""
+        assert self.table is not None
+        packs = np.array(
+            [[self.set.card_id(o.card) for o in c.options] for c in choices]
+        )
+        pools = np.stack([self.choice_pool(choice) for choice in choices])
+        return self.table.score(packs, pools).argmax(axis=1)
+
+    def decide(self, choice) -> int:
+        """Pick the highest scoring card in the pack"""
+        return int(self.pick([choice])[0])
+
+    def choice(self, choice) -> Decision:
+        """Add the picked card to the seat's pool"""
+        decision = super().choice(choice)
+        self.add_pick(choice.player, decision)
+        return decision
+
+    def batch_choice(self, choices: List[Choice]) -> List[Decision]:
+        """Pick for every pack at once, packs all have the same number of cards"""
+        decisions = []
+        for choice, index in zip(choices, self.pick(choices).tolist()):
+            decision = Decision(index=index, option=choice.options[index])
+            self.history += [choice, decision]
+            self.add_pick(choice.player, decision)
+            decisions.append(decision)
+        return decisions
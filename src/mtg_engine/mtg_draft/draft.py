@@ -1,17 +1,39 @@
 #!/usr/bin/env python
 """
 Drafting, based on the Decision Engine.
+
+Packs stay where they were opened, and passing them just rotates an offset,
+so seat i holds opened[(i + offset) % num_players] (see Table, VectorDraft.holders()).
+Each seat's pool is a row of counts by card ID, and choices carry a read-only view
+of the picking seat's pool, so bots can read their pool without keeping their own.
+The view is detached once the card is picked, since the pool keeps changing,
+and the pool at an earlier choice can be rebuilt from the picks before it.
 """
 import logging
 from dataclasses import dataclass, field
 from random import Random
 from typing import List, Optional
 
+import numpy as np
+
+from mtg_engine.decision_engine.encoder import Field, register_schema
 from mtg_engine.decision_engine.engine import Engine, MessageGen
-from mtg_engine.decision_engine.message import Choice, Option, View, Views
+from mtg_engine.decision_engine.message import (
+    Choice,
+    Choices,
+    Decisions,
+    LazyOptions,
+    Option,
+    View,
+    Views,
+)
 from mtg_engine.decision_engine.player import HumanPlayer, Player, RandomPlayer
+from mtg_engine.decision_engine.trace import traced
 from mtg_engine.mtg_cards.booster import BoosterBox
 from mtg_engine.mtg_cards.cards import Card, Cards
+from mtg_engine.mtg_cards.sets import get_card_id, get_set
+
+PACK_SIZE = 15  # Number of cards in a draft booster
 
 
 @dataclass
@@ -42,17 +64,72 @@ class DraftPickOption(Option):
         self.desc = f"Pick {self.card}"
 
 
+@dataclass
+class DraftPickOptions(LazyOptions):
+    """An option to pick each card in a pack, made on demand"""
+
+    cards: List[Card] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def make(self, index: int) -> Option:
+        """Make the option to pick a card"""
+        return DraftPickOption(card=self.cards[index])
+
+
 @dataclass
 class DraftPickChoice(Choice):
     """Which card to pick"""
 
     desc: str = "Pick a card from the pack"
+    # Read-only view of the counts of the cards the player has picked, by card ID.
+    # Only set until the pick, choices in a player's history don't keep it.
+    pool: Optional[np.ndarray] = field(default=None, compare=False, repr=False)
 
     @classmethod
-    def make(cls, player: int, pack: Cards) -> "DraftPickChoice":
+    def make(
+        cls, player: int, pack: Cards, pool: Optional[np.ndarray] = None
+    ) -> "DraftPickChoice":
         """Create a choice from a pack of cards"""
-        options: List[Option] = [DraftPickOption(card=card) for card in pack]
-        return cls(player=player, options=options)
+        # Copy the cards, since the pack changes after the pick
+        options = DraftPickOptions(cards=pack.cards.copy())
+        return cls(player=player, options=options, pool=pool)
+
+
+@dataclass
+class DraftPickChoices(Choices):
+    """Which card every player picks, all at the same time"""
+
+    @classmethod
+    def make(
+        cls, packs: List[Cards], pools: Optional[List[np.ndarray]] = None
+    ) -> "DraftPickChoices":
+        """Create a choice for every player from their pack"""
+        pools = pools or [None] * len(packs)
+        return cls([DraftPickChoice.make(i, p, pools[i]) for i, p in enumerate(packs)])
+
+
+register_schema(PackView, Field("cards", size=PACK_SIZE, encode=get_card_id))
+register_schema(DraftPickOption, Field("card", encode=get_card_id))
+register_schema(
+    DraftPickChoice,
+    Field("player"),
+    options=(DraftPickOption,),
+    max_options=PACK_SIZE,
+)
+
+
+@dataclass
+class Table:
+    """Packs at the table, in the order they were opened"""
+
+    opened: List[Cards] = field(default_factory=list)
+    offset: int = 0  # Seat i holds opened[(i + offset) % len(opened)]
+
+    def pack(self, seat: int) -> Cards:
+        """The pack a seat is holding"""
+        return self.opened[(seat + self.offset) % len(self.opened)]
 
 
 @dataclass
@@ -63,40 +140,87 @@ class DraftEngine(Engine):
 
     set_name: str = "neo"
     rng: Random = field(default_factory=Random, repr=False)
-    packs: List[Cards] = field(default_factory=list)
+    table: Table = field(default_factory=Table)
     picks: Cards = field(default_factory=Cards)
+    # Counts of the cards picked by each seat, of shape (num_players, num_cards)
+    pools: np.ndarray = field(
+        default_factory=lambda: np.zeros((0, 0), dtype=np.int16),
+        compare=False,
+        repr=False,
+    )
     box: BoosterBox = field(default_factory=BoosterBox, repr=False)
+    # Every player picks at once, with a single DraftPickChoices message
+    simultaneous: bool = False
 
     def get_new_packs(self):
         """Get new packs for every player"""
-        assert all(len(pack) == 0 for pack in self.packs), "Packs should be empty"
-        self.packs = [self.box.get_booster() for _ in range(self.num_players)]
+        assert all(
+            len(pack) == 0 for pack in self.table.opened
+        ), "Packs should be empty"
+        opened = [self.box.get_booster() for _ in range(self.num_players)]
+        self.table = Table(opened)
 
     def pass_packs(self, left=True):
-        """Rotate the packs to the left"""
-        direction = -1 if left else 1
-        self.packs = self.packs[direction:] + self.packs[:direction]
-
+        """Pass the packs to the left, so seat i gets the pack from seat i - 1,
+        or to the right, so seat i gets the pack from seat i + 1"""
+        self.table.offset += -1 if left else 1
+
+    def pack(self, seat: int) -> Cards:
+        """The pack a seat is holding"""
+        return self.table.pack(seat)
+
+    def held(self) -> List[Cards]:
+        """The packs held by every seat, in seat order"""
+        return [self.pack(i) for i in range(self.num_players)]
+
+    def pool(self, seat: int) -> np.ndarray:
+        """Read-only view of the counts of the cards a seat has picked,
+        which changes with every pick (copy it to keep a snapshot)"""
+        pool = self.pools[seat].view()
+        pool.flags.writeable = False
+        return pool
+
+    def take(self, seat: int, index: int) -> None:
+        """Take a card out of a seat's pack, and add it to their pool"""
+        card = self.pack(seat).pop(index)
+        self.pools[seat, get_card_id(card)] += 1
+        self.picks.append(card)  # Add to picked cards for debugging purposes
+
+    @traced
     def play(self) -> MessageGen:  # pylint: disable=useless-return
         """Callers should use Engine.run(), see Engine for details"""
         assert 2 <= self.num_players <= 8, f"{self.num_players}"
         self.box = BoosterBox(set_name=self.set_name, rng=self.rng)
+        num_cards = len(get_set(self.set_name))
+        self.pools = np.zeros((self.num_players, num_cards), dtype=np.int16)
         for i in range(3):  # For each pack
             self.get_new_packs()  # Open pack
-            for _ in range(15):  # For each card
-                yield PackViews.make(self.packs)  # Show pack
+            for _ in range(PACK_SIZE):  # For each card
+                yield PackViews.make(self.held())  # Show pack
                 yield from self.get_picks()  # Pick card
                 self.pass_packs(bool(i % 2))  # Pass pack
         return None  # necessary for generator type
 
+    @traced
     def get_picks(self) -> MessageGen:  # pylint: disable=useless-return
         """Get a pick choice from every player"""
+        if self.simultaneous:
+            pools = [self.pool(i) for i in range(self.num_players)]
+            choices = DraftPickChoices.make(self.held(), pools)
+            decisions = yield choices
+            assert isinstance(decisions, Decisions), f"{decisions}"
+            assert choices.is_valid_decisions(decisions)
+            for i, decision in enumerate(decisions):
+                self.take(i, decision.index)
+            for choice in choices:
+                choice.pool = None  # The view would show later picks
+            return None
         for i in range(self.num_players):
-            choice = DraftPickChoice.make(player=i, pack=self.packs[i])
+            choice = DraftPickChoice.make(i, self.pack(i), self.pool(i))
             decision = yield choice
             assert decision is not None and choice.is_valid_decision(decision)
-            card = self.packs[i].pop(decision.index)
-            self.picks.append(card)  # Add to picked cards for debugging purposes
+            self.take(i, decision.index)
+            choice.pool = None  # The view would show later picks
         return None  # necessary for generator type
 
 
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+"""
+Streaming ingestion of 17lands draft data dumps into columnar arrays.
+
+17lands publishes draft logs as (multi-GB, optionally gzipped) CSV files,
+with one row per pick, and a column per card for the pack and the pool:
+
+    draft_id, event_match_wins, event_match_losses, pack_number, pick_number, pick,
+    pack_card_<name>, ..., pool_<name>, ...
+
+ingest() reads the dump in chunks of rows, maps the card names onto our set's card IDs,
+and appends each chunk to one raw binary file per column, so memory use is bounded
+by the chunk size, not the size of the dump.
+DraftLogs opens the columns as read-only memory maps.
+
+Columns (one row per pick):
+* pack: (rows, num_cards) uint8 counts of each card in the pack
+* pool: (rows, num_cards) uint8 counts of each card picked before this pick
+* pick: (rows,) int16 card ID of the pick, or -1 for a card not in the set
+* pack_number, pick_number: (rows,) int8, both starting from 0
+* wins, losses: (rows,) int8 match wins and losses of the event
+* draft: (rows,) int32 index of the draft, counting from 0 in the order of the dump
+
+17lands dumps keep all of the picks for a draft together, which is what draft relies on.
+Cards with the same name (e.g. alternate arts) all map to the lowest card ID,
+and 17lands names double-faced cards by their front face (see Set.names).
+Card names that aren't in the set are logged as warnings, and their picks are -1.
+
+https://www.17lands.com/public_datasets
+"""
+import csv
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from mtg_engine.mtg_cards.sets import Set, get_set
+
+META_FILE = "meta.json"
+# Column name -> (dtype, per-card)
+COLUMNS: Dict[str, Tuple[str, bool]] = {
+    "pack": ("uint8", True),
+    "pool": ("uint8", True),
+    "pick": ("int16", False),
+    "pack_number": ("int8", False),
+    "pick_number": ("int8", False),
+    "wins": ("int8", False),
+    "losses": ("int8", False),
+    "draft": ("int32", False),
+}
+
+
+def name_ids(set_: Set) -> Dict[str, int]:
+    """Card ID for every card name in a set (including front face names),
+    the lowest ID for duplicate names"""
+    return {name: set_.card_id(card) for name, card in set_.names.items()}
+
+
+def open_text(path: str) -> IO[str]:
+    """Open a CSV file for reading, which might be gzipped"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="", encoding="UTF-8")
+    return open(path, newline="", encoding="UTF-8")
+
+
+def chunks(rows: Iterator[List[str]], size: int) -> Iterator[List[List[str]]]:
+    """Group rows into lists of at most size rows"""
+    chunk: List[List[str]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def int_column(chunk: List[List[str]], column: int) -> np.ndarray:
+    """Integers from one column of a chunk of CSV rows"""
+    return np.array([row[column] for row in chunk], dtype=int)
+
+
+@dataclass
+class CardColumns:
+    """Where each card's columns with a prefix (e.g. "pack_card_") are in the CSV"""
+
+    columns: np.ndarray  # CSV column indexes
+    ids: np.ndarray  # Card ID for each of those columns
+
+    @classmethod
+    def make(cls, header: List[str], prefix: str, ids: Dict[str, int]):
+        """Find the columns for every card in the set"""
+        columns, card_ids, unknown = [], [], []
+        for i, name in enumerate(header):
+            if name.startswith(prefix):
+                card = name[len(prefix) :]
+                if card in ids:
+                    columns.append(i)
+                    card_ids.append(ids[card])
+                else:
+                    unknown.append(card)
+        if unknown:
+            logging.warning("Ignoring %s columns for unknown cards %s", prefix, unknown)
+        return cls(np.array(columns, dtype=int), np.array(card_ids, dtype=int))
+
+    def counts(self, chunk: List[List[str]], num_cards: int) -> np.ndarray:
+        """Counts of each card for every row of a chunk of CSV rows.
+        Only the card columns are converted, straight to uint8."""
+        columns = self.columns.tolist()
+        values = np.array([[row[i] for i in columns] for row in chunk], dtype=np.uint8)
+        counts = np.zeros((len(chunk), num_cards), dtype=np.uint8)
+        np.add.at(counts, (slice(None), self.ids), values)  # Duplicate names add up
+        return counts
+
+
+@dataclass
+class LogParser:
+    """Parses chunks of rows of a 17lands CSV into the columns of DraftLogs"""
+
+    ids: Dict[str, int]  # Card name -> card ID
+    num_cards: int
+    index: Dict[str, int]  # Column name -> CSV column index
+    packs: CardColumns
+    pools: CardColumns
+    last_draft: Optional[str] = None  # draft_id of the last row so far
+    drafts: int = 0  # Number of drafts so far
+
+    @classmethod
+    def make(cls, header: List[str], set_: Set) -> "LogParser":
+        """Parser for a CSV with this header, of draft logs for a set"""
+        ids = name_ids(set_)
+        return cls(
+            ids,
+            len(set_),
+            {name: i for i, name in enumerate(header)},
+            CardColumns.make(header, "pack_card_", ids),
+            CardColumns.make(header, "pool_", ids),
+        )
+
+    def draft_numbers(self, chunk: List[List[str]]) -> np.ndarray:
+        """Draft number of every row, counting from the first chunk"""
+        draft = np.empty(len(chunk), dtype=np.int32)
+        column = self.index["draft_id"]
+        for i, row in enumerate(chunk):
+            if row[column] != self.last_draft:  # Drafts are contiguous
+                self.last_draft, self.drafts = row[column], self.drafts + 1
+            draft[i] = self.drafts - 1
+        return draft
+
+    def columns(self, chunk: List[List[str]]) -> Dict[str, np.ndarray]:
+        """Every column of COLUMNS for a chunk of rows, in the order of the rows"""
+        picks = [row[self.index["pick"]] for row in chunk]
+        unknown = {name for name in picks if name not in self.ids}
+        if unknown:
+            logging.warning("Picks of unknown cards %s", sorted(unknown))
+        return {
+            "pack": self.packs.counts(chunk, self.num_cards),
+            "pool": self.pools.counts(chunk, self.num_cards),
+            "pick": np.array([self.ids.get(name, -1) for name in picks]),
+            "pack_number": int_column(chunk, self.index["pack_number"]),
+            "pick_number": int_column(chunk, self.index["pick_number"]),
+            "wins": int_column(chunk, self.index["event_match_wins"]),
+            "losses": int_column(chunk, self.index["event_match_losses"]),
+            "draft": self.draft_numbers(chunk),
+        }
+
+
+def parse(path: str, set_: Set, chunk_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+    """Columns of a 17lands draft data CSV, a chunk of rows at a time"""
+    with open_text(path) as text:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return  # Empty file
+        parser = LogParser.make(header, set_)
+        for chunk in chunks(reader, chunk_rows):
+            yield parser.columns(chunk)
+
+
+def ingest(
+    path: str, out_dir: str, set_name: str = "neo", chunk_rows: int = 10000
+) -> int:
+    """Convert a 17lands draft data CSV into columnar files, returning the row count"""
+    set_ = get_set(set_name)
+    os.makedirs(out_dir, exist_ok=True)
+    files = {name: open(os.path.join(out_dir, name + ".bin"), "wb") for name in COLUMNS}
+    rows = 0
+    try:
+        for columns in parse(path, set_, chunk_rows):
+            for name, (dtype, _) in COLUMNS.items():
+                columns[name].astype(dtype).tofile(files[name])
+            rows += len(columns["draft"])
+    finally:
+        for file in files.values():
+            file.close()
+    meta = {"set_name": set_name, "num_cards": len(set_), "rows": rows}
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="UTF-8") as file:
+        json.dump(meta, file, indent=2)
+    return rows
+
+
+@dataclass
+class DraftLogs:
+    """Columns of ingested draft logs, as read-only memory maps"""
+
+    path: str
+    meta: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        with open(os.path.join(self.path, META_FILE), encoding="UTF-8") as file:
+            self.meta = json.load(file)
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, (dtype, per_card) in COLUMNS.items():
+            shape = (self.meta["rows"], self.meta["num_cards"]) if per_card else None
+            file = os.path.join(self.path, name + ".bin")
+            if self.meta["rows"] == 0:  # Can't memory map empty files
+                self.columns[name] = np.zeros(shape or (0,), dtype=dtype)
+                continue
+            self.columns[name] = np.memmap(file, dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def batches(self, rows: int) -> Iterator[slice]:
+        """Slices of about this many rows, which never split a draft"""
+        draft = self.columns["draft"]
+        start = 0
+        while start < len(self):
+            end = min(start + rows, len(self))
+            if end < len(self):  # Extend to the end of the draft
+                end = int(np.searchsorted(draft, draft[end - 1], side="right"))
+            yield slice(start, end)
+            start = end
+
+    @property
+    def num_drafts(self) -> int:
+        """Number of drafts in the logs"""
+        return int(self.columns["draft"][-1]) + 1 if len(self) else 0
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+"""
+Pick statistics for every card in a set, aggregated over many drafts.
+
+PickStats keeps a few counters per card as NumPy arrays, so memory doesn't grow
+with the number of drafts, and results from parallel workers can be merged.
+The statistics follow 17lands (https://www.17lands.com/card_data):
+* ATA (average taken at): mean pick number when the card was picked
+* ALSA (average last seen at): mean pick number when the card was last seen in a pack
+* pick rate: how often the card was picked, out of the times it was seen
+* win rate: match win rate of the drafts that picked the card
+
+Pick numbers start from 1 within each pack, like 17lands shows them.
+All of these are from the point of view of each drafter,
+so a card in a pack is seen by every drafter the pack passes through.
+
+Drafts come in as rows of picks (see add()), which is the DraftLogs layout,
+and simulated drafts (from DraftEngine or VectorDraft) are converted to rows.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from mtg_engine.mtg_cards.sets import get_card_id, get_set
+from mtg_engine.mtg_draft.draft import PACK_SIZE, DraftEngine
+from mtg_engine.mtg_draft.logs import DraftLogs
+from mtg_engine.mtg_draft.vector import ROUNDS, holders
+
+# Names of the per-card counters in PickStats (see CardCounters)
+COUNTERS = ("seen", "taken", "taken_at", "last_seen", "last_seen_at", "wins", "losses")
+
+
+def draft_picks(draft: DraftEngine) -> np.ndarray:
+    """Picks of a finished DraftEngine as card IDs, (players, rounds * PACK_SIZE)"""
+    ids = np.array([get_card_id(card) for card in draft.picks], dtype=np.int16)
+    return ids.reshape(-1, draft.num_players).T
+
+
+def seen_packs(picks: np.ndarray, num_cards: int) -> np.ndarray:
+    """Counts of the cards in the pack each seat held at each pick,
+    of shape (pods, players, rounds * PACK_SIZE, num_cards), rebuilt from the picks.
+    A pack holds exactly the cards that are picked from it from then on."""
+    pods, num_players, _ = picks.shape
+    packs = np.zeros(picks.shape + (num_cards,), dtype=np.uint8)
+    for round_ in range(ROUNDS):
+        # Card picked from each pack, at each pick of the round
+        taken = np.empty((pods, num_players, PACK_SIZE), dtype=np.int16)
+        for pick in range(PACK_SIZE):
+            held_by = holders(num_players, round_, pick)
+            taken[:, held_by, pick] = picks[:, :, round_ * PACK_SIZE + pick]
+        counts = np.zeros((pods, num_players, PACK_SIZE, num_cards), dtype=np.uint8)
+        np.put_along_axis(counts, taken[..., None].astype(int), 1, axis=3)
+        remaining = np.flip(np.flip(counts, axis=2).cumsum(axis=2), axis=2)
+        for pick in range(PACK_SIZE):
+            held_by = holders(num_players, round_, pick)
+            packs[:, :, round_ * PACK_SIZE + pick] = remaining[:, held_by, pick]
+    return packs
+
+
+def card_counts(num_cards: int, ids: np.ndarray, weights=None) -> np.ndarray:
+    """Totals of weights (or counts) for each card ID"""
+    return np.bincount(ids, weights, num_cards).astype(np.int64)
+
+
+def next_rows(
+    drafts: np.ndarray, pack_numbers: np.ndarray, pick_numbers: np.ndarray, laps: int
+) -> np.ndarray:
+    """Row with the same pack the next time the drafter sees it, or -1 for each row.
+    A drafter sees the same pack again laps (the number of players) picks later."""
+    lap = pick_numbers % laps
+    order = np.lexsort((pick_numbers, lap, pack_numbers, drafts))
+    keys = np.stack([drafts, pack_numbers, lap])[:, order]
+    same = (keys[:, 1:] == keys[:, :-1]).all(axis=0)  # Next row is the same pack
+    after = np.full(len(drafts), -1)
+    after[order[:-1][same]] = order[1:][same]
+    return after
+
+
+def pack_cards(packs: np.ndarray, after: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Row, card ID, count, and the copies last seen at that pick
+    (gone by the time the pack comes back) of every card in the packs.
+    Only the cards in each pack are counted, without converting whole packs.
+    Checks that every card in a pack was in it the time before."""
+    row, card = np.nonzero(packs)
+    count = packs[row, card].astype(np.int32)
+    later = np.where(after[row] >= 0, packs[after[row], card], 0).astype(np.int32)
+    last = count - later
+    totals = packs.sum(axis=1, dtype=np.int64)
+    kept = np.bincount(row, weights=later, minlength=len(packs)).astype(np.int64)
+    again = after >= 0
+    consistent = (last >= 0).all() and (totals[after[again]] == kept[again]).all()
+    assert consistent, "Rows of a draft are inconsistent"
+    return row, card, count, last
+
+
+@dataclass
+class CardCounters:
+    """Counters of every card in a set, see COUNTERS"""
+
+    seen: np.ndarray
+    taken: np.ndarray
+    taken_at: np.ndarray
+    last_seen: np.ndarray
+    last_seen_at: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+
+    @classmethod
+    def zeros(cls, num_cards: int) -> "CardCounters":
+        """Counters of num_cards cards, all zero"""
+        return cls(*(np.zeros(num_cards, dtype=np.int64) for _ in COUNTERS))
+
+
+@dataclass
+class PickStats:
+    """Counters for the pick statistics of every card in a set"""
+
+    set_name: str = "neo"
+    # Players in the pods, which tells when a drafter sees the same pack again
+    num_players: int = 8
+    num_picks: int = 0  # Number of rows of picks added
+    counters: CardCounters = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.counters = CardCounters.zeros(len(get_set(self.set_name)))
+
+    def add(self, rows: Dict[str, np.ndarray]) -> None:
+        """Add rows of picks, as the DraftLogs columns (see logs.py):
+        "pack" of (rows, num_cards) counts, and "pick", "pack_number", "pick_number",
+        "draft", and optionally "wins" and "losses" of (rows,).
+        Rows can be in any order, but all the picks of a draft must be added together,
+        since the last time a card is seen depends on the later picks.
+        The rows are checked before any counter changes."""
+        packs, picks, pick_numbers = rows["pack"], rows["pick"], rows["pick_number"]
+        num_cards, counters = packs.shape[1], self.counters
+        after = next_rows(
+            rows["draft"], rows["pack_number"], pick_numbers, self.num_players
+        )
+        row, card, count, last = pack_cards(packs, after)
+        self.num_picks += len(packs)
+        counters.seen += card_counts(num_cards, card, count)
+        counters.last_seen += card_counts(num_cards, card, last)
+        counters.last_seen_at += card_counts(
+            num_cards, card, last * (pick_numbers[row] + 1)
+        )
+        valid = picks >= 0  # Picks of cards not in the set are -1
+        counters.taken += card_counts(num_cards, picks[valid])
+        counters.taken_at += card_counts(
+            num_cards, picks[valid], pick_numbers[valid] + 1
+        )
+        if "wins" in rows and "losses" in rows:
+            counters.wins += card_counts(num_cards, picks[valid], rows["wins"][valid])
+            counters.losses += card_counts(
+                num_cards, picks[valid], rows["losses"][valid]
+            )
+
+    def add_picks(
+        self,
+        picks: np.ndarray,
+        wins: Optional[np.ndarray] = None,
+        losses: Optional[np.ndarray] = None,
+    ) -> None:
+        """Add simulated drafts, as picks of shape (pods, players, rounds * PACK_SIZE)
+        (see VectorDraft.run() and draft_picks()),
+        with optional match wins and losses of shape (pods, players)"""
+        pods, num_players, num_picks = picks.shape
+        assert num_players == self.num_players, f"{num_players} players"
+        assert num_picks == ROUNDS * PACK_SIZE, f"{num_picks} picks"
+        packs = seen_packs(picks, len(self.counters.seen))
+        shape = picks.shape
+        drafts = np.arange(pods * num_players).reshape(shape[:2] + (1,))
+        numbers = np.broadcast_to(np.arange(num_picks), shape)
+        rows = {
+            "pack": packs.reshape(-1, packs.shape[-1]),
+            "pick": picks.ravel(),
+            "pack_number": (numbers // PACK_SIZE).ravel(),
+            "pick_number": (numbers % PACK_SIZE).ravel(),
+            "draft": np.broadcast_to(drafts, shape).ravel(),
+        }
+        if wins is not None and losses is not None:
+            rows["wins"] = np.broadcast_to(wins[..., None], shape).ravel()
+            rows["losses"] = np.broadcast_to(losses[..., None], shape).ravel()
+        self.add(rows)
+
+    def add_draft(self, draft: DraftEngine) -> None:
+        """Add a finished DraftEngine, which has no match results"""
+        self.add_picks(draft_picks(draft)[None])
+
+    def add_logs(self, logs: DraftLogs, batch_rows: int = 100000) -> None:
+        """Add ingested draft logs, in batches of about batch_rows rows"""
+        assert logs.meta["set_name"] == self.set_name, f"{logs.meta}"
+        columns = ("pack", "pick", "pack_number", "pick_number", "draft")
+        for batch in logs.batches(batch_rows):
+            rows = {name: logs[name][batch] for name in columns}
+            for name in ("pick", "pick_number", "wins", "losses"):
+                rows[name] = logs[name][batch].astype(np.int64)
+            self.add(rows)
+
+    def merge(self, other: "PickStats") -> "PickStats":
+        """Add the counters from another PickStats, e.g. from another worker"""
+        assert other.set_name == self.set_name, f"{other.set_name}"
+        assert other.num_players == self.num_players, f"{other.num_players}"
+        self.num_picks += other.num_picks
+        for name in COUNTERS:
+            getattr(self.counters, name)[:] += getattr(other.counters, name)
+        return self
+
+    @staticmethod
+    def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        """Elementwise ratio, NaN where the denominator is 0"""
+        out = np.full(numerator.shape, np.nan)
+        return np.divide(numerator, denominator, out=out, where=denominator > 0)
+
+    @property
+    def ata(self) -> np.ndarray:
+        """Average taken at, for every card"""
+        return self.ratio(self.counters.taken_at, self.counters.taken)
+
+    @property
+    def alsa(self) -> np.ndarray:
+        """Average last seen at, for every card"""
+        return self.ratio(self.counters.last_seen_at, self.counters.last_seen)
+
+    @property
+    def pick_rate(self) -> np.ndarray:
+        """Fraction of the times a card was seen that it was picked"""
+        return self.ratio(self.counters.taken, self.counters.seen)
+
+    @property
+    def win_rate(self) -> np.ndarray:
+        """Match win rate of drafts where the card was picked"""
+        return self.ratio(self.counters.wins, self.counters.wins + self.counters.losses)
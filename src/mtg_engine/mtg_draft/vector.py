@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Vectorized draft simulator, running many pods at once with NumPy.
+
+Cards are integer IDs (see Set.card_id), and all of the pods are arrays:
+* packs: (pods, 3, players, PACK_SIZE) card IDs, for each round
+* pools: (pods, players, num_cards) counts of each card picked so far
+* picks: (pods, players, 3 * PACK_SIZE) card IDs, in pick order
+
+Policies are scoring functions instead of players.
+A policy gets the cards in the packs (with TAKEN for cards already picked)
+and the pools of the seats it picks for, and scores every card in the packs.
+Each seat picks its highest scoring card, the first one on ties.
+Packs never move in memory, passing them is just index arithmetic on which seat holds which pack.
+
+This follows DraftEngine exactly, so for the same packs (see engine_packs())
+and policies that match the players, the picks are the same.
+"""
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from mtg_engine.mtg_cards.booster import BoosterBox, get_booster_probs
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_draft.draft import PACK_SIZE
+
+ROUNDS = 3  # Number of packs opened by each player
+TAKEN = -1  # Card ID for a card that has already been picked
+
+# (packs, pools) -> scores, for packs (n, PACK_SIZE) and pools (n, num_cards)
+Policy = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def first_policy(
+    packs: np.ndarray, pools: np.ndarray  # pylint: disable=unused-argument
+) -> np.ndarray:
+    """Always pick the first card, like FixedPlayer"""
+    return np.zeros(packs.shape, dtype=np.float32)
+
+
+def table_policy(table: np.ndarray) -> Policy:
+    """Pick the card with the highest score in a table, indexed by card ID"""
+    table = np.asarray(table, dtype=np.float32)
+
+    def policy(
+        packs: np.ndarray, pools: np.ndarray  # pylint: disable=unused-argument
+    ) -> np.ndarray:
+        return table[packs]  # TAKEN cards get the last score, but are never picked
+
+    return policy
+
+
+def holders(num_players: int, round_: int, pick: int) -> np.ndarray:
+    """Index of the pack held by each seat, at this pick of this round.
+    DraftEngine passes packs so seat i gets the pack from seat i + 1,
+    except in the second round when it gets the pack from seat i - 1."""
+    direction = -1 if round_ % 2 else 1
+    return (np.arange(num_players) + direction * pick) % num_players
+
+
+def policy_groups(policies: Sequence[Policy]) -> List[List[int]]:
+    """Seats for each distinct policy, so each is called once per pick"""
+    groups: Dict[int, List[int]] = {}
+    for seat, policy in enumerate(policies):
+        groups.setdefault(id(policy), []).append(seat)
+    return list(groups.values())
+
+
+@dataclass
+class VectorDraft:
+    """Drafts for many pods of the same set and number of players at once"""
+
+    set_name: str = "neo"
+    num_players: int = 8
+
+    def __post_init__(self):
+        assert 2 <= self.num_players <= 8, f"{self.num_players}"
+        self.set = get_set(self.set_name)
+        self.num_cards = len(self.set)
+        # Card IDs and probabilities for each slot in a booster
+        self.slots = []
+        for slot in get_booster_probs(self.set_name):
+            ids = np.array([self.set.card_id(p.card) for p in slot.probs])
+            probs = np.array([p.prob for p in slot.probs])
+            self.slots.append((ids, probs / probs.sum()))
+        assert len(self.slots) == PACK_SIZE, f"{len(self.slots)}"
+
+    def sample_packs(self, rng: np.random.Generator, pods: int) -> np.ndarray:
+        """Randomly sample packs for every pod, with the booster probabilities"""
+        shape = (pods, ROUNDS, self.num_players)
+        packs = np.empty(shape + (PACK_SIZE,), dtype=np.int16)
+        for i, (ids, probs) in enumerate(self.slots):
+            packs[..., i] = ids[rng.choice(len(ids), size=shape, p=probs)]
+        return packs
+
+    def engine_packs(self, seeds: Sequence[int]) -> np.ndarray:
+        """The packs that DraftEngine(rng=Random(seed)) opens, for each seed"""
+        packs = np.empty(
+            (len(seeds), ROUNDS, self.num_players, PACK_SIZE), dtype=np.int16
+        )
+        for pod, seed in enumerate(seeds):
+            box = BoosterBox(set_name=self.set_name, rng=random.Random(seed))
+            for round_ in range(ROUNDS):
+                for player in range(self.num_players):
+                    cards = box.get_booster()
+                    packs[pod, round_, player] = [self.set.card_id(c) for c in cards]
+        return packs
+
+    def run(
+        self, packs: np.ndarray, policies: Sequence[Policy]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Draft all of the packs, with a policy for each seat.
+        Returns the picks, as card IDs of shape (pods, players, rounds * PACK_SIZE),
+        and the pools, as counts of shape (pods, players, num_cards)."""
+        pods = len(packs)
+        assert packs.shape == (pods, ROUNDS, self.num_players, PACK_SIZE)
+        assert len(policies) == self.num_players, f"{len(policies)} policies"
+        packs = packs.copy()  # Picked cards are replaced with TAKEN
+        pools = np.zeros((pods, self.num_players, self.num_cards), np.int16)
+        picks = np.empty((pods, self.num_players, ROUNDS * PACK_SIZE), np.int16)
+        groups = policy_groups(policies)
+        pod_index = np.arange(pods)[:, None]
+        for round_ in range(ROUNDS):
+            for pick in range(PACK_SIZE):
+                held_by = holders(self.num_players, round_, pick)
+                held = packs[:, round_, held_by]
+                scores = self.score(held, pools, policies, groups)
+                index = scores.argmax(axis=2)  # First highest score
+                cards = np.take_along_axis(held, index[..., None], axis=2)[..., 0]
+                picks[:, :, round_ * PACK_SIZE + pick] = cards
+                pools[pod_index, np.arange(self.num_players), cards] += 1
+                packs[pod_index, round_, held_by, index] = TAKEN
+        return picks, pools
+
+    def score(
+        self,
+        held: np.ndarray,
+        pools: np.ndarray,
+        policies: Sequence[Policy],
+        groups: List[List[int]],
+    ) -> np.ndarray:
+        """Scores of the cards in the held packs (pods, players, PACK_SIZE),
+        calling the policy of each group of seats once, and -inf for taken cards"""
+        scores = np.empty(held.shape, dtype=np.float32)
+        for group in groups:
+            policy = policies[group[0]]
+            group_held = held[:, group].reshape(-1, PACK_SIZE)
+            group_pools = pools[:, group].reshape(-1, self.num_cards)
+            group_scores = policy(group_held, group_pools)
+            scores[:, group] = group_scores.reshape(len(held), len(group), -1)
+        scores[held == TAKEN] = -np.inf
+        return scores
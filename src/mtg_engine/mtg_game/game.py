@@ -7,11 +7,13 @@ from dataclasses import dataclass, field
 from random import Random
 from typing import List
 
+from mtg_engine.decision_engine.encoder import Field, register_schema
 from mtg_engine.decision_engine.engine import Engine, MessageGen
-from mtg_engine.decision_engine.message import Choice, Option, View, Views
+from mtg_engine.decision_engine.message import Choice, Option, SharedViews, View
 from mtg_engine.decision_engine.player import BiasedPlayer, HumanPlayer, Player
+from mtg_engine.decision_engine.trace import traced
 from mtg_engine.mtg_cards.cards import Card, Cards
-from mtg_engine.mtg_cards.sets import get_basics
+from mtg_engine.mtg_cards.sets import get_basics, get_card_id
 from mtg_engine.mtg_decks.decks import Deck, LimitedDeck
 
 # from mtg_engine.mtg_game.objects import CardObject
@@ -29,15 +31,14 @@ class StartFirstView(View):
 
 
 @dataclass
-class StartFirstViews(Views):
+class StartFirstViews(SharedViews):
     """A set of views of which player goes first"""
 
     @classmethod
     def make(cls, chooser: int, player: int, num_players: int) -> "StartFirstViews":
         """Create a set of views for each player"""
-        return cls(
-            [StartFirstView(chooser=chooser, player=player) for _ in range(num_players)]
-        )
+        view = StartFirstView(chooser=chooser, player=player)
+        return cls(public=view, num_players=num_players)
 
 
 @dataclass
@@ -79,19 +80,18 @@ class LibrarySizeView(View):
 
 
 @dataclass
-class LibraryViews(Views):
-    """A set of views of the number of cards in each player's library"""
+class LibraryViews(SharedViews):
+    """A set of views of the number of cards in each player's library,
+    and of the cards themselves for the library's player"""
 
     @classmethod
     def make(cls, player: int, cards: Cards, num_players: int) -> "LibraryViews":
         """Create a set of views for each player"""
-        views: List[View] = []
-        for i in range(num_players):
-            if i == player:
-                views.append(LibraryView(cards=cards))
-            else:
-                views.append(LibrarySizeView(player=player, size=len(cards)))
-        return cls(views)
+        return cls(
+            public=LibrarySizeView(player=player, size=len(cards)),
+            private={player: LibraryView(cards=cards)},
+            num_players=num_players,
+        )
 
 
 @dataclass
@@ -112,19 +112,18 @@ class StartingHandSizeView(View):
 
 
 @dataclass
-class StartingHandViews(Views):
-    """A set of views of the number of cards in each player's starting hand"""
+class StartingHandViews(SharedViews):
+    """A set of views of the number of cards in each player's starting hand,
+    and of the cards themselves for the hand's player"""
 
     @classmethod
     def make(cls, player: int, cards: Cards, num_players: int) -> "StartingHandViews":
         """Create a set of views for each player"""
-        views: List[View] = []
-        for i in range(num_players):
-            if i == player:
-                views.append(StartingHandView(cards=cards))
-            else:
-                views.append(StartingHandSizeView(player=player, size=len(cards)))
-        return cls(views)
+        return cls(
+            public=StartingHandSizeView(player=player, size=len(cards)),
+            private={player: StartingHandView(cards=cards)},
+            num_players=num_players,
+        )
 
 
 @dataclass
@@ -169,18 +168,14 @@ class StartingHandKeepView(View):
 
 
 @dataclass
-class StartingHandKeepViews(Views):
+class StartingHandKeepViews(SharedViews):
     """A set of views of whether each player kept their starting hand"""
 
     @classmethod
     def make(cls, player: int, keep: bool, num_players: int) -> "StartingHandKeepViews":
         """Create a set of views for each player"""
-        return cls(
-            views=[
-                StartingHandKeepView(player=player, keep=keep)
-                for _ in range(num_players)
-            ]
-        )
+        view = StartingHandKeepView(player=player, keep=keep)
+        return cls(public=view, num_players=num_players)
 
 
 @dataclass
@@ -205,6 +200,40 @@ class MulliganCardChoice(Choice):
         )
 
 
+MAX_PLAYERS = 8  # Maximum encoded number of players to choose from
+MAX_LIBRARY_SIZE = 128  # Maximum encoded size of a library
+HAND_SIZE = 7  # Starting hand size
+
+register_schema(StartFirstView, Field("chooser"), Field("player"))
+register_schema(StartFirstOption, Field("player"))
+register_schema(
+    StartFirstChoice,
+    Field("player"),
+    options=(StartFirstOption,),
+    max_options=MAX_PLAYERS,
+)
+register_schema(LibraryView, Field("cards", size=MAX_LIBRARY_SIZE, encode=get_card_id))
+register_schema(LibrarySizeView, Field("player"), Field("size"))
+register_schema(StartingHandView, Field("cards", size=HAND_SIZE, encode=get_card_id))
+register_schema(StartingHandSizeView, Field("player"), Field("size"))
+register_schema(StartingHandKeepOption)
+register_schema(StartingHandMulliganOption)
+register_schema(
+    StartingHandChoice,
+    Field("player"),
+    options=(StartingHandKeepOption, StartingHandMulliganOption),
+    max_options=2,
+)
+register_schema(StartingHandKeepView, Field("player"), Field("keep"))
+register_schema(MulliganCardOption, Field("card", encode=get_card_id))
+register_schema(
+    MulliganCardChoice,
+    Field("player"),
+    options=(MulliganCardOption,),
+    max_options=HAND_SIZE,
+)
+
+
 @dataclass
 class GameEngine(Engine):
     """Magic: the Gathering
@@ -217,6 +246,7 @@ class GameEngine(Engine):
     zones: Zones = field(default_factory=Zones)
     lifes: List[int] = field(default_factory=list)
 
+    @traced
     def play(self) -> MessageGen:  # pylint: disable=useless-return
         """Callers should use Engine.run(), see Engine for details"""
         assert self.num_players >= 2, f"{self.num_players}"
@@ -224,6 +254,7 @@ class GameEngine(Engine):
         yield from self.start()
         return None  # not useless, needed for generator type
 
+    @traced
     def start(self) -> MessageGen:  # pylint: disable=useless-return
         """103. Starting the Game
         https://yawgatog.com/resources/magic-rules/#R103"""
@@ -258,6 +289,7 @@ class GameEngine(Engine):
         yield from self.draw_hands()
         return None  # not useless, needed for generator type
 
+    @traced
     def draw_hands(self) -> MessageGen:  # pylint: disable=useless-return
         """Drawing hands and Mulliganing"""
         players_to_draw = list(range(self.num_players))
@@ -276,7 +308,7 @@ class GameEngine(Engine):
                     len(self.zones.libraries[i]) >= 40
                 ), f"{len(self.zones.libraries[i])}"
                 # Draw the hand
-                cards = Cards([self.zones.draw(player=i) for _ in range(7)])
+                cards = Cards([self.zones.draw(player=i) for _ in range(HAND_SIZE)])
                 assert (
                     len(self.zones.libraries[i]) >= 33
                 ), f"{len(self.zones.libraries[i])}"
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Engine overhead microbenchmarks
+
+Measures messages per second through the decision engine protocol,
+for each engine with fixed players and seeds, using only stdlib timing.
+
+    python tests/bench/engine_bench.py --save baseline.json
+    python tests/bench/engine_bench.py --check baseline.json --tolerance 0.2
+
+Baselines are machine specific, so save one before making a change,
+and check against it afterwards.
+--check exits with an error if any benchmark is slower than the baseline
+by more than the tolerance (a fraction of the baseline rate).
+"""
+import argparse
+import json
+import sys
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from mtg_engine.decision_engine.engine import Engine
+from mtg_engine.decision_engine.example_blackjack import Blackjack
+from mtg_engine.decision_engine.player import BiasedPlayer, FixedPlayer, RandomPlayer
+from mtg_engine.mtg_cards.cards import Cards
+from mtg_engine.mtg_cards.sets import get_basics
+from mtg_engine.mtg_decks.build import DeckEngine
+from mtg_engine.mtg_decks.decks import LimitedDeck
+from mtg_engine.mtg_decks.sealed import Sealed
+from mtg_engine.mtg_draft.draft import DraftEngine
+from mtg_engine.mtg_game.game import GameEngine
+
+
+def blackjack() -> Engine:
+    """Four random players"""
+    players = [RandomPlayer(rng=Random(i)) for i in range(4)]
+    return Blackjack(players=players, rng=Random(0))
+
+
+def draft() -> Engine:
+    """Eight random players"""
+    players = [RandomPlayer(rng=Random(i)) for i in range(8)]
+    return DraftEngine(players=players, rng=Random(0))
+
+
+def deck() -> Engine:
+    """Biased player building a sealed deck"""
+    pool = Sealed.make("neo", rng=Random(0))
+    return DeckEngine(players=[BiasedPlayer(rng=Random(0))], deck=pool)
+
+
+def game_start() -> Engine:
+    """Two fixed players starting a game with basic land decks"""
+    plains = get_basics().cards[0]
+    decks = [LimitedDeck(main=Cards([plains] * 40)) for _ in range(2)]
+    return GameEngine(
+        players=[FixedPlayer(), FixedPlayer()], decks=decks, rng=Random(0)
+    )
+
+
+# Each benchmark makes an engine, which is timed while it runs
+BENCHMARKS: Dict[str, Callable[[], Engine]] = {
+    "blackjack": blackjack,
+    "draft": draft,
+    "deck": deck,
+    "game_start": game_start,
+}
+
+
+def measure(make_engine: Callable[[], Engine], repeat: int = 5) -> float:
+    """Best messages per second over a number of runs"""
+    best = 0.0
+    for _ in range(repeat):
+        engine = make_engine()
+        start = perf_counter()
+        engine.run()
+        elapsed = perf_counter() - start
+        best = max(best, engine.messages / elapsed)
+    return best
+
+
+def measure_fork(repeat: int = 5) -> float:
+    """Best forks per second, of a finished 8-player draft"""
+    best = 0.0
+    for _ in range(repeat):
+        engine = draft()
+        engine.forkable = True
+        engine.run()
+        start = perf_counter()
+        engine.fork([FixedPlayer() for _ in engine.players])
+        best = max(best, 1 / (perf_counter() - start))
+    return best
+
+
+def run_all(repeat: int = 5) -> Dict[str, float]:
+    """Run every benchmark, returning rates keyed by benchmark name"""
+    results = {name: measure(make, repeat) for name, make in BENCHMARKS.items()}
+    results["fork"] = measure_fork(repeat)
+    return results
+
+
+def regressions(
+    results: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    """Names of benchmarks slower than the baseline by more than the tolerance"""
+    return [
+        name
+        for name, rate in results.items()
+        if name in baseline and rate < baseline[name] * (1 - tolerance)
+    ]
+
+
+def main(argv=None) -> int:
+    """Command line entry point, returns the exit code"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", help="Write results to this JSON baseline")
+    parser.add_argument("--check", help="Compare results to this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    results = run_all(args.repeat)
+    for name, rate in results.items():
+        print(f"{name:>12}: {rate:12.1f} /sec")
+    if args.save:
+        with open(args.save, "w", encoding="UTF-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.check:
+        with open(args.check, encoding="UTF-8") as file:
+            baseline = json.load(file)
+        slow = regressions(results, baseline, args.tolerance)
+        for name in slow:
+            print(f"REGRESSION {name}: {results[name]:.1f} < {baseline[name]:.1f}")
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
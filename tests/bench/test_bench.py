@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+
+import json
+
+from engine_bench import BENCHMARKS, main, measure, regressions
+
+
+def test_benchmarks_run():
+    for make_engine in BENCHMARKS.values():
+        assert measure(make_engine, repeat=1) > 0
+
+
+def test_regressions():
+    baseline = {"draft": 1000.0, "deck": 1000.0}
+    results = {"draft": 900.0, "deck": 700.0, "new": 1.0}
+    assert regressions(results, baseline, tolerance=0.2) == ["deck"]
+    assert regressions(results, baseline, tolerance=0.5) == []
+
+
+def test_save_and_check(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    assert main(["--repeat", "1", "--save", path]) == 0
+    with open(path, encoding="UTF-8") as file:
+        baseline = json.load(file)
+    assert set(baseline) == set(BENCHMARKS) | {"fork"}
+    # Impossibly fast baseline is always a regression
+    with open(path, "w", encoding="UTF-8") as file:
+        json.dump({k: v * 1000 for k, v in baseline.items()}, file)
+    assert main(["--repeat", "1", "--check", path]) == 1
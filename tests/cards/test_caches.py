@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+import gc
+import multiprocessing
+import threading
+import time
+
+from mtg_engine.mtg_cards import sets
+from mtg_engine.mtg_cards.booster import booster_probs_cache, warm_caches
+from mtg_engine.mtg_cards.sets import SetCache, get_set, set_cache
+
+
+def test_set_cache_once(monkeypatch):
+    made = []
+    neo = get_set("neo")
+
+    def make(set_name, cache):  # pylint: disable=unused-argument
+        made.append(set_name)
+        time.sleep(0.01)  # Give the other threads time to race
+        return neo
+
+    monkeypatch.setattr(sets.Set, "make", make)
+    cache = SetCache()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_set("neo")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert made == ["neo"]
+    assert len(results) == 8 and all(r is neo for r in results)
+
+
+def get_set_in_child() -> None:
+    """Fails (by timing out) if the set cache lock was inherited held"""
+    get_set("neo")
+    with set_cache.lock:
+        pass
+
+
+def test_set_cache_after_fork():
+    held, done = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with set_cache.lock:
+            held.set()
+            done.wait()
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    held.wait()
+    try:
+        context = multiprocessing.get_context("fork")
+        process = context.Process(target=get_set_in_child)
+        process.start()
+        process.join(timeout=10)
+        assert process.exitcode == 0
+    finally:
+        done.set()
+        thread.join()
+
+
+def test_warm_caches():
+    warm_caches(["neo"])
+    assert gc.get_freeze_count() > 0
+    gc.unfreeze()
+    assert "neo" in set_cache.sets
+    assert "neo" in booster_probs_cache.sets
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+from random import Random
+
+from mtg_engine.decision_engine.blackjack_solver import (
+    HIT,
+    STAND,
+    OptimalBlackjackPlayer,
+    best_action,
+    dealer_upcard_scores,
+    expected_value,
+    simulate,
+)
+from mtg_engine.decision_engine.player import FixedPlayer, RandomPlayer
+
+
+def test_dealer_distribution():
+    for upcard in range(1, 11):
+        probs = [p for _, p in dealer_upcard_scores(upcard)]
+        assert abs(sum(probs) - 1) < 1e-9
+        assert min(score for score, _ in dealer_upcard_scores(upcard)) >= 17
+
+
+def test_basic_strategy():
+    for upcard in range(1, 11):
+        assert best_action(17, False, upcard) == STAND
+        assert best_action(20, False, upcard) == STAND
+        assert best_action(11, False, upcard) == HIT
+        assert best_action(8, True, upcard) == (HIT if upcard in (1, 9, 10) else STAND)
+        assert best_action(5, True, upcard) == HIT  # Soft 15
+    assert best_action(16, False, 10) == HIT
+    assert best_action(13, False, 6) == STAND
+
+
+def test_monte_carlo_converges():
+    ev = expected_value()
+    assert -0.1 < ev < 0.0  # The house still has an edge
+    estimate = simulate(OptimalBlackjackPlayer, games=5000, seed=0)
+    assert abs(estimate - ev) < 0.06  # About 4 standard errors
+    # Optimal play beats always standing and random play
+    assert simulate(FixedPlayer, games=2000, seed=1) < ev
+    assert simulate(lambda: RandomPlayer(rng=Random(0)), games=2000, seed=2) < ev
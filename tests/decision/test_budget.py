@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+from dataclasses import dataclass, field
+from random import Random
+from typing import Iterator
+
+from mtg_engine.decision_engine.budget import TimeBudget
+from mtg_engine.decision_engine.message import Decision
+from mtg_engine.decision_engine.player import AnytimePlayer, RandomPlayer
+from mtg_engine.mtg_draft.draft import DraftEngine
+
+
+@dataclass
+class FakeClock:
+    """Clock which only moves when told to"""
+
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class SlowPlayer(RandomPlayer):
+    """Random player which takes too long to decide"""
+
+    clock: FakeClock = field(default_factory=FakeClock)
+
+    def decide(self, choice) -> int:
+        self.clock.now += 0.005
+        return super().decide(choice)
+
+
+@dataclass
+class SearchPlayer(AnytimePlayer):
+    """Anytime player which keeps searching until the deadline"""
+
+    searches: int = 0
+
+    def search(self, choice) -> Iterator[int]:
+        self.searches += 1
+        index = 0
+        while True:
+            self.timer.now += 0.125  # Each answer takes an eighth of a second
+            yield index
+            index = (index + 1) % len(choice.options)
+
+
+def test_budget_fallback():
+    clock = FakeClock()
+    players = [SlowPlayer(rng=Random(0), clock=clock), RandomPlayer(rng=Random(1))]
+    budget = TimeBudget(seconds=0.001, timer=clock)
+    engine = DraftEngine(players=players, rng=Random(0), budget=budget)
+    engine.run()
+    assert budget.timeouts[0] == 45
+    assert 1 not in budget.timeouts
+    assert budget.players[0].count == budget.players[1].count == 45
+    assert budget.players[1].nanoseconds == 0  # No time passes for the fast player
+    # Every late decision was replaced by the first option
+    decisions = [m for m in players[0].history if isinstance(m, Decision)]
+    assert all(decision.index == 0 for decision in decisions)
+    assert engine.decisions[::2] == [0] * 45
+    assert budget.to_dict()["timeouts"] == {0: 45}
+
+
+def test_budget_anytime():
+    clock = FakeClock()
+    players = [SearchPlayer(), SearchPlayer()]
+    budget = TimeBudget(seconds=0.5, margin=0.5, timer=clock)
+    engine = DraftEngine(players=players, rng=Random(0), budget=budget)
+    engine.run()
+    assert clock.now == 90 * 0.25  # Two answers for every pick
+    assert all(player.searches == 45 for player in players)
+    assert all(player.deadline is None for player in players)
+    # Infinite searches only stop because of the deadline, and are never late
+    assert not budget.timeouts
+    assert all(player.timer is clock for player in players)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from random import Random
+from typing import List, Optional
+
+from mtg_engine.decision_engine.checkpoint import Checkpoint
+from mtg_engine.decision_engine.engine import Engine
+from mtg_engine.decision_engine.player import FixedPlayer, RandomPlayer
+from mtg_engine.mtg_cards.cards import Card, Cards
+from mtg_engine.mtg_cards.sets import get_basics, get_set
+from mtg_engine.mtg_decks.decks import LimitedDeck
+from mtg_engine.mtg_draft.draft import DraftEngine
+from mtg_engine.mtg_game.game import GameEngine
+
+
+@dataclass
+class CheckpointPlayer(RandomPlayer):
+    """Random player which checkpoints the engine at one of its decisions"""
+
+    engine: Optional[Engine] = field(default=None, repr=False)
+    at: int = 0
+    checkpoints: List[Checkpoint] = field(default_factory=list, repr=False)
+
+    def decide(self, choice) -> int:
+        assert self.engine is not None
+        if len(self.engine.decisions) == self.at:
+            self.checkpoints.append(Checkpoint.from_engine(self.engine))
+        return super().decide(choice)
+
+
+def resume_draft(data: bytes) -> List[Card]:
+    """Restore a draft checkpoint and finish it with fixed players"""
+    engine = Checkpoint.from_bytes(data).restore([FixedPlayer() for _ in range(3)])
+    engine.resume()
+    return engine.picks.cards
+
+
+def test_singletons_pickle_by_reference():
+    neo = get_set("neo")
+    card = neo.cards[0]
+    assert pickle.loads(pickle.dumps(neo)) is neo
+    assert pickle.loads(pickle.dumps(card)) is card
+    assert len(pickle.dumps(card)) < 100
+    bogus = Card.bogus()
+    assert pickle.loads(pickle.dumps(bogus)) == bogus
+
+
+def test_checkpoint_draft():
+    player = CheckpointPlayer(rng=Random(0), at=21)
+    players = [player, RandomPlayer(rng=Random(1)), RandomPlayer(rng=Random(2))]
+    engine = DraftEngine(players=players, rng=Random(0), forkable=True)
+    player.engine = engine
+    engine.run()
+    (checkpoint,) = player.checkpoints
+    data = checkpoint.to_bytes()
+    restored = Checkpoint.from_bytes(data).restore([FixedPlayer() for _ in range(3)])
+    assert restored.decisions == engine.decisions[:21]
+    assert restored.picks.cards == engine.picks.cards[:21]
+    # Finishing the restored game matches a fork from the same position
+    fork = restored.fork([FixedPlayer() for _ in range(3)])
+    fork.resume()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        picks = executor.submit(resume_draft, data).result()
+    assert picks == fork.picks.cards
+
+
+def test_checkpoint_finished_game():
+    decks = [LimitedDeck(main=Cards(get_basics().cards[:5] * 8)) for _ in range(2)]
+    players = [RandomPlayer(rng=Random(1)), RandomPlayer(rng=Random(2))]
+    engine = GameEngine(players=players, decks=decks, rng=Random(0), forkable=True)
+    engine.run()
+    checkpoint = Checkpoint.from_engine(engine)
+    assert checkpoint.messages is None
+    restored = checkpoint.restore([FixedPlayer(), FixedPlayer()])
+    assert restored.message is None
+    assert restored.decisions == engine.decisions
+    for zones in ("libraries", "hands"):
+        for mine, theirs in zip(
+            getattr(restored.zones, zones), getattr(engine.zones, zones)
+        ):
+            assert mine.objects == theirs.objects
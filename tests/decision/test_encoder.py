@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+from random import Random
+
+import numpy as np
+
+from mtg_engine.decision_engine.encoder import Encoder
+from mtg_engine.decision_engine.example_blackjack import FaceUpCardView, StandHitChoice
+from mtg_engine.mtg_cards.booster import BoosterBox
+from mtg_engine.mtg_cards.sets import get_card_id
+from mtg_engine.mtg_decks.build import DeckChoice
+from mtg_engine.mtg_decks.sealed import Sealed
+from mtg_engine.mtg_draft.draft import DraftPickChoice, PackView
+
+
+def test_encode_blackjack():
+    encoder = Encoder()
+    buffers = encoder.encode(FaceUpCardView(value=10, player=-1))
+    assert buffers["value"] == 10
+    assert buffers["player"] == -1
+    buffers = encoder.encode(StandHitChoice.make(player=2))
+    assert buffers["player"] == 2
+    assert buffers["options.kind"].tolist() == [0, 1]
+    assert buffers["options.mask"].all()
+
+
+def test_encode_reuses_buffers():
+    """Check the same arrays are written in place on every encode"""
+    encoder = Encoder()
+    box = BoosterBox("neo", rng=Random(0))
+    pack = box.get_booster()
+    first = encoder.encode(PackView(cards=pack))
+    cards = first["cards"]
+    for _ in range(3):
+        pack = box.get_booster()
+        pack.pop(0)
+        buffers = encoder.encode(PackView(cards=pack))
+        assert buffers is first
+        assert buffers["cards"] is cards
+        assert buffers["cards"][:14].tolist() == [get_card_id(c) for c in pack]
+        assert buffers["cards.mask"].tolist() == [True] * 14 + [False]
+
+
+def test_encode_draft_choice():
+    encoder = Encoder()
+    pack = BoosterBox("neo", rng=Random(0)).get_booster()[:10]
+    buffers = encoder.encode(DraftPickChoice.make(player=3, pack=pack))
+    assert buffers["player"] == 3
+    ids = [get_card_id(card) for card in pack]
+    assert buffers["options.card"][:10].tolist() == ids
+    assert np.count_nonzero(buffers["options.mask"]) == 10
+    assert (buffers["options.kind"][10:] == -1).all()
+
+
+def test_encode_mixed_options():
+    """Options of different classes share columns by field name"""
+    encoder = Encoder()
+    deck = Sealed.make("neo", rng=Random(0))
+    buffers = encoder.encode(DeckChoice.make(deck))
+    num = len(set(deck.sideboard)) + len(deck.basics)
+    assert np.count_nonzero(buffers["options.mask"]) == num
+    assert (buffers["options.kind"][:num] == 1).all()  # All DeckPickOption
+    deck.pick(deck.sideboard[0])
+    buffers = encoder.encode(DeckChoice.make(deck))
+    num = len(set(deck.sideboard)) + len(deck.basics) + 1
+    assert np.count_nonzero(buffers["options.mask"]) == num
+    assert buffers["options.kind"][num - 1] == 2  # DeckUnpickOption
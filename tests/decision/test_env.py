@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+from random import Random
+
+import numpy as np
+import pytest
+
+from mtg_engine.decision_engine.env import Env, VectorEnv
+from mtg_engine.decision_engine.player import Player, RandomPlayer
+from mtg_engine.decision_engine.stats import EngineStats
+from mtg_engine.mtg_decks.build import DeckChoice, DeckEngine
+from mtg_engine.mtg_decks.sealed import Sealed
+from mtg_engine.mtg_draft.draft import DraftEngine, DraftPickChoice
+
+
+def make_draft(seed: int) -> DraftEngine:
+    """Learner in seat 0, random players in the other seats"""
+    players = [Player()] + [RandomPlayer(rng=Random(seed + i)) for i in range(1, 4)]
+    return DraftEngine(players=players, rng=Random(seed))
+
+
+def make_draft_stats(seed: int) -> DraftEngine:
+    """Draft which records stats for every message"""
+    engine = make_draft(seed)
+    engine.stats = EngineStats()
+    return engine
+
+
+def make_draft_env() -> Env:
+    return Env(make_engine=make_draft, reward=lambda engine, seat: 1.0)
+
+
+def test_draft_env():
+    env = make_draft_env()
+    obs = env.reset(seed=0)
+    assert obs["options.mask"].sum() == 15
+    steps, done, reward = 0, False, 0.0
+    while not done:
+        action = steps % 2 if obs["options.mask"].sum() > 1 else 0
+        obs, reward, done = env.step(action)
+        steps += 1
+    assert steps == 45
+    assert reward == 1.0
+    assert len(env.engine.players[0].history) == 45 * 3  # views, choices, decisions
+
+
+def test_env_stats():
+    env = Env(make_engine=make_draft_stats)
+    env.reset(seed=0)
+    with pytest.raises(ValueError):
+        env.step(15)
+    done = False
+    while not done:
+        _, _, done = env.step(0)
+    # The learner's decisions are recorded like everyone else's
+    assert env.engine.stats.players[0].count == env.engine.stats.players[1].count == 45
+    assert type(env.engine.players[0]) is Player
+
+
+def test_deck_env():
+    def make_deck(seed):
+        deck = Sealed.make("neo", rng=Random(seed))
+        return DeckEngine(players=[Player()], deck=deck)
+
+    env = Env(make_engine=make_deck)
+    obs = env.reset(seed=0)
+    for _ in range(40):  # Pick the first sideboard card 40 times
+        assert obs["options.kind"][0] == 1
+        obs, _, done = env.step(0)
+        assert not done
+    assert obs["options.kind"][0] == 0  # Now it's legal, and can finish
+    _, _, done = env.step(0)
+    assert done
+    assert env.engine.deck.legal()
+
+
+def test_vector_env():
+    vec = VectorEnv(make_env=make_draft_env, choice_cls=DraftPickChoice, num_envs=3)
+    try:
+        obs = vec.reset()
+        assert obs["options.mask"].shape == (3, 15)
+        assert (obs["options.mask"].sum(axis=1) == 15).all()
+        first = obs["options.card"].copy()
+        assert not (first[0] == first[1]).all()  # Different seeds
+        for step in range(45):
+            obs, rewards, dones = vec.step(np.zeros(3, dtype=int))
+            assert dones.all() == (step == 44)
+        assert (rewards == 1.0).all()
+        assert (obs["options.mask"].sum(axis=1) == 15).all()  # Reset to new games
+    finally:
+        vec.close()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+from dataclasses import dataclass, field
+from random import Random
+from typing import List, Optional
+
+from mtg_engine.decision_engine.engine import Engine
+from mtg_engine.decision_engine.example_blackjack import Blackjack
+from mtg_engine.decision_engine.player import FixedPlayer, RandomPlayer
+from mtg_engine.mtg_draft.draft import DraftEngine
+
+
+@dataclass
+class ForkingPlayer(RandomPlayer):
+    """Random player which forks the engine before every decision"""
+
+    engine: Optional[Engine] = field(default=None, repr=False)
+    forks: List[Engine] = field(default_factory=list, repr=False)
+
+    def decide(self, choice) -> int:
+        assert self.engine is not None
+        fork = self.engine.fork([FixedPlayer() for _ in self.engine.players])
+        assert fork.messages == self.engine.messages
+        assert fork.decisions == self.engine.decisions
+        self.forks.append(fork)
+        return super().decide(choice)
+
+
+def test_fork_blackjack():
+    for seed in range(20):
+        player = ForkingPlayer(rng=Random(seed))
+        engine = Blackjack(players=[player], rng=Random(seed), forkable=True)
+        player.engine = engine
+        engine.run()
+        for fork in player.forks:
+            cards = fork.cards[0].copy()
+            assert cards == engine.cards[0][: len(cards)]
+            messages = fork.messages
+            fork.resume()
+            assert fork.messages > messages
+            assert fork.cards[0][: len(cards)] == cards
+
+
+def test_fork_draft():
+    player = ForkingPlayer(rng=Random(0))
+    players = [player, RandomPlayer(rng=Random(1)), RandomPlayer(rng=Random(2))]
+    engine = DraftEngine(players=players, rng=Random(0), forkable=True)
+    player.engine = engine
+    engine.run()
+    assert len(player.forks) == 45
+    fork = player.forks[20]
+    assert len(fork.picks) == 20 * len(players)
+    assert fork.picks.cards == engine.picks.cards[: len(fork.picks)]
+    fork.resume()
+    assert len(fork.picks) == len(engine.picks)
+    # Forks don't change the original engine, or each other
+    assert fork.picks.cards != engine.picks.cards
+    assert len(player.forks[0].picks) == 0
+    # Forks of a finished game replay every decision
+    assert engine.fork(players).picks.cards == engine.picks.cards
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+import functools
+
+from mtg_engine.decision_engine.blackjack_solver import (
+    OptimalBlackjackPlayer,
+    blackjack_match,
+)
+from mtg_engine.decision_engine.league import League, Rating, draw_margin, update
+from mtg_engine.decision_engine.player import FixedPlayer, Player
+
+
+class HitPlayer(Player):
+    """Always hits, until bust"""
+
+    def decide(self, choice) -> int:
+        return 1
+
+
+def test_update():
+    margin = draw_margin(0.1)
+    win, loss = update(Rating(), Rating(), 1, margin)
+    assert round(win.mean, 3) == 29.396 and round(loss.mean, 3) == 20.604
+    assert round(win.sigma, 3) == round(loss.sigma, 3) == 7.171
+    loss2, win2 = update(Rating(), Rating(), -1, margin)
+    assert (win2, loss2) == (win, loss)
+    # Draws pull ratings together
+    high, low = update(Rating(30, 2), Rating(20, 2), 0, margin)
+    assert 20 < low.mean < high.mean < 30
+    assert high.sigma < 2 and low.sigma < 2
+
+
+def test_schedule():
+    league = League(match=blackjack_match, workers=2)
+    for name in "abcd":
+        league.register(name, FixedPlayer)
+    league.ratings["a"] = Rating(25, 1)
+    # The uncertain players are scheduled first, and nobody plays twice
+    pairs = league.schedule(2)
+    assert len(pairs) == 2
+    assert len({name for pair in pairs for name in pair}) == 4
+    assert "a" not in pairs[0]
+
+
+def test_league_blackjack():
+    league = League(match=blackjack_match, target_sigma=2.5)
+    league.register("hit", HitPlayer)
+    league.register("stand", FixedPlayer)
+    league.register("optimal", OptimalBlackjackPlayer)
+    standings = league.run(max_matches=400)
+    assert [name for name, _ in standings] == ["optimal", "stand", "hit"]
+    assert league.is_confident()
+    assert league.matches < 400
+
+
+def test_league_workers():
+    league = League(
+        match=functools.partial(blackjack_match, hands=5), workers=2, target_sigma=0
+    )
+    league.register("stand", FixedPlayer)
+    league.register("hit", HitPlayer)
+    league.run(max_matches=4)
+    assert league.matches == 4
+    assert league.ratings["stand"].sigma < Rating().sigma
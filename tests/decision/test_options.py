@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+from random import Random
+
+import pytest
+
+from mtg_engine.decision_engine.message import Decision
+from mtg_engine.mtg_cards.booster import BoosterBox
+from mtg_engine.mtg_cards.cards import Cards
+from mtg_engine.mtg_cards.sets import get_basics
+from mtg_engine.mtg_decks.build import (
+    DeckChoice,
+    DeckFinishOption,
+    DeckPickOption,
+    DeckUnpickOption,
+)
+from mtg_engine.mtg_decks.decks import LimitedDeck
+from mtg_engine.mtg_decks.sealed import Sealed
+from mtg_engine.mtg_draft.draft import DraftPickChoice, DraftPickOption
+
+
+def test_lazy_draft_options():
+    pack = BoosterBox("neo", rng=Random(0)).get_booster()
+    choice = DraftPickChoice.make(player=0, pack=pack)
+    assert len(choice) == 15
+    option = choice.options[3]
+    assert isinstance(option, DraftPickOption) and option.card is pack[3]
+    assert choice.options[3] is option  # Made once, then reused
+    assert choice.options[-12] is option
+    assert option in choice
+    assert DraftPickOption(card=pack[3]) not in choice  # Equal is not enough
+    assert choice.is_valid_decision(Decision(index=3, option=option))
+    pack.pop(3)  # Picking from the pack doesn't change the choice
+    assert len(choice) == 15
+    assert [o.card for o in choice.options] == pack.cards[:3] + [
+        option.card
+    ] + pack.cards[3:]
+
+
+def test_lazy_deck_options():
+    deck = Sealed.make("neo", rng=Random(0))
+    choice = DeckChoice.make(deck)
+    distinct = len(set(deck.sideboard))  # One option for each distinct card
+    assert len(choice) == distinct + 5 and distinct < 90
+    assert isinstance(choice.options[0], DeckPickOption)
+    assert choice.options[distinct + 4].card is deck.basics[4]
+    for card in deck.sideboard.cards[:40]:
+        deck.pick(card)
+    choice = DeckChoice.make(deck)
+    picks, unpicks = len(set(deck.sideboard)), len(set(deck.main))
+    assert len(choice) == 1 + picks + 5 + unpicks
+    assert isinstance(choice.options[0], DeckFinishOption)
+    assert isinstance(choice.options[1 + picks + 5], DeckUnpickOption)
+    assert choice.options[1 + picks + 5].card is deck.main[0]
+    # The options keep the cards they were made with
+    assert choice.options.unpicks is DeckChoice.make(deck).options.unpicks
+    deck.unpick(deck.main[0])
+    assert choice.options[1 + picks + 5].card not in deck.distinct("main")
+
+
+def test_deck_options_finish():
+    deck = LimitedDeck(main=Cards(get_basics().cards[:5] * 8))
+    choice = DeckChoice.make(deck)
+    assert choice.options.finish is None  # Not checked yet
+    assert isinstance(choice.options[0], DeckFinishOption)
+    assert choice.options.finish is True
+    size = len(choice)
+    deck.unpick(deck.main[0])  # Checked already, so the options don't change
+    assert len(choice) == size and not deck.legal()
+    stale = DeckChoice.make(deck)
+    deck.pick(deck.basics[0])
+    with pytest.raises(AssertionError, match="Deck changed"):
+        len(stale)
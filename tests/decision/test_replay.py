@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+import io
+from random import Random
+
+import pytest
+
+from mtg_engine.decision_engine.checksum import Checksum
+from mtg_engine.decision_engine.example_blackjack import Blackjack
+from mtg_engine.decision_engine.player import Player, RandomPlayer
+from mtg_engine.decision_engine.replay import ReplayLog
+from mtg_engine.mtg_draft.draft import DraftEngine
+
+
+def make_draft(seed: int) -> DraftEngine:
+    """Make a draft engine with placeholder players, which are never called"""
+    return DraftEngine(players=[Player() for _ in range(8)], rng=Random(seed))
+
+
+def run_draft(seed: int) -> DraftEngine:
+    players = [RandomPlayer(rng=Random(seed + i)) for i in range(8)]
+    draft = DraftEngine(players=players, rng=Random(seed), checksum=Checksum())
+    draft.run()
+    return draft
+
+
+def test_replay_draft():
+    for seed in range(3):
+        draft = run_draft(seed)
+        log = ReplayLog.from_engine(draft, seed)
+        data = log.to_bytes()
+        assert len(data) < 400  # 360 picks, one byte each
+        replayed = ReplayLog.from_bytes(data).replay(make_draft)
+        assert replayed.picks == draft.picks
+
+
+def test_replay_many_logs():
+    file = io.BytesIO()
+    engines = []
+    for seed in range(10):
+        players = [RandomPlayer(rng=Random(seed))]
+        engine = Blackjack(players=players, rng=Random(seed), checksum=Checksum())
+        engine.run()
+        ReplayLog.from_engine(engine, seed).write(file)
+        engines.append(engine)
+    file.seek(0)
+    logs = list(ReplayLog.read(file))
+    assert len(logs) == len(engines)
+    for log, engine in zip(logs, engines):
+        replayed = log.replay(lambda s: Blackjack(players=[Player()], rng=Random(s)))
+        assert replayed.cards == engine.cards
+
+
+def test_replay_mismatch():
+    log = ReplayLog.from_engine(run_draft(0), seed=0)
+    log.decisions[10] = (log.decisions[10] + 1) % 15
+    with pytest.raises(ValueError):
+        log.replay(make_draft)
+    log = ReplayLog.from_engine(run_draft(0), seed=1)  # Wrong seed
+    with pytest.raises(ValueError):
+        log.replay(make_draft)
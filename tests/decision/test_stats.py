@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+import json
+from random import Random
+
+from mtg_engine.decision_engine.example_blackjack import Blackjack
+from mtg_engine.decision_engine.player import BiasedPlayer, RandomPlayer
+from mtg_engine.decision_engine.stats import EngineStats
+from mtg_engine.mtg_decks.build import DeckEngine
+from mtg_engine.mtg_decks.sealed import Sealed
+from mtg_engine.mtg_draft.draft import DraftEngine
+
+
+def test_draft_stats():
+    players = [RandomPlayer(rng=Random(i)) for i in range(3)]
+    draft = DraftEngine(players=players, rng=Random(0), stats=EngineStats())
+    draft.run()
+    stats = draft.stats
+    assert stats is not None
+    assert stats.messages["DraftPickChoice"].count == 3 * 45
+    assert stats.messages["PackViews"].count == 45
+    for i in range(3):
+        assert stats.players[i].count == 45
+        assert sum(stats.players[i].latency.values()) == 45
+        assert stats.players[i].options == {n: 3 for n in range(1, 16)}
+    data = json.loads(stats.to_json())
+    assert data["messages"]["DraftPickChoice"]["count"] == 3 * 45
+
+
+def test_deck_and_blackjack_stats():
+    deck = Sealed.make("neo", rng=Random(0))
+    players = [BiasedPlayer(rng=Random(0))]
+    engine = DeckEngine(players=players, deck=deck, stats=EngineStats())
+    engine.run()
+    assert engine.stats.messages["DeckChoice"].count == len(players[0].history) // 2
+    assert engine.stats.assert_nanoseconds > 0
+    engine = Blackjack(players=[RandomPlayer()], stats=EngineStats())
+    engine.run()
+    assert engine.stats.messages["ScoresViews"].count == 1
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+from random import Random
+
+import pytest
+
+from mtg_engine.decision_engine.example_blackjack import Blackjack
+from mtg_engine.decision_engine.message import Choice, Decision, Views
+from mtg_engine.decision_engine.player import FixedPlayer, RandomPlayer
+from mtg_engine.mtg_draft.draft import DraftEngine, DraftPickOption
+
+
+def test_step_matches_run():
+    players = [RandomPlayer(rng=Random(i)) for i in range(3)]
+    engine = DraftEngine(players=players, rng=Random(0))
+    engine.run()
+    stepped = DraftEngine(players=[FixedPlayer() for _ in range(3)], rng=Random(0))
+    rng = [Random(i) for i in range(3)]  # Same decisions as the random players
+    message = stepped.reset()
+    while message is not None:
+        assert stepped.message is message
+        reply = None
+        if isinstance(message, Choice):
+            index = rng[message.player].randrange(len(message.options))
+            reply = Decision(index=index, option=message.options[index])
+        message = stepped.step(reply)
+    assert stepped.message is None
+    assert stepped.decisions == engine.decisions
+    assert stepped.messages == engine.messages
+    assert stepped.picks.cards == engine.picks.cards
+    # Players are never called when stepping
+    assert all(not player.history for player in stepped.players)
+
+
+def test_step_blackjack_views():
+    engine = Blackjack(players=[FixedPlayer()], rng=Random(0))
+    message = engine.reset()
+    views = 0
+    while message is not None:
+        views += isinstance(message, Views)
+        reply = None
+        if isinstance(message, Choice):
+            reply = Decision(index=0, option=message.options[0])  # Stand
+        message = engine.step(reply)
+    assert views > 0
+    assert engine.decisions == [0]
+
+
+def test_step_checks_reply():
+    engine = DraftEngine(players=[FixedPlayer() for _ in range(3)], rng=Random(0))
+    message = engine.reset()
+    while not isinstance(message, Choice):
+        with pytest.raises(AssertionError):  # Views don't take a decision
+            engine.step(Decision(index=0))
+        message = engine.step(None)
+    other = Decision(index=0, option=DraftPickOption(card=message.options[0].card))
+    messages = engine.messages
+    for reply in (None, Decision(index=len(message.options)), other):
+        with pytest.raises(AssertionError, match="doesn't answer"):
+            engine.step(reply)
+    assert engine.message is message and engine.messages == messages  # Unchanged
+    engine.step(Decision(index=0, option=message.options[0]))
+
+
+def test_run_checks_replies_once(monkeypatch):
+    def unchecked(self, reply):
+        raise AssertionError("send_receive() already checked the reply")
+
+    monkeypatch.setattr(DraftEngine, "is_valid_reply", unchecked)
+    engine = DraftEngine(players=[FixedPlayer() for _ in range(3)], rng=Random(0))
+    engine.run()
+    assert engine.message is None and engine.decisions
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+import gc
+import json
+from collections import Counter
+from random import Random
+
+from mtg_engine.decision_engine.message import Choice, Decision
+from mtg_engine.decision_engine.player import FixedPlayer, RandomPlayer
+from mtg_engine.decision_engine.trace import Tracer
+from mtg_engine.mtg_cards.cards import Cards
+from mtg_engine.mtg_cards.sets import get_basics
+from mtg_engine.mtg_decks.decks import LimitedDeck
+from mtg_engine.mtg_draft.draft import DraftEngine
+from mtg_engine.mtg_game.game import GameEngine
+
+
+def check_balanced(events):
+    """Check every begin has a matching end, in stack order"""
+    stack = []
+    for event in events:
+        if event["ph"] == "B":
+            stack.append(event["name"])
+        else:
+            assert event["ph"] == "E"
+            assert stack.pop() == event["name"]
+    assert not stack
+
+
+def test_trace_draft(tmp_path):
+    players = [RandomPlayer(rng=Random(i)) for i in range(2)]
+    draft = DraftEngine(players=players, rng=Random(0), tracer=Tracer())
+    draft.run()
+    path = tmp_path / "trace.json"
+    draft.tracer.save(str(path))
+    with open(path, encoding="UTF-8") as file:
+        events = json.load(file)["traceEvents"]
+    check_balanced(events)
+    names = Counter(e["name"] for e in events if e["ph"] == "B")
+    assert names["DraftEngine.run"] == 1
+    # A span for each stretch of work, ending at each message and at the return
+    assert names["DraftEngine.get_picks"] == 45 * (2 + 1)
+    assert names["DraftEngine.play"] == 45 * (1 + 2) + 1
+    assert names["choice DraftPickChoice"] == 2 * 45
+    assert names["views PackViews"] == 45
+
+
+def test_trace_game():
+    deck = LimitedDeck(main=Cards([get_basics().cards[0]] * 40))
+    players = [FixedPlayer(), FixedPlayer()]
+    game = GameEngine(players=players, decks=[deck, deck], tracer=Tracer())
+    game.run()
+    check_balanced(game.tracer.events)
+    names = [e["name"] for e in game.tracer.events if e["ph"] == "B"]
+    assert names[:3] == ["GameEngine.run", "GameEngine.play", "GameEngine.start"]
+    assert "GameEngine.draw_hands" in names
+
+
+def test_trace_abandoned():
+    tracer = Tracer()
+    players = [FixedPlayer() for _ in range(2)]
+    draft = DraftEngine(players=players, rng=Random(0), tracer=tracer)
+    message = draft.reset()
+    for _ in range(4):  # Stop while the phases wait for a reply
+        reply = None
+        if isinstance(message, Choice):
+            reply = Decision(index=0, option=message.options[0])
+        message = draft.step(reply)
+    assert isinstance(message, Choice)
+    check_balanced(tracer.events)
+    num_events = len(tracer.events)
+    del draft, message
+    gc.collect()
+    assert len(tracer.events) == num_events  # No late end events
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+from random import Random
+
+import pytest
+
+from mtg_engine.decision_engine.example_blackjack import (
+    Blackjack,
+    MyFacedownCard,
+    OtherFaceDownCard,
+)
+from mtg_engine.decision_engine.message import SharedViews, View
+from mtg_engine.decision_engine.player import FixedPlayer
+from mtg_engine.mtg_cards.cards import Cards
+from mtg_engine.mtg_cards.sets import get_basics
+from mtg_engine.mtg_decks.decks import LimitedDeck
+from mtg_engine.mtg_game.game import (
+    GameEngine,
+    LibrarySizeView,
+    LibraryView,
+    StartFirstView,
+)
+
+
+def test_shared_views():
+    public, private = View(desc="public"), View(desc="private")
+    views = SharedViews(public=public, private={1: private}, num_players=3)
+    assert len(views) == 3
+    assert list(views) == [public, private, public]
+    assert list(views)[2] is public
+    with pytest.raises(TypeError):
+        views.append(View())
+
+
+def test_shared_views_game():
+    decks = [LimitedDeck(main=Cards(get_basics().cards[:5] * 8)) for _ in range(2)]
+    players = [FixedPlayer() for _ in range(2)]
+    engine = GameEngine(players=players, decks=decks, rng=Random(0))
+    engine.run()
+    # Public views are the same object for every player
+    firsts = [[v for v in p.history if isinstance(v, StartFirstView)] for p in players]
+    assert all(first[0] is firsts[0][0] for first in firsts)
+    # Each player only sees their own library
+    for i, player in enumerate(players):
+        libraries = [v for v in player.history if isinstance(v, LibraryView)]
+        sizes = [v for v in player.history if isinstance(v, LibrarySizeView)]
+        assert len(libraries) == 1
+        assert libraries[0].cards.sorted_copy() == decks[i].main.sorted_copy()
+        assert [v.player for v in sizes] == [1 - i]
+
+
+def test_shared_views_blackjack():
+    players = [FixedPlayer() for _ in range(3)]
+    Blackjack(players=players, rng=Random(0)).run()
+    for player in players:
+        assert not any(isinstance(v, MyFacedownCard) for v in player.history)
+        hidden = [v for v in player.history if isinstance(v, OtherFaceDownCard)]
+        assert [v.player for v in hidden] == [-1]  # Only the dealer's card
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+import time
+from random import Random
+
+from mtg_engine.decision_engine.player import RandomPlayer
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_decks.auto import DeckBuilder, pool_cards, split_basics
+from mtg_engine.mtg_decks.decks import card_colors, mana_pips
+from mtg_engine.mtg_decks.sealed import Sealed
+from mtg_engine.mtg_draft.draft import DraftEngine
+
+
+def test_split_basics():
+    assert split_basics({"W": 10, "U": 5}, "WU", 17) == {"W": 11, "U": 6}
+    assert split_basics({"W": 3, "G": 1}, "WU", 16) == {"W": 16, "U": 0}
+    assert split_basics({}, "BR", 17) == {"B": 9, "R": 8}
+
+
+def test_mana_pips():
+    neo = get_set("neo")
+    assert mana_pips(neo.cards[1]) == {"W": 2}  # {3}{W}{W}
+    assert all(set(mana_pips(c)) <= set(card_colors(c)) for c in neo.cards)
+
+
+def test_build_sealed():
+    builder = DeckBuilder()
+    for seed in range(5):
+        sealed = Sealed.make("neo", rng=Random(seed))
+        deck = builder.build(sealed.pool)
+        assert deck.legal() and len(deck.main) == 40
+        assert deck.stats.spells == 23 and deck.stats.lands == 17
+        assert len(deck.stats.colors) <= 2
+        assert len(deck.main) + len(deck.sideboard) - 17 <= len(sealed.pool)
+
+
+def test_build_values():
+    """With a value function that loves one color, the deck is in that color"""
+    sealed = Sealed.make("neo", rng=Random(0))
+    builder = DeckBuilder(value=lambda card: float("G" in card_colors(card)))
+    deck = builder.build(sealed.pool)
+    assert "G" in deck.stats.colors
+    assert deck.stats.colors["G"] >= max(deck.stats.colors.values())
+
+
+def test_build_draft():
+    players = [RandomPlayer(rng=Random(i)) for i in range(8)]
+    draft = DraftEngine(players=players, rng=Random(0))
+    draft.run()
+    pools = [pool_cards(counts) for counts in draft.pools]
+    assert all(len(pool) == 45 for pool in pools)
+    start = time.perf_counter()
+    decks = DeckBuilder().build_all(pools)
+    assert time.perf_counter() - start < 1.0  # Milliseconds per deck
+    assert all(deck.legal() for deck in decks)
@@ -1,13 +1,16 @@
 #!/usr/bin/env python
 
+from collections import Counter
 from random import Random
 from telnetlib import SE
 
 import pytest
 
 from mtg_engine.decision_engine.player import BiasedPlayer, FixedPlayer, Player
+from mtg_engine.mtg_cards.cards import Card, Cards
+from mtg_engine.mtg_cards.sets import get_basics
 from mtg_engine.mtg_decks.build import DeckEngine
-from mtg_engine.mtg_decks.decks import Deck
+from mtg_engine.mtg_decks.decks import Deck, DeckStats, LimitedDeck
 from mtg_engine.mtg_decks.sealed import Sealed
 
 
@@ -77,3 +80,42 @@ def test_five_basics():
     assert len(basic_names) == 5
     correct_names = ["Forest", "Island", "Mountain", "Plains", "Swamp"]
     assert basic_names == correct_names
+
+
+def test_deck_stats():
+    deck = Sealed.make("neo", rng=Random(2))
+    rng = Random(3)
+    for _ in range(200):
+        if deck.can_unpick and rng.random() < 0.4:
+            deck.unpick(rng.choice(deck.main.cards))
+        elif rng.random() < 0.2:
+            deck.pick(rng.choice(deck.basics.cards))
+        elif deck.can_pick:
+            deck.pick(rng.choice(deck.sideboard.cards))
+        expected = DeckStats.make(deck.main)
+        assert deck.stats == expected
+        assert deck.side_counts == Counter(deck.sideboard)
+        assert deck.stats.lands == len(deck.main.filt_land())
+        assert deck.stats.spells + deck.stats.lands == len(deck.main)
+        assert sum(deck.stats.curve.values()) == deck.stats.spells
+        assert deck.legal() == (len(deck.main) >= 40)
+
+
+def test_legal_outside_set():
+    plains = get_basics("neo").get_by_name("Plains")[0]
+    deck = LimitedDeck(main=Cards([plains] * 40))
+    assert deck.legal() and deck.stats.lands == 40
+    bogus = Card.bogus()
+    assert bogus not in deck.set_
+    deck = LimitedDeck(main=Cards([plains] * 40), sideboard=Cards([bogus]))
+    assert not deck.legal()
+    deck.pick(bogus)
+    deck.unpick(bogus)
+    assert not deck.legal()
+    with pytest.raises(ValueError):
+        deck.unpick(bogus)
+    deck = LimitedDeck(main=Cards([plains] * 40))
+    deck.sideboard = Cards([bogus])
+    assert not deck.legal()
+    deck.sideboard = Cards()
+    assert deck.legal()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+from math import comb
+from random import Random
+
+import numpy as np
+
+from mtg_engine.mtg_cards.cards import Cards
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_decks import mana
+from mtg_engine.mtg_decks.auto import DeckBuilder
+from mtg_engine.mtg_decks.decks import LimitedDeck
+from mtg_engine.mtg_decks.mana import (
+    basics_splits,
+    castability,
+    hypergeometric,
+    on_curve,
+    recommend_basics,
+)
+from mtg_engine.mtg_decks.sealed import Sealed
+
+W, U = frozenset("W"), frozenset("U")
+
+
+def test_hypergeometric():
+    table = hypergeometric(40)
+    assert np.allclose(table[40, 17, 7].sum(), 1)
+    assert np.isclose(table[40, 17, 7, 3], comb(17, 3) * comb(23, 4) / comb(40, 7))
+    assert np.allclose(table[:, :, 5].sum(axis=-1)[np.tril_indices(41)][15:], 1)
+
+
+def test_on_curve():
+    # One land on turn one, on the play
+    chance = on_curve(40, [W, U], np.array([9, 8]), (1, ()))
+    assert np.isclose(chance[0], 1 - comb(23, 7) / comb(40, 7))
+    # One white source on turn one
+    chance = on_curve(40, [W, U], np.array([9, 8]), (1, (("W", 1),)))
+    assert np.isclose(chance[0], 1 - comb(31, 7) / comb(40, 7))
+    # Many candidates at once, and drawing a card helps
+    counts = np.array([[9, 8], [17, 0], [0, 17], [12, 5]])
+    req = (2, (("U", 1), ("W", 1)))
+    play = on_curve(40, [W, U], counts, req)
+    draw = on_curve(40, [W, U], counts, req, on_play=False)
+    assert play[1] == play[2] == 0
+    assert play[0] > play[3] > 0 and (draw >= play).all()
+    # Dual lands count for both colors
+    assert on_curve(40, [W | U], np.array([17]), req)[0] > play[0]
+
+
+def test_on_curve_chunks(monkeypatch):
+    # Many candidates share group sizes, and are scored in small chunks
+    req = (3, (("U", 1), ("W", 2)))
+    counts = np.array([[9, 8, 0], [8, 8, 1], [17, 0, 0], [9, 8, 0], [0, 16, 1]])
+    counts = np.tile(counts, (300, 1))
+    expected = [on_curve(40, [W, U, W | U], c, req)[0] for c in counts[:5]]
+    monkeypatch.setattr(mana, "MAX_ELEMENTS", 1)
+    chances = on_curve(40, [W, U, W | U], counts, req)
+    assert chances.shape == (1500,) and np.allclose(chances, np.tile(expected, 300))
+
+
+def test_recommend_basics():
+    white = [c for c in get_set("neo").cards if c.oracle.get("mana_cost") == "{W}{W}"]
+    blue = [c for c in get_set("neo").cards if c.oracle.get("mana_cost") == "{1}{U}"]
+    deck = LimitedDeck(sideboard=Cards(white[:1] * 15 + blue[:1] * 8))
+    for card in deck.sideboard.copy():
+        deck.pick(card)
+    split = recommend_basics(deck, "WU", 17)
+    assert sum(split.values()) == 17 and split["W"] > split["U"] > 0
+    assert len(basics_splits("WUB", 17)) == comb(19, 2)
+
+
+def test_builder_castable():
+    sealed = Sealed.make("neo", rng=Random(0))
+    plain = DeckBuilder().build(sealed.pool)
+    castable = DeckBuilder(castable=True).build(sealed.pool)
+    assert castable.legal() and castable.stats.lands == plain.stats.lands
+    mean = lambda deck: np.mean(list(castability(deck).values()))
+    assert mean(castable) >= mean(plain)
+    assert all(0 <= c <= 1 for c in castability(castable).values())
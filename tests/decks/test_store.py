@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+from random import Random
+
+import numpy as np
+import pytest
+
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_decks.auto import DeckBuilder
+from mtg_engine.mtg_decks.sealed import Sealed
+from mtg_engine.mtg_decks.store import CompactDeck, DeckStore
+
+
+def built_deck(seed: int):
+    return DeckBuilder().build(Sealed.make("neo", rng=Random(seed)).pool)
+
+
+def test_compact_deck():
+    deck = built_deck(0)
+    compact = CompactDeck.from_deck(deck)
+    assert compact.main.sum() == 40 and compact.sideboard.sum() == len(deck.sideboard)
+    restored = compact.to_deck()
+    assert sorted(restored.main) == sorted(deck.main)
+    assert sorted(restored.sideboard) == sorted(deck.sideboard)
+    assert restored.legal() and restored.stats == deck.stats
+    data = compact.to_bytes()
+    assert len(data) == 2 * len(compact.main)
+    assert CompactDeck.from_bytes(data) == compact
+    assert compact.digest() == CompactDeck.from_bytes(data).digest()
+    assert compact.digest() != CompactDeck.from_deck(built_deck(1)).digest()
+
+
+def test_text():
+    compact = CompactDeck.from_deck(built_deck(2))
+    text = compact.to_text()
+    assert text.startswith("Deck\n") and "\nSideboard\n" in text
+    assert CompactDeck.from_text(text) == compact
+    # By name only, and ignoring other sections
+    by_name = CompactDeck.from_text(
+        "Companion\n1 Nope\n\nDeck\n3 Swamp\n2 Moon-Circuit Hacker\n"
+    )
+    assert by_name.main.sum() == 5 and not by_name.sideboard.any()
+    assert by_name.to_deck().stats.lands == 3
+    with pytest.raises(ValueError):
+        CompactDeck.from_text("Deck\n1 Lightning Bolt\n")
+    # Double-faced cards by their front face, or their full name
+    moths = "Befriending the Moths"
+    front = CompactDeck.from_text(f"Deck\n1 {moths}\n1 {moths} // Imperial Moth\n")
+    assert front.cards("main").cards == [get_set("neo").get_by_name(moths)] * 2
+    with pytest.raises(ValueError, match="not in neo"):
+        CompactDeck.from_text("Deck\n1 Swamp (NEO) 9999\n")
+    with pytest.raises(ValueError, match="More than 255"):
+        CompactDeck.from_text("Deck\n200 Swamp\n100 Swamp\n")
+
+
+def test_store(tmp_path):
+    path = str(tmp_path / "decks.bin")
+    decks = [CompactDeck.from_deck(built_deck(seed)) for seed in range(4)]
+    store = DeckStore(path)
+    assert len(store) == 0 and len(store.records()) == 0
+    assert store.add(decks[0]) and not store.add(decks[0])
+    assert store.add_all(decks + decks) == 3
+    assert len(store) == 4 and decks[3] in store
+    # Reopening reads back the same decks, in order
+    store = DeckStore(path)
+    assert len(store) == 4 and list(store) == decks
+    records = store.records()
+    assert isinstance(records, np.memmap) and records["main"].sum() == 4 * 40
+    assert bytes(records["digest"][1]) == decks[1].digest()
+    # Part of a record left by a crash is cut off, and appends stay aligned
+    with open(path, "ab") as file:
+        file.write(b"partial")
+    store = DeckStore(path)
+    assert len(store) == 4 and list(store) == decks
+    assert store.add(CompactDeck.from_deck(built_deck(4))) and len(store.records()) == 5
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a deck store")
+    with pytest.raises(ValueError):
+        DeckStore(str(other))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Shared helpers for tests with 17lands style draft logs"""
+import csv
+import gzip
+from collections import Counter
+from random import Random
+
+from mtg_engine.decision_engine.message import Decision
+from mtg_engine.decision_engine.player import RandomPlayer
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_draft.draft import DraftEngine
+
+UNKNOWN = "Not A Real Card"  # Name of a card that isn't in the set
+
+
+def lands_name(card) -> str:
+    """Name of a card in 17lands data, the front face for double-faced cards"""
+    if "card_faces" in card.oracle:
+        return card.oracle["card_faces"][0]["name"]
+    return card.name
+
+
+def seat_rows(players, seat: int, draft_id: str, wins: int):
+    """17lands style rows for one seat of a finished draft"""
+    history = players[seat].history
+    decisions = [i for i, m in enumerate(history) if isinstance(m, Decision)]
+    pool: Counter = Counter()
+    for pick, i in enumerate(decisions):
+        choice, decision = history[i - 1], history[i]
+        yield {
+            "draft_id": draft_id,
+            "event_match_wins": wins,
+            "event_match_losses": 3,
+            "pack_number": pick // 15,
+            "pick_number": pick % 15,
+            "pick": lands_name(decision.option.card),
+            "pack": Counter(lands_name(o.card) for o in choice.options),
+            "pool": Counter(pool),
+        }
+        pool[lands_name(decision.option.card)] += 1
+
+
+def draft_rows(draft_id: str, seed: int):
+    """17lands style rows for the first seat of a draft"""
+    players = [RandomPlayer(rng=Random(seed + i)) for i in range(3)]
+    DraftEngine(players=players, rng=Random(seed)).run()
+    yield from seat_rows(players, 0, draft_id, seed % 7)
+
+
+def write_dump(path: str, rows) -> None:
+    """Write rows with the 17lands draft data layout"""
+    names = sorted({lands_name(card) for card in get_set("neo").cards}) + [UNKNOWN]
+    scalars = ["expansion", "event_type", "draft_id", "draft_time", "rank"]
+    scalars += ["event_match_wins", "event_match_losses"]
+    scalars += ["pack_number", "pick_number", "pick", "pick_maindeck_rate"]
+    header = scalars + [f"pack_card_{n}" for n in names] + [f"pool_{n}" for n in names]
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", newline="", encoding="UTF-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for row in rows:
+            values = dict(expansion="NEO", event_type="PremierDraft", rank="gold")
+            values.update({k: v for k, v in row.items() if k not in ("pack", "pool")})
+            line = [values.get(s, "") for s in scalars]
+            line += [row["pack"][n] for n in names] + [row["pool"][n] for n in names]
+            writer.writerow(line)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+import csv
+from random import Random
+
+import numpy as np
+
+from mtg_engine.mtg_cards.sets import get_card_id, get_set
+from mtg_engine.mtg_draft.bots import RatingPlayer, RatingTable, rating_policy
+from mtg_engine.mtg_draft.draft import DraftEngine
+from mtg_engine.mtg_draft.vector import VectorDraft
+
+
+def write_ratings(path, seed=0):
+    """Write a 17lands style CSV of random ratings, missing one card.
+    Double-faced cards are named by their front face, like 17lands does."""
+    rng = Random(seed)
+    names = sorted(
+        set(
+            card.oracle["card_faces"][0]["name"] if card.dfc else card.name
+            for card in get_set("neo").cards
+        )
+    )
+    with open(path, "w", newline="", encoding="UTF-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Name", "GIH WR"])
+        for name in names[1:]:
+            writer.writerow([name, f"{rng.uniform(45, 65):.1f}%"])
+        writer.writerow([names[0], ""])
+    return names
+
+
+def test_rating_table(tmp_path):
+    path = str(tmp_path / "neo.csv")
+    names = write_ratings(path)
+    table = RatingTable.from_csv(path, name_column="Name", rating_column="GIH WR")
+    neo = get_set("neo")
+    assert table.ratings.shape == (len(neo),)
+    assert 45 <= table.ratings.min() and table.ratings.max() <= 65
+    missing = [i for i, card in enumerate(neo.cards) if card.name == names[0]]
+    assert np.allclose(table.ratings[missing], table.ratings.mean(), atol=1)
+    # Double-faced cards get their own ratings, not the mean
+    moths = get_card_id(neo.get_by_name("Befriending the Moths"))
+    rating = table.ratings[moths]
+    assert "Befriending the Moths" in names and rating != table.ratings[missing[0]]
+
+
+def test_color_commitment(tmp_path):
+    neo = get_set("neo")
+    white = [c for c in neo.cards if c.oracle["color_identity"] == ("W",)]
+    blue = [c for c in neo.cards if c.oracle["color_identity"] == ("U",)]
+    path = str(tmp_path / "neo.csv")
+    write_ratings(path)
+    ratings = RatingTable.from_csv(path, name_column="Name", rating_column="GIH WR")
+    ratings = ratings.ratings.copy()  # 17lands scale win rates, from 45 to 65
+    # Blue is better by a fifth of a standard deviation, less than the full bonus
+    ratings[get_card_id(blue[0])] = ratings[get_card_id(white[0])] + ratings.std() / 5
+    table = RatingTable("neo", ratings)
+    pack = np.array([[get_card_id(blue[0]), get_card_id(white[0])]])
+    empty = np.zeros((1, len(neo)), dtype=np.int16)
+    assert table.score(pack, empty)[0].argmax() == 0  # Best rating
+    pool = empty.copy()
+    for card in white[1:11]:
+        pool[0, get_card_id(card)] += 1
+    assert table.score(pack, pool)[0].argmax() == 1  # Committed to white
+
+
+def test_rating_bots_agree(tmp_path):
+    path = str(tmp_path / "neo.csv")
+    write_ratings(path)
+    table = RatingTable.from_csv(path, name_column="Name", rating_column="GIH WR")
+    vector = VectorDraft(num_players=8)
+    picks, _ = vector.run(vector.engine_packs([0]), [rating_policy(table)] * 8)
+    players = [RatingPlayer(table=table) for _ in range(8)]
+    draft = DraftEngine(players=players, rng=Random(0))
+    draft.run()
+    ids = np.array([get_card_id(card) for card in draft.picks])
+    assert np.array_equal(picks[0], ids.reshape(-1, 8).T)
+    assert all(player.pool(i).sum() == 45 for i, player in enumerate(players))
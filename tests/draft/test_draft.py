@@ -1,10 +1,16 @@
 #!/usr/bin/env python
+from dataclasses import dataclass, field
 from random import Random
+from typing import List
 
+import numpy as np
 import pytest
 
 from mtg_engine.decision_engine.player import FixedPlayer, RandomPlayer
-from mtg_engine.mtg_draft.draft import DraftEngine
+from mtg_engine.mtg_cards.booster import BoosterBox
+from mtg_engine.mtg_cards.sets import get_card_id
+from mtg_engine.mtg_draft.draft import DraftEngine, DraftPickChoice
+from mtg_engine.mtg_draft.vector import holders
 
 
 def test_draft():
@@ -68,3 +74,53 @@ def test_packs_different():
             draft3 = random_draft(num_players=num_players, draft_seed=seed + 1)
             assert sorted(draft1.picks) == sorted(draft2.picks)
             assert sorted(draft1.picks) != sorted(draft3.picks)
+
+
+@dataclass
+class PoolPlayer(RandomPlayer):
+    """Keeps a copy of the pool sent with each choice"""
+
+    pools: List[np.ndarray] = field(default_factory=list)
+
+    def decide(self, choice) -> int:
+        assert choice.pool is not None and not choice.pool.flags.writeable
+        self.pools.append(choice.pool.copy())
+        return super().decide(choice)
+
+
+def test_pools():
+    """Check that pools count each seat's picks, and players see read-only views"""
+    for num_players, simultaneous in ((2, False), (5, True), (8, False)):
+        players = [PoolPlayer(rng=Random(i)) for i in range(num_players)]
+        draft = DraftEngine(
+            players=players, rng=Random(num_players), simultaneous=simultaneous
+        )
+        draft.run()
+        picks = np.array([get_card_id(card) for card in draft.picks])
+        by_seat = picks.reshape(-1, num_players).T
+        for seat, player in enumerate(players):
+            counts = np.bincount(by_seat[seat], minlength=draft.pools.shape[1])
+            assert np.array_equal(draft.pools[seat], counts)
+            # Each choice had the pool from before its pick
+            for pick, pool in enumerate(player.pools):
+                before = np.bincount(by_seat[seat, :pick], minlength=len(counts))
+                assert np.array_equal(pool, before)
+            # And it's detached after the pick
+            choices = [m for m in player.history if isinstance(m, DraftPickChoice)]
+            assert len(choices) == 45 and all(c.pool is None for c in choices)
+    with pytest.raises(ValueError):
+        draft.pool(0)[0] = 1
+
+
+def test_pack_rotation():
+    """Seats get the pack from the next seat, except in the second round"""
+    draft = DraftEngine(players=[FixedPlayer() for _ in range(5)], rng=Random(0))
+    draft.box = BoosterBox(rng=Random(0))
+    draft.get_new_packs()
+    opened = draft.held()
+    for round_ in range(3):
+        draft.table.offset = 0
+        for pick in range(15):
+            expected = [opened[i] for i in holders(5, round_, pick)]
+            assert all(a is b for a, b in zip(draft.held(), expected))
+            draft.pass_packs(bool(round_ % 2))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+from collections import Counter
+
+import numpy as np
+from lands_dump import UNKNOWN, draft_rows, lands_name, write_dump
+
+from mtg_engine.mtg_cards.sets import get_set
+from mtg_engine.mtg_draft.logs import DraftLogs, ingest, name_ids
+
+
+def test_ingest(tmp_path):
+    rows = list(draft_rows("a", 0)) + list(draft_rows("b", 1))
+    rows[-1]["pack"][UNKNOWN] += 1  # Ignored, since it's not in the set
+    dump = str(tmp_path / "draft_data.csv.gz")
+    write_dump(dump, rows)
+    out = str(tmp_path / "logs")
+    assert ingest(dump, out, chunk_rows=7) == len(rows) == 90
+    logs = DraftLogs(out)
+    assert len(logs) == 90 and logs.num_drafts == 2
+    assert isinstance(logs["pack"], np.memmap) and not logs["pack"].flags.writeable
+    cards = get_set("neo").cards
+    for i, row in enumerate(rows):
+        assert lands_name(cards[logs["pick"][i]]) == row["pick"]
+        pack = Counter(
+            {lands_name(cards[c]): n for c, n in enumerate(logs["pack"][i]) if n}
+        )
+        assert pack == +row["pack"] - Counter({UNKNOWN: 1})
+        assert logs["pool"][i].sum() == row["pool"].total()
+        assert logs["pack_number"][i] == row["pack_number"]
+        assert logs["pick_number"][i] == row["pick_number"]
+    assert np.array_equal(logs["draft"], np.repeat([0, 1], 45))
+    assert set(logs["wins"][:45]) == {0} and set(logs["wins"][45:]) == {1}
+    assert set(logs["losses"]) == {3}
+    # Picked cards are in the pack, and in the next pool
+    assert (logs["pack"][np.arange(90), logs["pick"]] > 0).all()
+    after = logs["pool"][1:45] - logs["pool"][:44]
+    assert np.array_equal(after.argmax(axis=1), logs["pick"][:44])
+
+
+def test_ingest_empty(tmp_path):
+    dump = str(tmp_path / "draft_data.csv")
+    write_dump(dump, [])
+    assert ingest(dump, str(tmp_path / "logs")) == 0
+    logs = DraftLogs(str(tmp_path / "logs"))
+    assert len(logs) == 0 and logs.num_drafts == 0
+    assert logs["pack"].shape == (0, len(get_set("neo")))
+
+
+def test_ingest_front_face(tmp_path, caplog):
+    set_ = get_set("neo")
+    moths = set_.get_by_name("Befriending the Moths")
+    assert moths.name == "Befriending the Moths // Imperial Moth"
+    assert name_ids(set_)["Befriending the Moths"] == set_.card_id(moths)
+    row = dict(draft_id="a", event_match_wins=1, event_match_losses=3)
+    row.update(pack_number=0, pick_number=0, pick="Befriending the Moths")
+    row.update(pack=Counter({"Befriending the Moths": 1, UNKNOWN: 1}), pool=Counter())
+    dump = str(tmp_path / "draft_data.csv")
+    write_dump(dump, [row, dict(row, pick=UNKNOWN)])
+    assert ingest(dump, str(tmp_path / "logs")) == 2
+    logs = DraftLogs(str(tmp_path / "logs"))
+    assert list(logs["pick"]) == [set_.card_id(moths), -1]
+    assert logs["pack"][0, set_.card_id(moths)] == 1 and logs["pack"][0].sum() == 1
+    assert UNKNOWN in caplog.text
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+from random import Random
+
+import numpy as np
+import pytest
+from lands_dump import seat_rows, write_dump
+
+from mtg_engine.decision_engine.message import Choice
+from mtg_engine.decision_engine.player import RandomPlayer
+from mtg_engine.mtg_cards.sets import get_card_id, get_set
+from mtg_engine.mtg_draft.draft import DraftEngine
+from mtg_engine.mtg_draft.logs import DraftLogs, ingest, name_ids
+from mtg_engine.mtg_draft.pick_stats import COUNTERS, PickStats, draft_picks, seen_packs
+from mtg_engine.mtg_draft.vector import VectorDraft, table_policy
+
+
+def run_draft(num_players: int, seed: int):
+    """Run a draft with random players"""
+    players = [RandomPlayer(rng=Random(seed + i)) for i in range(num_players)]
+    draft = DraftEngine(players=players, rng=Random(seed))
+    draft.run()
+    return draft, players
+
+
+def test_seen_packs():
+    draft, players = run_draft(5, 0)
+    packs = seen_packs(draft_picks(draft)[None], len(get_set("neo")))[0]
+    for seat, player in enumerate(players):
+        choices = [m for m in player.history if isinstance(m, Choice)]
+        assert len(choices) == 45
+        for pick, choice in enumerate(choices):
+            ids = [get_card_id(option.card) for option in choice.options]
+            counts = np.bincount(ids, minlength=packs.shape[-1])
+            assert np.array_equal(packs[seat, pick], counts)
+
+
+def test_pick_stats_drafts():
+    stats = PickStats(num_players=2)
+    draft, _ = run_draft(2, 1)
+    stats.add_draft(draft)
+    assert stats.num_picks == 90
+    assert stats.counters.taken.sum() == 90 and stats.counters.seen.sum() == 2 * 3 * 120
+    assert np.nansum(stats.pick_rate * stats.counters.seen) == 90
+    assert np.isnan(stats.win_rate).all()  # No match results
+    # With two players, each copy is last seen by the one who took it,
+    # and by the other one unless it was the first pick from the pack
+    taken = stats.counters.taken > 0
+    assert (stats.counters.taken <= stats.counters.last_seen).all()
+    assert (stats.counters.last_seen <= 2 * stats.counters.taken).all()
+    assert ((1 <= stats.alsa[taken]) & (stats.alsa[taken] <= 15)).all()
+    assert ((1 <= stats.ata[taken]) & (stats.ata[taken] <= 15)).all()
+
+
+def test_pick_stats_merge():
+    vector = VectorDraft()
+    packs = vector.sample_packs(np.random.default_rng(0), pods=6)
+    table = np.random.default_rng(1).random(vector.num_cards)
+    picks, _ = vector.run(packs, [table_policy(table)] * 8)
+    wins = np.random.default_rng(2).integers(0, 8, size=(6, 8))
+    losses = 7 - wins
+    whole = PickStats()
+    whole.add_picks(picks, wins, losses)
+    first, second = PickStats(), PickStats()
+    first.add_picks(picks[:2], wins[:2], losses[:2])
+    second.add_picks(picks[2:], wins[2:], losses[2:])
+    first.merge(second)
+    assert first.num_picks == whole.num_picks == 6 * 8 * 45
+    for name in COUNTERS:
+        assert np.array_equal(
+            getattr(first.counters, name), getattr(whole.counters, name)
+        ), name
+    # Cards the table ranks higher are taken earlier
+    taken = whole.counters.taken > 10
+    assert np.corrcoef(table[taken], whole.ata[taken])[0, 1] < -0.5
+    assert np.nanmax(whole.win_rate) <= 1
+
+
+def test_pick_stats_logs(tmp_path):
+    draft, players = run_draft(8, 2)
+    rows = []
+    for seat in range(8):
+        rows += list(seat_rows(players, seat, f"draft{seat}", seat % 4))
+    dump = str(tmp_path / "draft_data.csv")
+    write_dump(dump, rows)
+    ingest(dump, str(tmp_path / "logs"))
+    from_logs = PickStats()
+    from_logs.add_logs(DraftLogs(str(tmp_path / "logs")), batch_rows=50)
+    simulated = PickStats()
+    wins = np.arange(8)[None] % 4
+    simulated.add_picks(draft_picks(draft)[None], wins, np.full((1, 8), 3))
+    # The logs only have card names, so compare by name
+    neo = get_set("neo")
+    names = name_ids(neo)
+    canonical = np.array([names[card.name] for card in neo.cards])
+    for name in COUNTERS:
+        by_name = np.bincount(canonical, getattr(simulated.counters, name), len(neo))
+        assert np.array_equal(getattr(from_logs.counters, name), by_name), name
+
+
+def test_pick_stats_inconsistent():
+    stats = PickStats(num_players=2)
+    draft, _ = run_draft(2, 3)
+    packs = seen_packs(draft_picks(draft)[None], len(stats.counters.seen)).reshape(
+        90, -1
+    )
+    picks = draft_picks(draft).ravel()
+    numbers = np.tile(np.arange(45), 2)
+    drafts = np.repeat([0, 1], 45)
+    packs[2, picks[2] - 1] += 1  # A card appears in a pack after it was passed
+    with pytest.raises(AssertionError, match="inconsistent"):
+        stats.add(
+            {
+                "pack": packs,
+                "pick": picks,
+                "pack_number": numbers // 15,
+                "pick_number": numbers % 15,
+                "draft": drafts,
+            }
+        )
+    assert stats.num_picks == 0  # Nothing was counted
+    assert all(not getattr(stats.counters, name).any() for name in COUNTERS)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+from dataclasses import dataclass
+from random import Random
+
+import numpy as np
+
+from mtg_engine.decision_engine.checksum import Checksum
+from mtg_engine.decision_engine.player import FixedPlayer, Player, RandomPlayer
+from mtg_engine.decision_engine.replay import ReplayLog
+from mtg_engine.decision_engine.stats import EngineStats
+from mtg_engine.mtg_draft.bots import RatingPlayer, RatingTable
+from mtg_engine.mtg_draft.draft import DraftEngine
+
+
+@dataclass
+class CountingRatingPlayer(RatingPlayer):
+    """Rating player which counts its batches"""
+
+    batches: int = 0
+
+    def batch_choice(self, choices):
+        self.batches += 1
+        return super().batch_choice(choices)
+
+
+def random_draft(seed: int, simultaneous: bool, **kwargs) -> DraftEngine:
+    players = [RandomPlayer(rng=Random(seed + i)) for i in range(8)]
+    draft = DraftEngine(
+        players=players, rng=Random(seed), simultaneous=simultaneous, **kwargs
+    )
+    draft.run()
+    return draft
+
+
+def test_simultaneous_matches_sequential():
+    for seed in range(3):
+        draft = random_draft(seed, simultaneous=False)
+        batched = random_draft(seed, simultaneous=True)
+        assert batched.picks == draft.picks
+        assert batched.decisions == draft.decisions
+        assert batched.messages < draft.messages
+
+
+def test_simultaneous_batch_player():
+    table = RatingTable("neo", np.random.default_rng(0).random(302).astype("f4"))
+    bot = CountingRatingPlayer(table=table)
+    players = [FixedPlayer()] + [bot] * 7
+    draft = DraftEngine(players=players, rng=Random(0), simultaneous=True)
+    draft.run()
+    assert bot.batches == 45  # One batch per pick, for all 7 seats
+    separate = [FixedPlayer()] + [RatingPlayer(table=table) for _ in range(7)]
+    sequential = DraftEngine(players=separate, rng=Random(0))
+    sequential.run()
+    assert draft.picks == sequential.picks
+    assert all(bot.pool(i).sum() == 45 for i in range(1, 8))
+
+
+def test_simultaneous_replay_and_stats():
+    stats = EngineStats()
+    draft = random_draft(0, simultaneous=True, checksum=Checksum(), stats=stats)
+    assert stats.messages["DraftPickChoices"].count == 45
+    assert stats.players[0].count == 45
+
+    def make_draft(seed: int) -> DraftEngine:
+        players = [Player() for _ in range(8)]
+        return DraftEngine(players=players, rng=Random(seed), simultaneous=True)
+
+    replayed = ReplayLog.from_engine(draft, 0).replay(make_draft)
+    assert replayed.picks == draft.picks
+    # Replaying part of a simultaneous pick stops before it
+    partial = make_draft(0)
+    partial.replay(draft.decisions[:12])
+    assert len(partial.picks) == 8
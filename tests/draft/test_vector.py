@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+from dataclasses import dataclass, field
+from random import Random
+
+import numpy as np
+
+from mtg_engine.decision_engine.player import FixedPlayer, Player
+from mtg_engine.mtg_cards.sets import get_card_id
+from mtg_engine.mtg_draft.draft import DraftEngine
+from mtg_engine.mtg_draft.vector import ROUNDS, VectorDraft, first_policy, table_policy
+
+
+@dataclass
+class TablePlayer(Player):
+    """Picks the card with the highest score in a table, the first on ties"""
+
+    table: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    def decide(self, choice) -> int:
+        scores = [self.table[get_card_id(option.card)] for option in choice.options]
+        return int(np.argmax(scores))
+
+
+def engine_picks(draft: DraftEngine) -> np.ndarray:
+    """Picks of a DraftEngine as card IDs, in the VectorDraft layout"""
+    ids = np.array([get_card_id(card) for card in draft.picks])
+    return ids.reshape(-1, draft.num_players).T
+
+
+def test_vector_agrees_fixed():
+    for num_players in (2, 5, 8):
+        vector = VectorDraft(num_players=num_players)
+        seeds = [0, 1, 2]
+        picks, pools = vector.run(
+            vector.engine_packs(seeds), [first_policy] * num_players
+        )
+        for pod, seed in enumerate(seeds):
+            players = [FixedPlayer() for _ in range(num_players)]
+            draft = DraftEngine(players=players, rng=Random(seed))
+            draft.run()
+            assert np.array_equal(picks[pod], engine_picks(draft))
+        assert pools.sum() == len(seeds) * num_players * ROUNDS * 15
+
+
+def test_vector_agrees_table():
+    vector = VectorDraft(num_players=4)
+    table = np.random.default_rng(0).random(vector.num_cards)
+    # Mixed seats, with two different policies
+    policies = [table_policy(table), first_policy] * 2
+    picks, _ = vector.run(vector.engine_packs([3]), policies)
+    players = [TablePlayer(table=table), FixedPlayer(), TablePlayer(table=table)]
+    players.append(FixedPlayer())
+    draft = DraftEngine(players=players, rng=Random(3))
+    draft.run()
+    assert np.array_equal(picks[0], engine_picks(draft))
+
+
+def test_vector_conservative():
+    vector = VectorDraft()
+    packs = vector.sample_packs(np.random.default_rng(0), pods=50)
+    assert packs.shape == (50, ROUNDS, 8, 15)
+    table = np.random.default_rng(1).random(vector.num_cards)
+    picks, pools = vector.run(packs, [table_policy(table)] * 8)
+    for pod in range(50):
+        assert sorted(picks[pod].ravel()) == sorted(packs[pod].ravel())
+        counts = np.bincount(picks[pod].ravel(), minlength=vector.num_cards)
+        assert np.array_equal(pools[pod].sum(axis=0), counts)